@@ -0,0 +1,64 @@
+"""Command-line entry point: ``python -m benchmarks`` (run from backend/).
+
+Examples::
+
+    # Record a baseline on the full 1k-feed / 1M-article database
+    python -m benchmarks --scale full --output baseline.json
+
+    # Later: compare, exiting non-zero if any scenario regressed
+    python -m benchmarks --scale full --output current.json --baseline baseline.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from benchmarks.datagen import SCALES
+from benchmarks.runner import DEFAULT_THRESHOLD, compare, run
+from benchmarks.scenarios import SCENARIOS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the Krepsys performance benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--db", type=Path, help="benchmark database (default: .bench/<scale>.db)")
+    parser.add_argument("--iterations", type=int, default=30, help="samples per scenario")
+    parser.add_argument("--only", help="comma-separated scenario names", default="")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional p50 slowdown before failing")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, func in SCENARIOS.items():
+            print(f"{name:<24} {(func.__doc__ or '').strip().splitlines()[0] if func.__doc__ else ''}")
+        return 0
+
+    # Request logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    db_path = args.db or Path(".bench") / f"{args.scale}.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    names = [n for n in args.only.split(",") if n] or None
+    print(f"Benchmarking {args.scale} scale ({db_path})")
+    results = run(db_path, SCALES[args.scale], names, args.iterations, progress=True)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
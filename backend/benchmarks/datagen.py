@@ -0,0 +1,233 @@
+"""Seeded synthetic database generator for benchmarks.
+
+Builds a database through the application's own migration runner, so it gets
+the real indexes, FTS index and counter triggers. The data is realistic in shape:
+- feed sizes follow a skewed distribution
+- articles have HTML bodies with matching plain text
+- read/saved/archived mixes are plausible
+- tags and highlights cover a fraction of articles
+
+The same parameters and seed always produce the same rows. A sidecar
+``<db>.json`` records the parameters so an existing database can be reused.
+
+Usage (from backend/)::
+
+    python -m benchmarks.datagen bench.db --scale full
+"""
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+from sqlalchemy import insert, text
+from src.config import Settings
+from src.database import create_db_engine
+from src.migrations import migrate
+from src.models import Article, ArticleBody, Feed, Highlight, Tag, article_tags
+from src.utils.compression import compress_content
+from src.utils.text import excerpt_from_text
+
+# Fixed reference time so generated timestamps do not depend on the clock
+EPOCH = datetime(2026, 1, 1)
+CHUNK = 5000
+
+_WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at "
+    "which but have an they you were her she there one all we their been has would when "
+    "will who more if no out so said what up its about into than them can only other new "
+    "some could time these two may then do first any my now such like our over man me even "
+    "most made after also did many before must through back years where much your way well "
+    "down should because each just those people how too little state good very make world "
+    "still own see men work long get here between both life being under never day same "
+    "another know while last might us great old year off come since against go came right "
+    "used take three sourdough python rust kernel election market climate startup garden "
+    "newsletter privacy browser database latency compiler protocol weather football vaccine"
+).split()
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size parameters for a generated database."""
+    feeds: int
+    articles: int
+    tags: int = 50
+    tagged_fraction: float = 0.1
+    highlighted_fraction: float = 0.02
+    seed: int = 42
+
+
+SCALES = {
+    "tiny": Scale(feeds=20, articles=2_000),
+    "small": Scale(feeds=100, articles=50_000),
+    "full": Scale(feeds=1_000, articles=1_000_000),
+}
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(6, 16))
+    return " ".join(words).capitalize() + "."
+
+
+def _body(rng: random.Random):
+    """Return (html, text, word_count) for one article body."""
+    paragraphs = [
+        " ".join(_sentence(rng) for _ in range(rng.randint(2, 4)))
+        for _ in range(rng.randint(3, 8))
+    ]
+    html = "".join(f"<p>{p}</p>" for p in paragraphs)
+    text_ = " ".join(paragraphs)
+    return html, text_, len(text_.split())
+
+
+def _feed_rows(scale: Scale, rng: random.Random) -> List[Dict]:
+    rows = []
+    for i in range(1, scale.feeds + 1):
+        interval = rng.choice([900, 1800, 3600, 21600, 86400])
+        last = EPOCH - timedelta(seconds=rng.randint(0, interval))
+        rows.append({
+            "id": i,
+            "name": f"Bench feed {i}",
+            "url": f"https://feed{i}.bench.example/rss",
+            "fetch_interval": interval,
+            "last_fetched": last,
+            "next_fetch_at": last + timedelta(seconds=interval),
+            "is_active": rng.random() > 0.05,
+            "unchanged_streak": 0,
+        })
+    return rows
+
+
+def _article_rows(scale: Scale, rng: random.Random) -> Iterator[Dict]:
+    feed_ids = list(range(1, scale.feeds + 1))
+    # A few prolific feeds and a long tail of quiet ones
+    weights = [1 / (rank ** 0.8) for rank in feed_ids]
+    span = int(timedelta(days=730).total_seconds())
+    for i in range(1, scale.articles + 1):
+        html, text_, words = _body(rng)
+        fetched = EPOCH - timedelta(seconds=rng.randint(0, span))
+        published = None if rng.random() < 0.03 else fetched - timedelta(minutes=rng.randint(0, 600))
+        yield {
+            "id": i,
+            "feed_id": rng.choices(feed_ids, weights)[0],
+            "title": _sentence(rng)[:-1],
+            "url": f"https://bench.example/a/{i}",
+            "author": f"Author {rng.randint(1, 500)}",
+            "content": compress_content(html),
+            "content_text": text_,
+            "word_count": words,
+            "excerpt": excerpt_from_text(text_),
+            "published_at": published,
+            "fetched_at": fetched,
+            "sort_key": published or fetched,
+            "is_read": rng.random() < 0.6,
+            "is_saved": rng.random() < 0.03,
+            "is_archived": rng.random() < 0.1,
+        }
+
+
+def _chunks(rows: Iterator[Dict], size: int = CHUNK) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def meta_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".json")
+
+
+def database_url(db_path: Path) -> str:
+    return f"sqlite:///{db_path}"
+
+
+def generate(db_path: Path, scale: Scale, progress: bool = False) -> None:
+    """Create db_path from scratch with the given scale parameters."""
+    for path in (db_path, meta_path(db_path), Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        path.unlink(missing_ok=True)
+
+    rng = random.Random(scale.seed)
+    engine = create_db_engine(database_url(db_path), Settings())
+    migrate(engine)  # creates the schema, stamped as current
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Feed), _feed_rows(scale, rng))
+        conn.execute(insert(Tag), [{"id": i, "name": f"tag{i}"} for i in range(1, scale.tags + 1)])
+
+    highlight_id = 0
+    for chunk in _chunks(_article_rows(scale, rng)):
+        tag_rows, highlight_rows, body_rows = [], [], []
+        for row in chunk:
+            body_rows.append({
+                "article_id": row["id"],
+                "content": row.pop("content"),
+                "content_text": row.pop("content_text"),
+            })
+            if rng.random() < scale.tagged_fraction:
+                for tag_id in rng.sample(range(1, scale.tags + 1), rng.randint(1, 3)):
+                    tag_rows.append({"article_id": row["id"], "tag_id": tag_id})
+            if rng.random() < scale.highlighted_fraction:
+                for _ in range(rng.randint(1, 3)):
+                    highlight_id += 1
+                    highlight_rows.append({
+                        "id": highlight_id,
+                        "article_id": row["id"],
+                        "text": _sentence(rng),
+                        "color": rng.choice(["yellow", "green", "blue", "pink"]),
+                    })
+        # One transaction per chunk keeps the WAL bounded
+        with engine.begin() as conn:
+            conn.execute(insert(Article), chunk)
+            conn.execute(insert(ArticleBody), body_rows)
+            if tag_rows:
+                conn.execute(insert(article_tags), tag_rows)
+            if highlight_rows:
+                conn.execute(insert(Highlight), highlight_rows)
+        if progress:
+            print(f"  {chunk[-1]['id']:,}/{scale.articles:,} articles", end="\r", flush=True)
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')"))
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+
+    meta_path(db_path).write_text(json.dumps(asdict(scale)))
+    if progress:
+        print(f"\nGenerated {db_path} in {time.perf_counter() - started:.1f}s")
+
+
+def ensure_database(db_path: Path, scale: Scale, progress: bool = False) -> bool:
+    """Generate db_path unless it already holds data for these parameters.
+
+    Returns True if the database was (re)generated.
+    """
+    meta = meta_path(db_path)
+    if db_path.exists() and meta.exists() and json.loads(meta.read_text()) == asdict(scale):
+        return False
+    generate(db_path, scale, progress)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark database")
+    parser.add_argument("db", type=Path, help="database file to create")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scale = SCALES[args.scale]
+    generate(args.db, Scale(**{**asdict(scale), "seed": args.seed}), progress=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Local feed farm: a seeded HTTP server simulating any number of feeds.
+
+Documents are generated on the fly from the seed and the feed number, so
+nothing is stored and a seed always produces the same farm. Traits that are
+fixed per feed are drawn from the seed:
+- format (RSS or Atom)
+- publishing cadence and median latency
+- whether the feed redirects
+- whether it honours ETag / Last-Modified
+
+Per-request faults (5xx/429 errors, slowloris-style stalls) are drawn from
+the seed, the feed and how many times it has been requested.
+
+Feed ``n`` lives at ``http://127.0.0.1:<port>/feeds/<n>.xml``. Redirecting
+feeds answer 301 to ``/moved/<n>.xml``. ``/_stats`` returns request counters
+as JSON. With ``--hosts K`` the farm also listens on 127.0.0.2 … 127.0.0.K
+(Linux loopback), so per-host concurrency limits can be exercised.
+
+Usage (from backend/)::
+
+    python -m benchmarks.feedfarm --port 8900 --latency-ms 80 --error-rate 0.05
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import timedelta
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, NamedTuple, Optional
+from xml.sax.saxutils import escape
+from benchmarks.datagen import EPOCH, _sentence
+
+STALL_STEP = 0.5  # seconds between bytes while a response is stalling
+
+
+@dataclass(frozen=True)
+class FarmProfile:
+    """Behaviour of every feed in the farm."""
+    seed: int = 42
+    items: int = 20  # entries per document
+    paragraphs: int = 4  # mean paragraphs per entry body
+    atom_fraction: float = 0.3
+    latency_ms: float = 20.0  # median per-feed response delay
+    latency_spread: float = 0.8  # lognormal sigma of per-request delay
+    error_rate: float = 0.02  # requests answered 500/503/429
+    redirect_fraction: float = 0.05  # feeds served behind a 301
+    conditional_fraction: float = 0.7  # feeds honouring ETag / Last-Modified
+    stall_rate: float = 0.0  # requests that dribble their body out slowly
+    stall_seconds: float = 10.0
+    min_post_interval: int = 600  # simulated seconds between a feed's posts
+    max_post_interval: int = 86400
+    speed: float = 60.0  # simulated seconds per wall-clock second
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add one ``--flag`` per FarmProfile field."""
+    for f in fields(FarmProfile):
+        parser.add_argument(
+            "--" + f.name.replace("_", "-"), type=type(f.default), default=f.default
+        )
+
+
+def profile_from_args(args: argparse.Namespace) -> FarmProfile:
+    return FarmProfile(**{f.name: getattr(args, f.name) for f in fields(FarmProfile)})
+
+
+def profile_argv(profile: FarmProfile) -> List[str]:
+    """Command-line flags that reproduce profile."""
+    argv = []
+    for name, value in asdict(profile).items():
+        argv += ["--" + name.replace("_", "-"), str(value)]
+    return argv
+
+
+class FeedSpec(NamedTuple):
+    """Traits fixed for one feed."""
+    number: int
+    atom: bool
+    period: int  # simulated seconds between posts
+    phase: int
+    latency: float  # median delay, seconds
+    redirects: bool
+    conditional: bool
+
+
+class FeedFarm:
+    """Serve the farm from background threads; usable as a context manager."""
+
+    def __init__(self, profile: FarmProfile = FarmProfile(), port: int = 0, hosts: int = 1):
+        self.profile = profile
+        self.port = port
+        self.hosts = hosts
+        self.stats = Counter()
+        self._requests = Counter()
+        self._lock = threading.Lock()
+        self._servers: List[ThreadingHTTPServer] = []
+        self._started = time.monotonic()
+        self.render = lru_cache(maxsize=4096)(self._render)
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self) -> "FeedFarm":
+        for i in range(self.hosts):
+            server = ThreadingHTTPServer((f"127.0.0.{i + 1}", self.port), _Handler)
+            server.daemon_threads = True
+            server.farm = self
+            self.port = server.server_address[1]  # later hosts reuse the first port
+            self._servers.append(server)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self) -> "FeedFarm":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def feed_url(self, number: int) -> str:
+        """URL of feed ``number``, spread round-robin across the farm's hosts."""
+        return f"http://127.0.0.{number % self.hosts + 1}:{self.port}/feeds/{number}.xml"
+
+    # ── Feed model ───────────────────────────────────────────────────────────
+
+    def spec(self, number: int) -> FeedSpec:
+        p = self.profile
+        rng = random.Random(f"{p.seed}:feed:{number}")
+        period = rng.randint(p.min_post_interval, max(p.min_post_interval, p.max_post_interval))
+        return FeedSpec(
+            number=number,
+            atom=rng.random() < p.atom_fraction,
+            period=period,
+            phase=rng.randrange(period),
+            latency=rng.lognormvariate(math.log(max(p.latency_ms, 1e-3) / 1000), 0.5),
+            redirects=rng.random() < p.redirect_fraction,
+            conditional=rng.random() < p.conditional_fraction,
+        )
+
+    def latest_item(self, spec: FeedSpec) -> int:
+        """Index of the newest post at the farm's current simulated time."""
+        simulated = (time.monotonic() - self._started) * self.profile.speed
+        return self.profile.items + int((simulated + spec.phase) // spec.period)
+
+    def _render(self, number: int, latest: int) -> bytes:
+        """Build the document for feed ``number`` whose newest post is ``latest``."""
+        spec = self.spec(number)
+        p = self.profile
+        items = []
+        for k in range(latest, max(latest - p.items, 0), -1):
+            rng = random.Random(f"{p.seed}:item:{number}:{k}")
+            paragraphs = rng.randint(1, max(1, 2 * p.paragraphs - 1))
+            body = "".join(
+                "<p>" + " ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) + "</p>"
+                for _ in range(paragraphs)
+            )
+            items.append((
+                escape(_sentence(rng)[:-1]),
+                f"https://farm{p.seed}.example/{number}/{k}",
+                f"Author {rng.randint(1, 50)}",
+                EPOCH + timedelta(seconds=k * spec.period),
+                escape(body),
+            ))
+        title = f"Farm feed {number}"
+        if spec.atom:
+            updated = items[0][3].isoformat() + "Z" if items else EPOCH.isoformat() + "Z"
+            entries = "".join(
+                f'<entry><title>{t}</title><link href="{link}"/><id>{link}</id>'
+                f"<published>{at.isoformat()}Z</published><updated>{at.isoformat()}Z</updated>"
+                f"<author><name>{author}</name></author>"
+                f'<content type="html">{body}</content></entry>'
+                for t, link, author, at, body in items
+            )
+            document = (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                f'<feed xmlns="http://www.w3.org/2005/Atom"><title>{title}</title>'
+                f"<id>urn:farm:{p.seed}:{number}</id><updated>{updated}</updated>{entries}</feed>"
+            )
+        else:
+            entries = "".join(
+                f"<item><title>{t}</title><link>{link}</link><guid>{link}</guid>"
+                f"<author>{author}</author><pubDate>{format_datetime(at, usegmt=False)}</pubDate>"
+                f"<description>{body}</description></item>"
+                for t, link, author, at, body in items
+            )
+            document = (
+                '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+                f"<title>{title}</title><link>https://farm{p.seed}.example/{number}</link>"
+                f"<description>{title}</description>{entries}</channel></rss>"
+            )
+        return document.encode()
+
+    def next_request_rng(self, number: int) -> random.Random:
+        """Seeded RNG for the next request to feed ``number``."""
+        with self._lock:
+            count = self._requests[number]
+            self._requests[number] += 1
+        return random.Random(f"{self.profile.seed}:req:{number}:{count}")
+
+    def record(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as real feed servers offer
+
+    def log_message(self, format, *args):  # noqa: A002 — silence per-request logging
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None) -> None:
+        # Count first, so a client that has its response also sees it in /_stats
+        self.server.farm.record(f"status_{status}")
+        self.server.farm.record("bytes", len(body))
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        farm: FeedFarm = self.server.farm
+        farm.record("requests")
+        path = self.path.split("?", 1)[0]
+        if path == "/_stats":
+            self._send(200, json.dumps(dict(farm.stats)).encode(),
+                       {"Content-Type": "application/json"})
+            return
+
+        prefix, _, name = path.rpartition("/")
+        if prefix not in ("/feeds", "/moved") or not name.endswith(".xml") \
+                or not name[:-4].isdigit():
+            self._send(404)
+            return
+        spec = farm.spec(int(name[:-4]))
+        rng = farm.next_request_rng(spec.number)
+        try:
+            self._serve_feed(farm, spec, rng, moved=prefix == "/moved")
+        except (BrokenPipeError, ConnectionResetError):
+            farm.record("client_disconnects")
+
+    def _serve_feed(self, farm: FeedFarm, spec: FeedSpec, rng: random.Random, moved: bool):
+        p = farm.profile
+        time.sleep(spec.latency * rng.lognormvariate(0, p.latency_spread))
+
+        if spec.redirects and not moved:
+            self._send(301, headers={"Location": f"/moved/{spec.number}.xml"})
+            return
+        if rng.random() < p.error_rate:
+            status = rng.choice([500, 503, 429])
+            self._send(status, headers={"Retry-After": "60"} if status != 500 else None)
+            return
+
+        latest = farm.latest_item(spec)
+        etag = f'"{spec.number}-{latest}"'
+        last_modified = format_datetime(
+            EPOCH + timedelta(seconds=latest * spec.period), usegmt=False
+        ).replace("-0000", "GMT")
+        if spec.conditional and (
+            self.headers.get("If-None-Match") == etag
+            or self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self._send(304, headers={"ETag": etag})
+            return
+
+        body = farm.render(spec.number, latest)
+        headers = {
+            "Content-Type": "application/atom+xml" if spec.atom else "application/rss+xml",
+        }
+        if spec.conditional:
+            headers.update({"ETag": etag, "Last-Modified": last_modified})
+
+        if rng.random() >= p.stall_rate:
+            self._send(200, body, headers)
+            return
+
+        # Slowloris-style: headers promptly, then one byte per step, never idle
+        # long enough to trip a client's read timeout
+        farm.record("stalls")
+        farm.record("status_200")
+        farm.record("bytes", len(body))
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        steps = min(len(body), max(1, int(p.stall_seconds / STALL_STEP)))
+        for i in range(steps):
+            self.wfile.write(body[i:i + 1])
+            self.wfile.flush()
+            time.sleep(STALL_STEP)
+        self.wfile.write(body[steps:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a local, seeded feed farm")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--hosts", type=int, default=1, help="loopback addresses to listen on")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    farm = FeedFarm(profile_from_args(args), port=args.port, hosts=args.hosts).start()
+    print(f"Feed farm listening: {farm.feed_url(0).replace('/0.xml', '/<n>.xml')}"
+          f" ({args.hosts} host(s))", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        farm.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Benchmark: feed ingest throughput and tail latency against the local feed farm.
+
+Starts the feed farm in a subprocess so its CPU time stays out of the
+measured process, then drives the real ingest path against a scratch
+database:
+1. registers N feeds through ``POST /api/feeds/``, each followed by the
+   initial ``fetch_feed`` the endpoint schedules
+2. runs ``run_scheduler`` for a number of rounds, marking every feed due
+   before each one
+
+Reports registration latency, per-round throughput, per-request latency and
+status mix as seen by the fetch engine, and the fetcher's conditional-GET
+stats. Engine limits come from the usual settings, so tune them through the
+environment (FETCH_CONCURRENCY, FETCH_PER_HOST_CONCURRENCY, FETCH_TIMEOUT,
+PARSE_POOL_SIZE).
+
+Usage (from backend/)::
+
+    python -m benchmarks.ingest_load --feeds 2000 --rounds 3 --hosts 4 \\
+        --latency-ms 80 --error-rate 0.05 --stall-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from src.config import Settings
+from src.database import create_async_db_engine, create_db_engine, get_db, get_session_factory
+from src.main import app
+from src.migrations import migrate
+from src.models import Article, Feed
+from src.utils.fetch_engine import FetchEngine
+from src.utils.fetcher import fetch_stats
+from src.utils.scheduler import notify_feeds_changed, run_scheduler
+from benchmarks.datagen import EPOCH, database_url
+from benchmarks.feedfarm import FarmProfile, add_profile_arguments, profile_argv, profile_from_args
+from benchmarks.runner import summarize
+
+
+class TimingTransport(httpx.AsyncBaseTransport):
+    """HTTP transport recording each request's latency (body included) and outcome."""
+
+    def __init__(self, limits: httpx.Limits):
+        self.limits = limits
+        self.latencies: List[float] = []
+        self.outcomes = Counter()
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(limits=self.limits)
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+        except httpx.HTTPError as e:
+            self.outcomes[type(e).__name__] += 1
+            raise
+        finally:
+            self.latencies.append((time.perf_counter() - started) * 1000)
+        self.outcomes[str(response.status_code)] += 1
+        return response
+
+    async def aclose(self) -> None:
+        # The engine closes its client after every round; start fresh next time
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+class RoundEngine(FetchEngine):
+    """FetchEngine that records each scheduler round it is asked to run."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rounds: List[Dict] = []
+        self.round_done = asyncio.Event()
+
+    async def fetch_all(self, feeds):
+        feeds = list(feeds)
+        started = time.perf_counter()
+        results = await super().fetch_all(feeds)
+        seconds = time.perf_counter() - started
+        self.rounds.append({
+            "feeds": len(feeds),
+            "seconds": round(seconds, 3),
+            "feeds_per_s": round(len(feeds) / seconds, 1) if seconds else None,
+            "new_articles": sum(results.values()),
+        })
+        self.round_done.set()
+        return results
+
+
+def _mark_all_due(session_factory) -> None:
+    db = session_factory()
+    try:
+        db.execute(update(Feed).values(next_fetch_at=EPOCH))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _register(client: httpx.AsyncClient, urls: List[str], concurrency: int) -> Dict:
+    """POST every feed URL; each request includes the endpoint's initial fetch."""
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def register(number: int, url: str) -> None:
+        async with limit:
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/feeds/", json={"name": f"Farm feed {number}", "url": url}
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(register(i, url) for i, url in enumerate(urls)))
+    seconds = time.perf_counter() - started
+    return {
+        "feeds": len(urls),
+        "seconds": round(seconds, 3),
+        "feeds_per_s": round(len(urls) / seconds, 1),
+        **summarize(latencies),
+    }
+
+
+async def run_load(
+    db_path: Path,
+    urls: List[str],
+    rounds: int = 3,
+    register_concurrency: int = 20,
+    settings: Optional[Settings] = None,
+) -> Dict:
+    """Register urls as feeds in a fresh database at db_path, then run scheduler rounds."""
+    settings = settings or Settings()
+    engine = create_db_engine(database_url(db_path), settings)
+    migrate(engine)
+    async_engine = create_async_db_engine(database_url(db_path), settings)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def load_get_db():
+        async with async_sessions() as db:
+            yield db
+
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = load_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    fetch_stats.reset()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+            registration = await _register(client, urls, register_concurrency)
+
+        fetch_stats.reset()
+        timing = TimingTransport(httpx.Limits(
+            max_connections=settings.fetch_concurrency,
+            max_keepalive_connections=settings.fetch_concurrency,
+        ))
+        fetch_engine = RoundEngine(
+            max_concurrency=settings.fetch_concurrency,
+            per_host_concurrency=settings.fetch_per_host_concurrency,
+            timeout=settings.fetch_timeout,
+            parse_pool_size=settings.parse_pool_size,
+            session_factory=session_factory,
+            transport=timing,
+        )
+        _mark_all_due(session_factory)
+        scheduler = asyncio.create_task(run_scheduler(session_factory, fetch_engine))
+        try:
+            for done in range(rounds):
+                while len(fetch_engine.rounds) <= done:
+                    fetch_engine.round_done.clear()
+                    await fetch_engine.round_done.wait()
+                if done + 1 < rounds:
+                    _mark_all_due(session_factory)
+                    notify_feeds_changed()
+        finally:
+            scheduler.cancel()
+            await asyncio.gather(scheduler, return_exceptions=True)
+
+        db = session_factory()
+        articles = db.scalar(select(func.count(Article.id)))
+        db.close()
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(overrides)
+        await async_engine.dispose()
+        engine.dispose()
+
+    fetched = sum(r["feeds"] for r in fetch_engine.rounds)
+    seconds = sum(r["seconds"] for r in fetch_engine.rounds)
+    return {
+        "register": registration,
+        "rounds": fetch_engine.rounds,
+        "scheduler": {
+            "feeds": fetched,
+            "seconds": round(seconds, 3),
+            "feeds_per_s": round(fetched / seconds, 1) if seconds else None,
+        },
+        "requests": {**summarize(timing.latencies), "outcomes": dict(timing.outcomes)},
+        "fetch_stats": fetch_stats.snapshot(),
+        "articles": articles,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_farm(port: int, process: subprocess.Popen, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("feed farm exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_stats", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("feed farm did not start")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest load test against the local feed farm")
+    parser.add_argument("--feeds", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3, help="scheduler rounds to run")
+    parser.add_argument("--hosts", type=int, default=1, help="loopback hosts to spread feeds over")
+    parser.add_argument("--register-concurrency", type=int, default=20)
+    parser.add_argument("--db", type=Path, help="scratch database (default: a temporary file)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    # Injected faults would otherwise flood the console with fetch errors
+    logging.disable(logging.ERROR)
+
+    profile: FarmProfile = profile_from_args(args)
+    port = _free_port()
+    farm = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.feedfarm", "--port", str(port),
+         "--hosts", str(args.hosts), *profile_argv(profile)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_farm(port, farm)
+        urls = [f"http://127.0.0.{n % args.hosts + 1}:{port}/feeds/{n}.xml"
+                for n in range(args.feeds)]
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = args.db or Path(tmp) / "ingest.db"
+            if args.db:
+                db_path.unlink(missing_ok=True)
+            settings = Settings()
+            print(f"Ingesting {args.feeds} feeds x {args.rounds} rounds "
+                  f"(concurrency {settings.fetch_concurrency}, "
+                  f"per host {settings.fetch_per_host_concurrency})", file=sys.stderr)
+            results = asyncio.run(run_load(db_path, urls, args.rounds,
+                                           args.register_concurrency, settings))
+        results["farm"] = httpx.get(f"http://127.0.0.1:{port}/_stats").json()
+    finally:
+        farm.terminate()
+        farm.wait()
+
+    results["meta"] = {"feeds": args.feeds, "rounds": args.rounds, "hosts": args.hosts,
+                       "profile": asdict(profile)}
+    document = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(document)
+    print(document)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Benchmark: API read latency while a concurrent ingest is writing.
+
+Seeds a scratch database, then runs a writer thread storing feed entries in
+batches (as the scheduler does) while the main thread repeatedly loads the
+first page of the article list. Runs once with SQLite's stock settings and
+once with the configured connection profile, and reports read latency
+percentiles and lock errors for each.
+
+Usage (from backend/)::
+
+    python -m benchmarks.read_during_ingest [--articles N] [--duration S]
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from src.config import Settings
+from src.database import Base, create_db_engine
+import src.models  # noqa: F401 — register all tables
+from src.api.articles import SUMMARY_COLUMNS
+from src.models.article import Article
+from src.models.feed import Feed
+from src.utils.fetcher import ParsedEntry, store_entries
+from src.utils.text import extract_text
+
+# SQLite defaults (plus pysqlite's 5 s lock wait): the pre-tuning behaviour
+STOCK_PROFILE = Settings(
+    sqlite_journal_mode="DELETE",
+    sqlite_synchronous="FULL",
+    sqlite_busy_timeout=5000,
+    sqlite_cache_size=-2000,
+    sqlite_mmap_size=0,
+    sqlite_temp_store="DEFAULT",
+)
+
+PAGE_SIZE = 50
+BODY = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60 + "</p>"
+
+
+def _entries(prefix: str, count: int, start: datetime):
+    extracted = extract_text(BODY)
+    return [
+        ParsedEntry(
+            title=f"{prefix} {i}",
+            url=f"https://bench.example.com/{prefix}/{i}",
+            author="Bench",
+            content=BODY,
+            content_text=extracted.text,
+            word_count=extracted.word_count,
+            excerpt=extracted.excerpt,
+            published_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def _seed(Session, articles: int) -> int:
+    db = Session()
+    try:
+        feed = Feed(name="Bench", url="https://bench.example.com/rss")
+        db.add(feed)
+        db.commit()
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for offset in range(0, articles, 1000):
+            store_entries(feed.id, feed.url,
+                          _entries(f"seed{offset}", min(1000, articles - offset), start), db)
+        return feed.id
+    finally:
+        db.close()
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_profile(name: str, settings: Settings, articles: int, duration: float, batch: int) -> dict:
+    """Measure read latency under a concurrent writer for one connection profile."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", settings)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        feed_id = _seed(Session, articles)
+
+        stop = threading.Event()
+        write_stats = {"batches": 0, "errors": 0}
+
+        def writer():
+            db = Session()
+            start = datetime(2027, 1, 1, tzinfo=timezone.utc)
+            try:
+                while not stop.is_set():
+                    entries = _entries(f"ingest{write_stats['batches']}", batch, start)
+                    try:
+                        store_entries(feed_id, "bench", entries, db)
+                        write_stats["batches"] += 1
+                    except OperationalError:
+                        db.rollback()
+                        write_stats["errors"] += 1
+            finally:
+                db.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+
+        latencies, read_errors = [], 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            db = Session()
+            started = time.perf_counter()
+            try:
+                db.query(*SUMMARY_COLUMNS).order_by(
+                    Article.sort_key.desc(), Article.id.desc()
+                ).limit(PAGE_SIZE).all()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except OperationalError:
+                read_errors += 1
+            finally:
+                db.close()
+
+        stop.set()
+        thread.join()
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "reads": len(latencies),
+        "read_errors": read_errors,
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 0.95), 2) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 0.99), 2) if latencies else None,
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "write_batches": write_stats["batches"],
+        "write_errors": write_stats["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000, help="rows to seed")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per profile")
+    parser.add_argument("--batch", type=int, default=200, help="entries per ingest commit")
+    args = parser.parse_args()
+
+    results = [
+        run_profile("stock", STOCK_PROFILE, args.articles, args.duration, args.batch),
+        run_profile("tuned", Settings(), args.articles, args.duration, args.batch),
+    ]
+    columns = list(results[0])
+    print("  ".join(f"{c:>13}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row[c]):>13}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
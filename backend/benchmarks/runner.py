@@ -0,0 +1,142 @@
+"""Run benchmark scenarios, record JSON results and compare against a baseline."""
+
+import asyncio
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from src.config import Settings
+from src.database import create_async_db_engine, create_db_engine, get_db, get_session_factory
+from src.main import app
+from benchmarks.datagen import Scale, database_url, ensure_database
+from benchmarks.scenarios import SCENARIOS, BenchContext
+
+# A scenario regresses when its p50 grows by more than this fraction...
+DEFAULT_THRESHOLD = 0.25
+# ...and by more than this many milliseconds, so sub-millisecond noise is ignored
+MIN_DELTA_MS = 1.0
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Reduce per-iteration timings (ms) to summary statistics."""
+    ordered = sorted(samples)
+
+    def pct(fraction):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(pct(0.95), 3),
+        "p99_ms": round(pct(0.99), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_scenarios(
+    db_path: Path, scale: Scale, names: Iterable[str], iterations: int, progress: bool = False
+) -> Dict[str, dict]:
+    """Run the named scenarios against db_path through the real application."""
+    settings = Settings()
+    engine = create_db_engine(database_url(db_path), settings)
+    async_engine = create_async_db_engine(database_url(db_path), settings)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def bench_get_db():
+        async with async_sessions() as db:
+            yield db
+
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = bench_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in names:
+                # Untimed warm-up pass fills the page cache and connection pool
+                warmup = max(1, iterations // 5)
+                await SCENARIOS[name](BenchContext(client, session_factory, warmup, random.Random(0)))
+                ctx = BenchContext(client, session_factory, iterations, random.Random(scale.seed))
+                await SCENARIOS[name](ctx)
+                results[name] = summarize(ctx.samples)
+                if progress:
+                    print(f"  {name:<24} p50 {results[name]['p50_ms']:>9} ms"
+                          f"   p95 {results[name]['p95_ms']:>9} ms")
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(overrides)
+        await async_engine.dispose()
+        engine.dispose()
+    return results
+
+
+def run(
+    db_path: Path,
+    scale: Scale,
+    names: Optional[Iterable[str]] = None,
+    iterations: int = 30,
+    progress: bool = False,
+) -> dict:
+    """Generate (or reuse) the database, run scenarios and return the results document."""
+    ensure_database(db_path, scale, progress)
+    names = list(names or SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "scale": asdict(scale),
+            "iterations": iterations,
+        },
+        "scenarios": asyncio.run(run_scenarios(db_path, scale, names, iterations, progress)),
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> List[str]:
+    """Return a description of each scenario whose p50 regressed against baseline.
+
+    Scenarios missing from either document are skipped. Baselines recorded at a
+    different scale are not comparable and raise ValueError.
+    """
+    if current["meta"]["scale"] != baseline["meta"]["scale"]:
+        raise ValueError("baseline was recorded at a different scale")
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        old, new = before["p50_ms"], result["p50_ms"]
+        if new > old * (1 + threshold) and new - old > min_delta_ms:
+            regressions.append(f"{name}: p50 {old} ms -> {new} ms (+{(new / old - 1):.0%})")
+    return regressions
@@ -0,0 +1,267 @@
+"""Timed benchmark scenarios against the real routers, ingest path and scheduler.
+
+Each scenario is an async function that takes a ``BenchContext``, runs its
+own iterations, and wraps only the measured part of each one in
+``ctx.timer()``. Scenarios that write restore the data they changed, so
+repeated runs against the same generated database stay comparable.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+import httpx
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session, sessionmaker
+from src.models import Article, Feed
+from src.utils.cache import article_list_cache
+from src.utils.fetch_engine import FeedTarget, FetchEngine
+from src.utils.fetcher import ParsedEntry, store_entries
+from src.utils.scheduler import _claim_due_feeds
+from src.utils.text import excerpt_from_text
+from benchmarks.datagen import EPOCH, _body, _sentence
+
+PAGE = 50
+FAR_FUTURE = datetime(2100, 1, 1)  # every active feed is due
+
+
+@dataclass
+class BenchContext:
+    """What a scenario needs: an API client, blocking sessions and a timer."""
+    client: httpx.AsyncClient
+    session_factory: sessionmaker
+    iterations: int
+    rng: random.Random
+    samples: List[float] = field(default_factory=list)
+
+    @contextmanager
+    def timer(self):
+        started = time.perf_counter()
+        yield
+        self.samples.append((time.perf_counter() - started) * 1000)
+
+    async def get(self, url: str) -> httpx.Response:
+        response = await self.client.get(url)
+        response.raise_for_status()
+        return response
+
+    def session(self) -> Session:
+        return self.session_factory()
+
+
+Scenario = Callable[[BenchContext], Awaitable[None]]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(func: Scenario) -> Scenario:
+    """Register func under its name."""
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def _busiest_feed(ctx: BenchContext) -> int:
+    db = ctx.session()
+    try:
+        return db.scalar(select(Feed.id).order_by(Feed.unread_count.desc()).limit(1))
+    finally:
+        db.close()
+
+
+async def _list(ctx: BenchContext, url: str, cached: bool = False) -> None:
+    for _ in range(ctx.iterations):
+        if not cached:
+            article_list_cache.invalidate()
+        with ctx.timer():
+            await ctx.get(url)
+
+
+@scenario
+async def list_summary_page(ctx: BenchContext) -> None:
+    """First page of all articles, summary view."""
+    await _list(ctx, f"/api/articles/?view=summary&limit={PAGE}")
+
+
+@scenario
+async def list_full_page(ctx: BenchContext) -> None:
+    """First page with bodies, tags and highlights."""
+    await _list(ctx, f"/api/articles/?limit={PAGE}")
+
+
+@scenario
+async def list_inbox_page(ctx: BenchContext) -> None:
+    """Unread, unarchived articles — the default sidebar view."""
+    await _list(ctx, f"/api/articles/?view=summary&limit={PAGE}&is_read=false&is_archived=false")
+
+
+@scenario
+async def list_feed_inbox_page(ctx: BenchContext) -> None:
+    """One busy feed's unread articles."""
+    feed_id = _busiest_feed(ctx)
+    await _list(ctx, f"/api/articles/?view=summary&limit={PAGE}&feed_id={feed_id}"
+                     "&is_read=false&is_archived=false")
+
+
+@scenario
+async def list_cached_page(ctx: BenchContext) -> None:
+    """A repeated list request served from the response cache."""
+    await ctx.get(f"/api/articles/?view=summary&limit={PAGE}")
+    await _list(ctx, f"/api/articles/?view=summary&limit={PAGE}", cached=True)
+
+
+@scenario
+async def list_deep_pagination(ctx: BenchContext) -> None:
+    """Successive cursor pages; each page is one sample."""
+    article_list_cache.invalidate()
+    url = f"/api/articles/?view=summary&limit={PAGE}"
+    cursor = None
+    for _ in range(ctx.iterations):
+        with ctx.timer():
+            response = await ctx.get(url + (f"&cursor={cursor}" if cursor else ""))
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+
+@scenario
+async def get_article(ctx: BenchContext) -> None:
+    db = ctx.session()
+    max_id = db.scalar(select(Article.id).order_by(Article.id.desc()).limit(1))
+    db.close()
+    for _ in range(ctx.iterations):
+        article_id = ctx.rng.randint(1, max_id)
+        with ctx.timer():
+            await ctx.client.get(f"/api/articles/{article_id}")
+
+
+@scenario
+async def search(ctx: BenchContext) -> None:
+    terms = ["sourdough", "kernel latency", "climate market", "browser priv", "the people"]
+    for i in range(ctx.iterations):
+        with ctx.timer():
+            await ctx.get(f"/api/articles/search?q={terms[i % len(terms)]}")
+
+
+@scenario
+async def feed_counts(ctx: BenchContext) -> None:
+    for _ in range(ctx.iterations):
+        with ctx.timer():
+            await ctx.get("/api/feeds/counts")
+
+
+@scenario
+async def update_article(ctx: BenchContext) -> None:
+    """PATCH one article's read flag (restored untimed afterwards)."""
+    db = ctx.session()
+    ids = db.scalars(
+        select(Article.id).where(Article.is_read.is_(False)).limit(ctx.iterations)
+    ).all()
+    db.close()
+    for article_id in ids:
+        with ctx.timer():
+            response = await ctx.client.patch(f"/api/articles/{article_id}", json={"is_read": True})
+        response.raise_for_status()
+        await ctx.client.patch(f"/api/articles/{article_id}", json={"is_read": False})
+
+
+@scenario
+async def bulk_mark_feed_read(ctx: BenchContext) -> None:
+    """Mark a busy feed's unread articles read in one request."""
+    feed_id = _busiest_feed(ctx)
+    db = ctx.session()
+    unread = db.scalars(
+        select(Article.id).where(Article.feed_id == feed_id, Article.is_read.is_(False))
+    ).all()
+    db.close()
+    for _ in range(ctx.iterations):
+        with ctx.timer():
+            response = await ctx.client.patch("/api/articles/bulk", json={
+                "filter": {"feed_id": feed_id, "is_read": False}, "changes": {"is_read": True},
+            })
+        response.raise_for_status()
+        db = ctx.session()
+        for start in range(0, len(unread), 5000):
+            db.execute(update(Article).where(Article.id.in_(unread[start:start + 5000]))
+                       .values(is_read=False))
+        db.commit()
+        db.close()
+
+
+def _new_entries(ctx: BenchContext, prefix: str, count: int) -> List[ParsedEntry]:
+    entries = []
+    for i in range(count):
+        html, text_, words = _body(ctx.rng)
+        entries.append(ParsedEntry(
+            title=_sentence(ctx.rng), url=f"https://bench.example/{prefix}/{i}", author=None,
+            content=html, content_text=text_, word_count=words, excerpt=excerpt_from_text(text_),
+            published_at=EPOCH + timedelta(minutes=i),
+        ))
+    return entries
+
+
+def _delete_entries(ctx: BenchContext, entries: List[ParsedEntry]) -> None:
+    db = ctx.session()
+    db.execute(delete(Article).where(Article.url.in_([e.url for e in entries])))
+    db.commit()
+    db.close()
+
+
+@scenario
+async def ingest_store_entries(ctx: BenchContext) -> None:
+    """store_entries for a 100-entry feed document, half of it already stored."""
+    feed_id = _busiest_feed(ctx)
+    for n in range(ctx.iterations):
+        entries = _new_entries(ctx, f"ingest{n}", 100)
+        db = ctx.session()
+        store_entries(feed_id, "bench", entries[:50], db)
+        with ctx.timer():
+            store_entries(feed_id, "bench", entries, db)
+        db.close()
+        _delete_entries(ctx, entries)
+
+
+def _rss(entries: List[ParsedEntry]) -> bytes:
+    items = "".join(
+        f"<item><title>{e.title}</title><link>{e.url}</link>"
+        f"<description><![CDATA[{e.content}]]></description></item>"
+        for e in entries
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>'
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+@scenario
+async def fetch_engine_round(ctx: BenchContext) -> None:
+    """A scheduler round: 20 feeds x 20 new items, downloaded, parsed and stored."""
+    db = ctx.session()
+    feeds = [FeedTarget(f.id, f.url) for f in db.scalars(select(Feed).order_by(Feed.id).limit(20))]
+    db.close()
+    for n in range(ctx.iterations):
+        documents = {feed.url: _new_entries(ctx, f"round{n}/{feed.id}", 20) for feed in feeds}
+        bodies = {url: _rss(entries) for url, entries in documents.items()}
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=bodies[str(request.url)])
+        )
+        engine = FetchEngine(session_factory=ctx.session_factory, transport=transport)
+        with ctx.timer():
+            await engine.fetch_all(feeds)
+        engine.close()
+        _delete_entries(ctx, [e for entries in documents.values() for e in entries])
+
+
+@scenario
+async def scheduler_claim(ctx: BenchContext) -> None:
+    """Claim every due feed, as one scheduler pass does (leases restored afterwards)."""
+    db = ctx.session()
+    saved = db.execute(select(Feed.id, Feed.next_fetch_at)).all()
+    db.close()
+    for _ in range(ctx.iterations):
+        db = ctx.session()
+        with ctx.timer():
+            _claim_due_feeds(db, FAR_FUTURE)
+        db.execute(update(Feed), [{"id": i, "next_fetch_at": at} for i, at in saved])
+        db.commit()
+        db.close()
@@ -1,28 +1,179 @@
 """Article management API endpoints."""
 
+import base64
+import binascii
+import json
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import String, false, literal, or_, select, true, tuple_, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from src.database import get_db
 from src.models.article import Article
-from src.api.schemas import ArticleResponse, ArticleUpdate
+from src.api.schemas import (
+    ArticleBulkResult,
+    ArticleBulkUpdate,
+    ArticleResponse,
+    ArticleSearchResult,
+    ArticleSummary,
+    ArticleUpdate,
+)
+from src.utils.cache import article_list_cache
+from src.utils.search import search_articles
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/articles", tags=["articles"])
 
+MAX_PAGE_SIZE = 500
 
-@router.get("/", response_model=List[ArticleResponse])
-def list_articles(
+# Batch-load relationships serialized by ArticleResponse: one IN (...) query per
+# relationship for the whole page instead of lazy loads per article. The body
+# (content, content_text) lives in article_bodies and loads the same way.
+FULL_LOAD_OPTIONS = (
+    selectinload(Article.body),
+    selectinload(Article.tags),
+    selectinload(Article.highlights),
+)
+
+# Columns selected for ?view=summary — must match ArticleSummary's fields
+SUMMARY_COLUMNS = [getattr(Article, name) for name in ArticleSummary.model_fields]
+
+# Encoders for cached list bodies, one per view
+_LIST_ADAPTERS = {
+    "full": TypeAdapter(List[ArticleResponse]),
+    "summary": TypeAdapter(List[ArticleSummary]),
+}
+
+
+def _encode_cursor(sort_key: str, article_id: int) -> str:
+    """Encode a sort tuple into an opaque, URL-safe cursor string."""
+    raw = json.dumps([sort_key, article_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by _encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, article_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(sort_key, str) or not isinstance(article_id, int):
+            raise ValueError("cursor must hold a sort key string and an integer id")
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return sort_key, article_id
+
+
+# Cursor values are compared against the raw stored text of sort_key. Rows
+# backfilled from server_default timestamps lack the microsecond suffix
+# SQLAlchemy adds when binding a datetime, so round-tripping through Python
+# would break equality.
+_sort_key_raw = type_coerce(Article.sort_key, String)
+
+
+def _after_cursor(sort: str, sort_key: str, article_id: int):
+    """Build the keyset predicate selecting rows that sort after the cursor.
+
+    Written as a row-value comparison so SQLite can seek the (sort_key, id)
+    indexes directly instead of filtering a scan.
+    """
+    row = tuple_(_sort_key_raw, Article.id)
+    bound = tuple_(literal(sort_key, String), literal(article_id))
+    return row < bound if sort == "newest" else row > bound
+
+
+def _flag(value: bool):
+    """Render a boolean filter as a literal so partial index predicates match."""
+    return true() if value else false()
+
+
+async def _load_page(
+    db: AsyncSession,
+    feed_id: Optional[int],
+    is_read: Optional[bool],
+    is_saved: Optional[bool],
+    is_archived: Optional[bool],
+    sort: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    view: str,
+) -> Tuple[bytes, Optional[str]]:
+    """Run the list query and return the encoded page and the next-page cursor."""
+    # Start with base query
+    query = select(Article)
+
+    # Apply filters dynamically (only if provided)
+    if feed_id is not None:
+        query = query.where(Article.feed_id == feed_id)
+
+    if is_read is not None:
+        query = query.where(Article.is_read == _flag(is_read))
+
+    if is_saved is not None:
+        query = query.where(Article.is_saved == _flag(is_saved))
+
+    if is_archived is not None:
+        query = query.where(Article.is_archived == _flag(is_archived))
+
+    # Apply sorting — sort_key is published_at, falling back to fetch time
+    if sort == "newest":
+        query = query.order_by(Article.sort_key.desc(), Article.id.desc())
+    else:  # oldest
+        query = query.order_by(Article.sort_key.asc(), Article.id.asc())
+
+    if cursor is not None:
+        query = query.where(_after_cursor(sort, *_decode_cursor(cursor)))
+
+    if limit is not None:
+        # Fetch one extra row to learn whether another page exists
+        query = query.limit(limit + 1)
+
+    if view == "summary":
+        articles = (await db.execute(query.with_only_columns(*SUMMARY_COLUMNS))).all()
+    else:
+        articles = (await db.scalars(query.options(*FULL_LOAD_OPTIONS))).all()
+
+    next_cursor = None
+    if limit is not None and len(articles) > limit:
+        articles = articles[:limit]
+        last_id = articles[-1].id
+        sort_key = await db.scalar(select(_sort_key_raw).where(Article.id == last_id))
+        next_cursor = _encode_cursor(sort_key, last_id)
+
+    adapter = _LIST_ADAPTERS[view]
+    return adapter.dump_json(adapter.validate_python(articles, from_attributes=True)), next_cursor
+
+
+@router.get("/", response_model=Union[List[ArticleResponse], List[ArticleSummary]])
+async def list_articles(
     feed_id: Optional[int] = Query(None, description="Filter by feed ID"),
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     is_saved: Optional[bool] = Query(None, description="Filter by saved status"),
     is_archived: Optional[bool] = Query(None, description="Filter by archived status"),
     sort: str = Query("newest", pattern="^(newest|oldest)$", description="Sort order: newest or oldest"),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    view: str = Query("full", pattern="^(full|summary)$", description="Response shape: full or summary"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """List articles with optional filtering and sorting.
+    """List articles with optional filtering, sorting and keyset pagination.
+
+    When ``limit`` is given and more rows remain, the cursor for the next page
+    is returned in the ``X-Next-Cursor`` response header. ``view=summary``
+    selects only list-view columns (no bodies, tags or highlights).
+
+    Encoded pages are cached in process by their parameters until the next
+    write that affects article lists, or for at most ``list_cache_ttl``
+    seconds, so repeated requests skip the database.
 
     Args:
         feed_id: Filter by specific feed
@@ -30,50 +181,116 @@ def list_articles(
         is_saved: Filter by saved status (true/false)
         is_archived: Filter by archived status (true/false)
         sort: Sort order - 'newest' (default) or 'oldest'
+        limit: Maximum number of articles to return
+        cursor: Opaque cursor marking where the previous page ended
+        view: 'full' (default) or 'summary'
         db: Database session
 
     Returns:
         List of articles matching filters, sorted by requested order
+
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    # Start with base query
-    query = db.query(Article)
+    key = (feed_id, is_read, is_saved, is_archived, sort, limit, cursor, view)
+    cached = article_list_cache.get(key)
+    if cached is None:
+        version = article_list_cache.version
+        cached = await _load_page(
+            db, feed_id, is_read, is_saved, is_archived, sort, limit, cursor, view
+        )
+        article_list_cache.put(key, cached, version, size=len(cached[0]))
 
-    # Apply filters dynamically (only if provided)
-    if feed_id is not None:
-        query = query.filter(Article.feed_id == feed_id)
+    body, next_cursor = cached
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
 
-    if is_read is not None:
-        query = query.filter(Article.is_read == is_read)
 
-    if is_saved is not None:
-        query = query.filter(Article.is_saved == is_saved)
+@router.get("/search", response_model=List[ArticleSearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Search terms"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    offset: int = Query(0, ge=0, description="Number of ranked results to skip"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over titles, authors, article text and highlights.
 
-    if is_archived is not None:
-        query = query.filter(Article.is_archived == is_archived)
+    Results are ranked best-first. When more results remain, the offset of the
+    next page is returned in the ``X-Next-Offset`` response header.
 
-    # Apply sorting
-    if sort == "newest":
-        # Sort by published_at descending (newest first), fallback to fetched_at, then ID
-        query = query.order_by(
-            Article.published_at.desc().nullslast(),
-            Article.fetched_at.desc(),
-            Article.id.desc()
-        )
-    else:  # oldest
-        # Sort by published_at ascending (oldest first), fallback to fetched_at, then ID
-        query = query.order_by(
-            Article.published_at.asc().nullsfirst(),
-            Article.fetched_at.asc(),
-            Article.id.asc()
+    Args:
+        q: Search terms; every word must match, the last as a prefix
+        limit: Maximum number of results to return
+        offset: Number of ranked results to skip
+        db: Database session
+
+    Returns:
+        Matching articles in summary form with snippets
+    """
+    hits = await db.run_sync(search_articles, q, limit + 1, offset)
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers["X-Next-Offset"] = str(offset + limit)
+
+    rows = {
+        row.id: row
+        for row in await db.execute(
+            select(*SUMMARY_COLUMNS).where(Article.id.in_([h[0] for h in hits]))
         )
+    }
+    return [
+        ArticleSearchResult(**rows[article_id]._asdict(), snippet=snippet, rank=rank)
+        for article_id, snippet, rank in hits
+        if article_id in rows
+    ]
+
+
+@router.patch("/bulk", response_model=ArticleBulkResult)
+async def bulk_update_articles(payload: ArticleBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """Set read/saved/archived flags on many articles with one UPDATE.
+
+    Articles are chosen either by ``ids`` or by ``filter``. An empty filter
+    matches every article. Rows that already hold the requested values are
+    skipped, so the count covers only articles that actually changed.
+
+    Args:
+        payload: Selector (ids or filter) and the flags to set
+        db: Database session
+
+    Returns:
+        Number of articles updated
+    """
+    changes = payload.changes.model_dump(exclude_none=True)
+
+    stmt = update(Article).values(**changes).execution_options(synchronize_session=False)
+    if payload.ids is not None:
+        stmt = stmt.where(Article.id.in_(payload.ids))
+    else:
+        selector = payload.filter
+        if selector.feed_id is not None:
+            stmt = stmt.where(Article.feed_id == selector.feed_id)
+        if selector.older_than is not None:
+            stmt = stmt.where(Article.sort_key < selector.older_than)
+        for field in ("is_read", "is_saved", "is_archived"):
+            value = getattr(selector, field)
+            if value is not None:
+                stmt = stmt.where(getattr(Article, field) == _flag(value))
+    stmt = stmt.where(or_(*(
+        getattr(Article, field).is_not(_flag(value)) for field, value in changes.items()
+    )))
 
-    articles = query.all()
+    result = await db.execute(stmt)
+    await db.commit()
 
-    return articles
+    if result.rowcount:
+        article_list_cache.invalidate()
+    logger.info(f"Bulk updated {result.rowcount} articles: changes={changes}")
+    return ArticleBulkResult(updated=result.rowcount)
 
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(article_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific article by ID.
 
     Args:
@@ -86,7 +303,9 @@ def get_article(article_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If article not found
     """
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = await db.scalar(
+        select(Article).options(*FULL_LOAD_OPTIONS).where(Article.id == article_id)
+    )
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,10 +316,10 @@ def get_article(article_id: int, db: Session = Depends(get_db)):
 
 
 @router.patch("/{article_id}", response_model=ArticleResponse)
-def update_article(
+async def update_article(
     article_id: int,
     article_update: ArticleUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update article status (read/saved/archived).
 
@@ -115,7 +334,9 @@ def update_article(
     Raises:
         HTTPException: If article not found
     """
-    db_article = db.query(Article).filter(Article.id == article_id).first()
+    db_article = await db.scalar(
+        select(Article).options(*FULL_LOAD_OPTIONS).where(Article.id == article_id)
+    )
     if not db_article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,11 +354,11 @@ def update_article(
             changes.append(f"{field}: {old_value} -> {value}")
             setattr(db_article, field, value)
 
-    db.commit()
-    db.refresh(db_article)
+    await db.commit()
 
-    # Log status changes
     if changes:
+        article_list_cache.invalidate()
+        # Log status changes
         logger.info(
             f"Updated article: id={db_article.id}, "
             f"title='{db_article.title[:30]}...', "
@@ -1,21 +1,45 @@
 """Feed management API endpoints."""
 
 import logging
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from src.database import get_db
+from src.database import get_db, get_session_factory
 from src.models.feed import Feed
-from src.api.schemas import FeedCreate, FeedUpdate, FeedResponse
+from src.api.schemas import FeedCounts, FeedCreate, FeedUpdate, FeedResponse
+from src.utils.cache import article_list_cache
 from src.utils.fetcher import fetch_feed
+from src.utils.scheduler import notify_feeds_changed
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/feeds", tags=["feeds"])
 
 
+def _fetch_in_background(session_factory: Callable[[], Session], feed_id: int, url: str) -> None:
+    """Fetch one feed with its own blocking session; run by Starlette in a worker thread."""
+    db = session_factory()
+    try:
+        fetch_feed(feed_id, url, db)
+    finally:
+        db.close()
+
+
+async def _get_feed_or_404(db: AsyncSession, feed_id: int) -> Feed:
+    feed = await db.get(Feed, feed_id)
+    if not feed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Feed with id {feed_id} not found"
+        )
+    return feed
+
+
 @router.get("/", response_model=List[FeedResponse])
-def list_feeds(db: Session = Depends(get_db)):
+async def list_feeds(db: AsyncSession = Depends(get_db)):
     """List all feeds.
     
     Args:
@@ -24,17 +48,23 @@ def list_feeds(db: Session = Depends(get_db)):
     Returns:
         List of all feeds
     """
-    feeds = db.query(Feed).all()
+    feeds = (await db.scalars(select(Feed))).all()
     return feeds
 
 
 @router.post("/", response_model=FeedResponse, status_code=status.HTTP_201_CREATED)
-def create_feed(feed: FeedCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def create_feed(
+    feed: FeedCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+):
     """Create a new feed.
     
     Args:
         feed: Feed creation data
         db: Database session
+        session_factory: Creates the session used by the initial background fetch
         
     Returns:
         Created feed
@@ -43,31 +73,58 @@ def create_feed(feed: FeedCreate, background_tasks: BackgroundTasks, db: Session
         HTTPException: If feed URL already exists
     """
     # Check for duplicate URL
-    existing_feed = db.query(Feed).filter(Feed.url == str(feed.url)).first()
+    existing_feed = await db.scalar(select(Feed).where(Feed.url == str(feed.url)))
     if existing_feed:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Feed with URL {feed.url} already exists"
         )
     
-    # Create new feed
+    # Create new feed, leased forward like a feed the scheduler claimed: the
+    # background task does the first fetch, so the woken scheduler must not
+    # claim it again before that fetch finishes
     db_feed = Feed(
         name=feed.name,
         url=str(feed.url),
-        fetch_interval=feed.fetch_interval
+        fetch_interval=feed.fetch_interval,
+        min_fetch_interval=feed.min_fetch_interval,
+        max_fetch_interval=feed.max_fetch_interval,
+        retention_days=feed.retention_days,
+        retention_keep=feed.retention_keep,
+        next_fetch_at=datetime.now(timezone.utc) + timedelta(seconds=feed.fetch_interval),
     )
     db.add(db_feed)
-    db.commit()
-    db.refresh(db_feed)
+    await db.commit()
+    await db.refresh(db_feed)
     
     logger.info(f"Created feed: id={db_feed.id}, name='{db_feed.name}', url='{db_feed.url}'")
-    background_tasks.add_task(fetch_feed, db_feed.id, db_feed.url, db)
+    background_tasks.add_task(_fetch_in_background, session_factory, db_feed.id, db_feed.url)
+    notify_feeds_changed()
 
     return db_feed
 
 
+@router.get("/counts", response_model=List[FeedCounts])
+async def feed_counts(db: AsyncSession = Depends(get_db)):
+    """Unread and saved badge counts for every feed.
+
+    Reads the trigger-maintained counters on each feed row, so the cost is
+    proportional to the number of feeds, not articles.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Counts per feed
+    """
+    rows = await db.execute(
+        select(Feed.id.label("feed_id"), Feed.unread_count, Feed.saved_count).order_by(Feed.id)
+    )
+    return [FeedCounts(**row._asdict()) for row in rows]
+
+
 @router.get("/{feed_id}", response_model=FeedResponse)
-def get_feed(feed_id: int, db: Session = Depends(get_db)):
+async def get_feed(feed_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific feed by ID.
     
     Args:
@@ -80,27 +137,26 @@ def get_feed(feed_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If feed not found
     """
-    feed = db.query(Feed).filter(Feed.id == feed_id).first()
-    if not feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Feed with id {feed_id} not found"
-        )
-    return feed
+    return await _get_feed_or_404(db, feed_id)
 
 
 @router.post("/{feed_id}/refresh", status_code=status.HTTP_200_OK)
-def refresh_feed(feed_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def refresh_feed(
+    feed_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+):
     """Trigger a manual fetch for a feed."""
-    feed = db.query(Feed).filter(Feed.id == feed_id).first()
+    feed = await db.get(Feed, feed_id)
     if not feed:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Feed {feed_id} not found")
-    background_tasks.add_task(fetch_feed, feed.id, feed.url, db)
+    background_tasks.add_task(_fetch_in_background, session_factory, feed.id, feed.url)
     return {"status": "fetch scheduled"}
 
 
 @router.patch("/{feed_id}", response_model=FeedResponse)
-def update_feed(feed_id: int, feed_update: FeedUpdate, db: Session = Depends(get_db)):
+async def update_feed(feed_id: int, feed_update: FeedUpdate, db: AsyncSession = Depends(get_db)):
     """Update a feed (partial update).
     
     Args:
@@ -114,20 +170,26 @@ def update_feed(feed_id: int, feed_update: FeedUpdate, db: Session = Depends(get
     Raises:
         HTTPException: If feed not found
     """
-    db_feed = db.query(Feed).filter(Feed.id == feed_id).first()
-    if not db_feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Feed with id {feed_id} not found"
-        )
+    db_feed = await _get_feed_or_404(db, feed_id)
     
     # Update only provided fields
     update_data = feed_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_feed, field, value)
+
+    # Re-time the next fetch from the last one under the new interval; the
+    # learned interval is discarded and re-learned on the next fetch
+    interval_fields = {"fetch_interval", "min_fetch_interval", "max_fetch_interval"}
+    if interval_fields & update_data.keys():
+        db_feed.effective_interval = None
+    if interval_fields & update_data.keys() or update_data.get("is_active"):
+        interval = db_feed.effective_interval or db_feed.fetch_interval
+        last = db_feed.last_fetched or datetime.now(timezone.utc)
+        db_feed.next_fetch_at = last + timedelta(seconds=interval)
     
-    db.commit()
-    db.refresh(db_feed)
+    await db.commit()
+    await db.refresh(db_feed)
+    notify_feeds_changed()
     
     logger.info(f"Updated feed: id={db_feed.id}, fields={list(update_data.keys())}")
     
@@ -135,7 +197,7 @@ def update_feed(feed_id: int, feed_update: FeedUpdate, db: Session = Depends(get
 
 
 @router.delete("/{feed_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_feed(feed_id: int, db: Session = Depends(get_db)):
+async def delete_feed(feed_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a feed.
     
     Args:
@@ -145,16 +207,13 @@ def delete_feed(feed_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If feed not found
     """
-    db_feed = db.query(Feed).filter(Feed.id == feed_id).first()
-    if not db_feed:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Feed with id {feed_id} not found"
-        )
+    db_feed = await _get_feed_or_404(db, feed_id)
     
     logger.info(f"Deleting feed: id={db_feed.id}, name='{db_feed.name}'")
     
-    db.delete(db_feed)
-    db.commit()
+    await db.delete(db_feed)
+    await db.commit()
+    article_list_cache.invalidate()
+    notify_feeds_changed()
     
     return None
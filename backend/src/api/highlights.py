@@ -3,24 +3,26 @@
 import logging
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
 from src.models.article import Article
 from src.models.highlight import Highlight
 from src.api.schemas import HighlightCreate, HighlightUpdate, HighlightResponse
+from src.utils.cache import article_list_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/articles", tags=["highlights"])
 
 
 @router.get("/{article_id}/highlights", response_model=List[HighlightResponse])
-def list_highlights(article_id: int, db: Session = Depends(get_db)):
-    return db.query(Highlight).filter(Highlight.article_id == article_id).all()
+async def list_highlights(article_id: int, db: AsyncSession = Depends(get_db)):
+    return (await db.scalars(select(Highlight).where(Highlight.article_id == article_id))).all()
 
 
 @router.post("/{article_id}/highlights", response_model=HighlightResponse, status_code=status.HTTP_201_CREATED)
-def create_highlight(article_id: int, payload: HighlightCreate, db: Session = Depends(get_db)):
-    article = db.query(Article).filter(Article.id == article_id).first()
+async def create_highlight(article_id: int, payload: HighlightCreate, db: AsyncSession = Depends(get_db)):
+    article = await db.get(Article, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
@@ -31,28 +33,31 @@ def create_highlight(article_id: int, payload: HighlightCreate, db: Session = De
         note=payload.note,
     )
     db.add(highlight)
-    db.commit()
-    db.refresh(highlight)
+    await db.commit()
+    article_list_cache.invalidate()
+    await db.refresh(highlight)
     logger.info(f"Created highlight id={highlight.id} on article {article_id}")
     return highlight
 
 
 @router.patch("/highlights/{highlight_id}", response_model=HighlightResponse)
-def update_highlight(highlight_id: int, payload: HighlightUpdate, db: Session = Depends(get_db)):
-    h = db.query(Highlight).filter(Highlight.id == highlight_id).first()
+async def update_highlight(highlight_id: int, payload: HighlightUpdate, db: AsyncSession = Depends(get_db)):
+    h = await db.get(Highlight, highlight_id)
     if not h:
         raise HTTPException(status_code=404, detail="Highlight not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(h, field, value)
-    db.commit()
-    db.refresh(h)
+    await db.commit()
+    article_list_cache.invalidate()
+    await db.refresh(h)
     return h
 
 
 @router.delete("/highlights/{highlight_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_highlight(highlight_id: int, db: Session = Depends(get_db)):
-    h = db.query(Highlight).filter(Highlight.id == highlight_id).first()
+async def delete_highlight(highlight_id: int, db: AsyncSession = Depends(get_db)):
+    h = await db.get(Highlight, highlight_id)
     if not h:
         raise HTTPException(status_code=404, detail="Highlight not found")
-    db.delete(h)
-    db.commit()
+    await db.delete(h)
+    await db.commit()
+    article_list_cache.invalidate()
@@ -1,36 +1,65 @@
 """Pydantic schemas for API request/response validation."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
 
 
 # ── Feed ─────────────────────────────────────────────────────────────────────
 
-class FeedBase(BaseModel):
+class _FetchBounds(BaseModel):
+    """Mixin validating the adaptive interval bounds against each other."""
+
+    @model_validator(mode="after")
+    def _check_bounds(self):
+        lo, hi = self.min_fetch_interval, self.max_fetch_interval
+        if lo is not None and hi is not None and lo > hi:
+            raise ValueError("min_fetch_interval must not exceed max_fetch_interval")
+        return self
+
+
+class FeedBase(_FetchBounds):
     name: str = Field(..., min_length=1, max_length=255)
     url: HttpUrl
     fetch_interval: int = Field(default=900, ge=60)
+    min_fetch_interval: Optional[int] = Field(None, ge=60)
+    max_fetch_interval: Optional[int] = Field(None, ge=60)
+    retention_days: Optional[int] = Field(None, ge=0)  # None = global default, 0 = keep all
+    retention_keep: Optional[int] = Field(None, ge=0)
 
 
 class FeedCreate(FeedBase):
     pass
 
 
-class FeedUpdate(BaseModel):
+class FeedUpdate(_FetchBounds):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     is_active: Optional[bool] = None
     fetch_interval: Optional[int] = Field(None, ge=60)
+    min_fetch_interval: Optional[int] = Field(None, ge=60)
+    max_fetch_interval: Optional[int] = Field(None, ge=60)
+    retention_days: Optional[int] = Field(None, ge=0)
+    retention_keep: Optional[int] = Field(None, ge=0)
 
 
 class FeedResponse(FeedBase):
     id: int
     is_active: bool
     last_fetched: Optional[datetime] = None
+    effective_interval: Optional[int] = None  # interval learned from publishing cadence
+    unread_count: int = 0  # unread, unarchived articles
+    saved_count: int = 0
     created_at: datetime
     model_config = {"from_attributes": True}
 
 
+class FeedCounts(BaseModel):
+    """Badge counts for one feed."""
+    feed_id: int
+    unread_count: int
+    saved_count: int
+
+
 # ── Tag ───────────────────────────────────────────────────────────────────────
 
 class TagResponse(BaseModel):
@@ -72,6 +101,7 @@ class ArticleResponse(BaseModel):
     author: Optional[str] = None
     content: Optional[str] = None
     content_text: Optional[str] = None
+    word_count: Optional[int] = None
     note: Optional[str] = None
     published_at: Optional[datetime] = None
     fetched_at: datetime
@@ -83,8 +113,81 @@ class ArticleResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ArticleSummary(BaseModel):
+    """Lightweight list-view projection — no bodies, tags or highlights."""
+    id: int
+    feed_id: int
+    title: str
+    url: str
+    author: Optional[str] = None
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    published_at: Optional[datetime] = None
+    fetched_at: datetime
+    is_read: bool
+    is_saved: bool
+    is_archived: bool
+    model_config = {"from_attributes": True}
+
+
+class ArticleSearchResult(ArticleSummary):
+    """Search hit — the summary fields plus a highlighted snippet and bm25 rank."""
+    snippet: str
+    rank: float
+
+
 class ArticleUpdate(BaseModel):
     is_read: Optional[bool] = None
     is_saved: Optional[bool] = None
     is_archived: Optional[bool] = None
     note: Optional[str] = None
+
+
+MAX_BULK_IDS = 5000
+
+
+class ArticleStateChanges(BaseModel):
+    """Flags a bulk update may set; at least one is required."""
+    is_read: Optional[bool] = None
+    is_saved: Optional[bool] = None
+    is_archived: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def _require_change(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("changes must set at least one field")
+        return self
+
+
+class ArticleBulkFilter(BaseModel):
+    """Selects articles by feed, age and current flags; an empty filter matches all."""
+    feed_id: Optional[int] = None
+    older_than: Optional[datetime] = None  # compared with published_at, else fetch time
+    is_read: Optional[bool] = None
+    is_saved: Optional[bool] = None
+    is_archived: Optional[bool] = None
+
+    @field_validator("older_than")
+    @classmethod
+    def _naive_utc(cls, value):
+        # Stored timestamps are naive UTC
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class ArticleBulkUpdate(BaseModel):
+    """Set the same flags on many articles, chosen by id list or by filter."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_IDS)
+    filter: Optional[ArticleBulkFilter] = None
+    changes: ArticleStateChanges
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of ids or filter")
+        return self
+
+
+class ArticleBulkResult(BaseModel):
+    updated: int
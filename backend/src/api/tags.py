@@ -3,56 +3,66 @@
 import logging
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from src.database import get_db
 from src.models.article import Article
 from src.models.tag import Tag
 from src.api.schemas import TagResponse
+from src.utils.cache import article_list_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/articles", tags=["tags"])
 
 
+async def _get_article_with_tags(db: AsyncSession, article_id: int) -> Article:
+    article = await db.scalar(
+        select(Article).options(selectinload(Article.tags)).where(Article.id == article_id)
+    )
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
+
+
 @router.get("/tags/all", response_model=List[TagResponse])
-def list_all_tags(db: Session = Depends(get_db)):
+async def list_all_tags(db: AsyncSession = Depends(get_db)):
     """Return every tag that exists."""
-    return db.query(Tag).order_by(Tag.name).all()
+    return (await db.scalars(select(Tag).order_by(Tag.name))).all()
 
 
 @router.post("/{article_id}/tags", response_model=List[TagResponse], status_code=status.HTTP_200_OK)
-def add_tag(article_id: int, payload: dict, db: Session = Depends(get_db)):
+async def add_tag(article_id: int, payload: dict, db: AsyncSession = Depends(get_db)):
     """Add a tag to an article by name. Creates the tag if it doesn't exist."""
     name = (payload.get("name") or "").strip().lower()
     if not name:
         raise HTTPException(status_code=400, detail="Tag name required")
 
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+    article = await _get_article_with_tags(db, article_id)
 
-    tag = db.query(Tag).filter(Tag.name == name).first()
+    tag = await db.scalar(select(Tag).where(Tag.name == name))
     if not tag:
         tag = Tag(name=name)
         db.add(tag)
-        db.flush()
+        await db.flush()
 
     if tag not in article.tags:
         article.tags.append(tag)
-        db.commit()
+        await db.commit()
+        article_list_cache.invalidate()
 
     return article.tags
 
 
 @router.delete("/{article_id}/tags/{tag_name}", response_model=List[TagResponse])
-def remove_tag(article_id: int, tag_name: str, db: Session = Depends(get_db)):
+async def remove_tag(article_id: int, tag_name: str, db: AsyncSession = Depends(get_db)):
     """Remove a tag from an article."""
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+    article = await _get_article_with_tags(db, article_id)
 
-    tag = db.query(Tag).filter(Tag.name == tag_name.lower()).first()
+    tag = await db.scalar(select(Tag).where(Tag.name == tag_name.lower()))
     if tag and tag in article.tags:
         article.tags.remove(tag)
-        db.commit()
+        await db.commit()
+        article_list_cache.invalidate()
 
     return article.tags
@@ -5,8 +5,16 @@ Follows 12-factor app principles:
 - Sensible defaults for development
 - Type validation via Pydantic
 """
+from typing import Literal
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Keywords accepted by the PRAGMAs the connection profile sets
+JournalMode = Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"]
+Synchronous = Literal["OFF", "NORMAL", "FULL", "EXTRA"]
+TempStore = Literal["DEFAULT", "FILE", "MEMORY"]
+AutoVacuum = Literal["NONE", "FULL", "INCREMENTAL"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -18,7 +26,41 @@ class Settings(BaseSettings):
     )
     
     database_url: str = "sqlite:///./data/krepsys.db"
+    # SQLite connection profile, applied as PRAGMAs on every connect
+    sqlite_journal_mode: JournalMode = "WAL"  # readers no longer block on the writer
+    sqlite_synchronous: Synchronous = "NORMAL"  # durable at checkpoints; safe with WAL
+    sqlite_busy_timeout: int = 5000  # milliseconds to wait for a lock
+    sqlite_cache_size: int = -65536  # negative = KiB, so 64 MiB of page cache
+    sqlite_mmap_size: int = 268435456  # bytes of the file to memory-map (256 MiB)
+    sqlite_temp_store: TempStore = "MEMORY"  # temp tables and sort spill in RAM
+    sqlite_auto_vacuum: AutoVacuum = "INCREMENTAL"  # free pages reclaimable in steps (new files)
     port: int = 8080
     allowed_origins: str = "http://localhost:18300,http://krepsys.local"
     fetch_interval: int = 900  # seconds (15 minutes)
+    fetch_concurrency: int = 10  # simultaneous feed downloads
+    fetch_per_host_concurrency: int = 2  # simultaneous downloads per host
+    fetch_timeout: float = 30.0  # seconds per feed download
+    adaptive_min_interval: int = 300  # seconds; default floor for learned intervals
+    adaptive_max_interval: int = 86400  # seconds; default ceiling for learned intervals
+    parse_pool_size: int = 0  # worker processes for feed parsing (0 = parse in a thread)
+    list_cache_size: int = 256  # cached article list pages (0 = disabled)
+    list_cache_bytes: int = 33554432  # bound on cached page bodies (32 MiB; 0 = unbounded)
+    list_cache_ttl: float = 30.0  # seconds before a cached page expires (0 = never)
+    content_compression_level: int = 6  # zlib level for stored article bodies (0 = plain text)
+    retention_days: int = 0  # purge read articles fetched over this many days ago (0 = keep all)
+    retention_keep_per_feed: int = 0  # keep only the newest N articles per feed (0 = no cap)
+    retention_interval: int = 86400  # seconds between retention passes
+    retention_tombstone_days: int = 180  # forget purged URLs after this many days (0 = never)
+    slow_query_ms: float = 100.0  # log SQL statements at least this slow (0 = off)
+    db_timing_headers: bool = False  # add Server-Timing / X-DB-Queries to responses
     log_level: str = "INFO"
+
+    @field_validator(
+        "sqlite_journal_mode", "sqlite_synchronous", "sqlite_temp_store", "sqlite_auto_vacuum",
+        mode="before",
+    )
+    @classmethod
+    def _upper_pragma_value(cls, value):
+        # These are interpolated into PRAGMA statements; SQLite itself ignores
+        # case, so accept "wal" but reject anything outside the keywords
+        return value.upper() if isinstance(value, str) else value
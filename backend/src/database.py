@@ -1,33 +1,112 @@
 """
 Database setup and session management.
 Uses SQLAlchemy with SQLite for Phase 1.
+
+API requests use an async engine (aiosqlite) so waiting on the database never
+ties up a worker thread. The scheduler, fetcher and maintenance jobs keep a
+blocking engine over the same database.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from src.config import Settings
+from src.utils.instrumentation import instrument_engine
 
 # Load settings
 settings = Settings()
 
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},  # SQLite specific
-    echo=settings.log_level == "DEBUG"
-)
 
-# Session factory
+def sqlite_pragmas(settings: Settings) -> dict:
+    """Return the connection profile applied to every new SQLite connection."""
+    return {
+        # Only settable before the first table is created, so it goes first
+        "auto_vacuum": settings.sqlite_auto_vacuum,
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout,
+        "cache_size": settings.sqlite_cache_size,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def configure_sqlite(engine: Engine, settings: Settings) -> Engine:
+    """Apply the SQLite pragmas from settings on every connect.
+
+    WAL lets API reads proceed while the scheduler writes, and busy_timeout
+    makes a writer wait for the lock instead of failing with "database is
+    locked". A no-op for other database backends.
+    """
+    if engine.dialect.name != "sqlite":
+        return engine
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def create_db_engine(database_url: str, settings: Settings = settings) -> Engine:
+    """Create an engine for database_url with the configured connection profile."""
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},  # SQLite specific
+        echo=settings.log_level == "DEBUG"
+    )
+    instrument_engine(engine)
+    return configure_sqlite(engine, settings)
+
+
+def async_database_url(database_url: str) -> URL:
+    """Map a database URL onto its asyncio driver (sqlite -> sqlite+aiosqlite)."""
+    url = make_url(database_url)
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def create_async_db_engine(
+    database_url: str, settings: Settings = settings, **kwargs
+) -> AsyncEngine:
+    """Create an async engine for database_url with the configured connection profile."""
+    engine = create_async_engine(
+        async_database_url(database_url),
+        echo=settings.log_level == "DEBUG",
+        **kwargs
+    )
+    configure_sqlite(engine.sync_engine, settings)
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+# Create engines
+engine = create_db_engine(settings.database_url)
+async_engine = create_async_db_engine(settings.database_url)
+
+# Session factories; async sessions keep loaded state after commit so
+# responses can be serialized without lazy loads
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for FastAPI to get database session."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Dependency for FastAPI to get an async database session."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory():
+    """Dependency for FastAPI to get a blocking session factory for background tasks."""
+    return SessionLocal
@@ -13,25 +13,38 @@ import asyncio
 import logging
 import json
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.config import Settings
-from src.database import engine, Base
+from src.database import async_engine, engine, get_db
 from src.api.feeds import router as feeds_router
 from src.api.articles import router as articles_router
 from src.api.tags import router as tags_router
 from src.api.highlights import router as highlights_router
 # Import models to register them with SQLAlchemy Base
 from src.models import Feed, Article, Tag, Highlight  # noqa: F401
-from src.utils.scheduler import run_scheduler
+from src.migrations import LATEST_VERSION, migrate
+from src.utils.instrumentation import InstrumentationMiddleware
+from src.utils.metrics import CONTENT_TYPE, SCHEDULER_LAG, render
+from src.utils.retention import run_retention
+from src.utils.scheduler import run_scheduler, scheduler_lag
 
 # Initialize settings
 settings = Settings()
 
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
 # Configure JSON logging (12-factor app)
 class JSONFormatter(logging.Formatter):
-    """Format logs as JSON for structured logging."""
+    """Format logs as JSON for structured logging.
+
+    Fields passed with ``extra=`` (e.g. the per-request ``db_queries`` and
+    ``db_ms``) are included as top-level keys.
+    """
     
     def format(self, record):
         log_data = {
@@ -40,9 +53,12 @@ class JSONFormatter(logging.Formatter):
             "message": record.getMessage(),
             "logger": record.name
         }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                log_data[key] = value
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_data)
+        return json.dumps(log_data, default=str)
 
 
 # Set up logging
@@ -61,34 +77,27 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Krepsys application")
     
-    # Create new tables (additive — won't touch existing tables)
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created")
-
-    # Runtime migration: add columns that may not exist in older DBs
-    with engine.connect() as conn:
-        for stmt in [
-            "ALTER TABLE articles ADD COLUMN note TEXT",
-        ]:
-            try:
-                conn.execute(text(stmt))
-                conn.commit()
-                logger.info(f"Migration applied: {stmt}")
-            except Exception:
-                pass  # Column already exists
-    
+    # Apply pending schema migrations; a current database costs one query
+    applied = migrate(engine)
+    logger.info(f"Database schema at version {LATEST_VERSION} ({len(applied)} migration(s) applied)")
+
     # Start background feed scheduler
     scheduler_task = asyncio.create_task(run_scheduler())
     logger.info("Background scheduler started")
 
+    # Purge articles past their retention policy, then reclaim the space
+    retention_task = asyncio.create_task(run_retention())
+
     yield
 
     # Shutdown
-    scheduler_task.cancel()
-    try:
-        await scheduler_task
-    except asyncio.CancelledError:
-        pass
+    for task in (scheduler_task, retention_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await async_engine.dispose()
     logger.info("Shutting down Krepsys application")
 
 
@@ -108,10 +117,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "X-DB-Queries", "Server-Timing"],
 )
 
 logger.info(f"CORS configured for origins: {origins}")
 
+# Outermost, so latency covers CORS handling too
+app.add_middleware(InstrumentationMiddleware)
+
 # Include API routers
 app.include_router(feeds_router)
 app.include_router(articles_router)
@@ -133,6 +146,20 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_db)):
+    """Prometheus metrics in text exposition format.
+
+    Scheduler lag is sampled here, at scrape time, so a stalled scheduler
+    still shows up as growing lag.
+
+    Returns:
+        Response: All registered metrics
+    """
+    SCHEDULER_LAG.set(await db.run_sync(scheduler_lag))
+    return Response(content=render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information.
@@ -144,5 +171,6 @@ async def root():
         "name": "Krepsys API",
         "version": "0.1.0",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "metrics": "/metrics"
     }
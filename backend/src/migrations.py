@@ -0,0 +1,356 @@
+"""Versioned schema migrations.
+
+Each migration is a numbered step recorded in the ``schema_version`` table
+once it completes, so only pending steps ever run and a warm startup costs
+a single version query. A brand-new database is created from the models
+and stamped with the latest version without running any steps.
+
+Steps inspect the schema before changing it rather than relying on errors,
+because databases that predate this table may already have some of their
+changes. Large backfills commit in rowid batches, so they keep the WAL small,
+let other connections in between batches, and resume where they stopped
+after an interruption. Indexes are built one per transaction.
+
+Add a migration by appending a decorated function with the next version::
+
+    @migration(16, "articles.reading_time")
+    def _reading_time(conn):
+        add_column(conn, "articles", "reading_time", "INTEGER")
+
+Inspect or apply from the command line (from backend/)::
+
+    python -m src.migrations status
+    python -m src.migrations upgrade
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from src.database import Base
+from src.models import Article, ArticleBody, ContentDictionary, Feed, Highlight, PurgedUrl
+from src.utils.counters import install_counters, reconcile_counters
+from src.utils.search import rebuild_fts
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000  # rows per backfill transaction
+
+_VERSION_TABLE = (
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    "version INTEGER PRIMARY KEY, description TEXT NOT NULL, applied_at DATETIME NOT NULL)"
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Register the decorated function as schema step ``version``."""
+    def register(func: Callable[[Connection], None]):
+        if MIGRATIONS and version != MIGRATIONS[-1].version + 1:
+            raise ValueError(f"migration {version} does not follow {MIGRATIONS[-1].version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        return func
+    return register
+
+
+# ── Helpers for steps ────────────────────────────────────────────────────────
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(text(f"PRAGMA table_info({table})")))
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> bool:
+    """Add table.column with the given type/constraints if missing. Returns True if added."""
+    if has_column(conn, table, column):
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def batched(conn: Connection, table: str, statement: str, batch_size: int = BATCH_SIZE) -> int:
+    """Run statement once per committed rowid batch of table. Returns rows affected.
+
+    The statement restricts itself to a batch with
+    ``rowid > :start AND rowid <= :end``.
+    """
+    conn.commit()  # earlier DDL in this step must not share a batch's transaction
+    last = conn.execute(text(f"SELECT max(rowid) FROM {table}")).scalar() or 0
+    affected = 0
+    for start in range(0, last, batch_size):
+        affected += conn.execute(
+            text(statement), {"start": start, "end": start + batch_size}
+        ).rowcount
+        conn.commit()
+    return affected
+
+
+def backfill(
+    conn: Connection, table: str, assignment: str, where: str, batch_size: int = BATCH_SIZE
+) -> int:
+    """Run ``UPDATE table SET assignment WHERE where`` in committed rowid batches.
+
+    Returns rows updated. ``where`` should exclude already-filled rows so an
+    interrupted backfill resumes cheaply.
+    """
+    return batched(conn, table, (
+        f"UPDATE {table} SET {assignment} "
+        f"WHERE rowid > :start AND rowid <= :end AND ({where})"
+    ), batch_size)
+
+
+def create_missing_indexes(conn: Connection, *tables) -> None:
+    """Create the models' indexes that the database lacks, one transaction each."""
+    for table in tables:
+        for index in table.indexes:
+            if conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+            ), {"name": index.name}).first():
+                continue
+            started = time.perf_counter()
+            index.create(bind=conn)
+            conn.commit()
+            logger.info(f"Built index {index.name} in {time.perf_counter() - started:.1f}s")
+
+
+def _drop_fts_triggers(conn: Connection) -> None:
+    """Drop every trigger that writes to the full-text index."""
+    triggers = conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND sql LIKE '%articles_fts%'"
+    )).scalars().all()
+    for name in triggers:
+        conn.execute(text(f"DROP TRIGGER {name}"))
+
+
+# ── Steps ────────────────────────────────────────────────────────────────────
+
+@migration(1, "base tables")
+def _base_tables(conn):
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "articles.note and articles.excerpt")
+def _note_excerpt(conn):
+    add_column(conn, "articles", "note", "TEXT")
+    add_column(conn, "articles", "excerpt", "TEXT")
+
+
+@migration(3, "articles.sort_key")
+def _sort_key(conn):
+    add_column(conn, "articles", "sort_key", "DATETIME")
+    backfill(conn, "articles", "sort_key = COALESCE(published_at, fetched_at)", "sort_key IS NULL")
+
+
+@migration(4, "feeds conditional GET validators")
+def _validators(conn):
+    add_column(conn, "feeds", "etag", "VARCHAR")
+    add_column(conn, "feeds", "last_modified", "VARCHAR")
+
+
+@migration(5, "feeds scheduling columns")
+def _scheduling(conn):
+    add_column(conn, "feeds", "next_fetch_at", "DATETIME")
+    add_column(conn, "feeds", "min_fetch_interval", "INTEGER")
+    add_column(conn, "feeds", "max_fetch_interval", "INTEGER")
+    add_column(conn, "feeds", "effective_interval", "INTEGER")
+    add_column(conn, "feeds", "unchanged_streak", "INTEGER DEFAULT 0")
+    backfill(
+        conn, "feeds",
+        "next_fetch_at = COALESCE(datetime(last_fetched, '+' || fetch_interval || ' seconds'), "
+        "CURRENT_TIMESTAMP)",
+        "next_fetch_at IS NULL",
+    )
+
+
+@migration(6, "articles.word_count")
+def _word_count(conn):
+    # Filled by ``python -m src.utils.backfill``, which needs the HTML parser
+    add_column(conn, "articles", "word_count", "INTEGER")
+
+
+@migration(7, "feeds unread/saved counter columns")
+def _counter_columns(conn):
+    add_column(conn, "feeds", "unread_count", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "feeds", "saved_count", "INTEGER NOT NULL DEFAULT 0")
+
+
+@migration(8, "article and feed indexes")
+def _indexes(conn):
+    create_missing_indexes(conn, Article.__table__, Feed.__table__)
+
+
+@migration(9, "full-text search index")
+def _fts(conn):
+    # Built by step 15: the index now reads article_bodies, created in step 12
+    pass
+
+
+@migration(10, "feed counter triggers")
+def _counter_triggers(conn):
+    if install_counters(conn):
+        logger.info(f"Feed counters initialized: {reconcile_counters(conn)} feeds")
+
+
+@migration(11, "compressed article content")
+def _compressed_content(conn):
+    # Existing bodies stay readable as text; ``python -m src.utils.recompress``
+    # compresses them in batches
+    ContentDictionary.__table__.create(bind=conn, checkfirst=True)
+    add_column(conn, "articles", "content_dictionary_id",
+               "INTEGER REFERENCES content_dictionaries(id)")
+
+
+@migration(12, "article bodies side table")
+def _article_bodies(conn):
+    ArticleBody.__table__.create(bind=conn, checkfirst=True)
+    # The old index triggers read articles.content_text, and the new ones the
+    # table's creation just added expect step 15's index; that step reindexes
+    _drop_fts_triggers(conn)
+    if not has_column(conn, "articles", "content"):
+        return
+    moved = batched(conn, "articles", (
+        "INSERT OR IGNORE INTO article_bodies "
+        "(article_id, content, content_dictionary_id, content_text) "
+        "SELECT id, content, content_dictionary_id, content_text FROM articles "
+        "WHERE rowid > :start AND rowid <= :end "
+        "AND (content IS NOT NULL OR content_text IS NOT NULL)"
+    ))
+    # The old columns stay, emptied: SQLite cannot drop content_dictionary_id
+    # (a foreign key) without rebuilding the table, and a NULL costs one byte
+    backfill(
+        conn, "articles", "content = NULL, content_text = NULL, content_dictionary_id = NULL",
+        "content IS NOT NULL OR content_text IS NOT NULL OR content_dictionary_id IS NOT NULL",
+    )
+    logger.info(f"Moved {moved} article bodies to article_bodies; "
+                f"VACUUM to return the freed pages to the filesystem")
+
+
+@migration(13, "feed retention overrides")
+def _retention(conn):
+    add_column(conn, "feeds", "retention_days", "INTEGER")
+    add_column(conn, "feeds", "retention_keep", "INTEGER")
+    # Retention skips highlighted articles with a per-article lookup
+    create_missing_indexes(conn, Highlight.__table__)
+
+
+@migration(14, "purged article urls")
+def _purged_urls(conn):
+    PurgedUrl.__table__.create(bind=conn, checkfirst=True)
+
+
+@migration(15, "external-content search index")
+def _external_fts(conn):
+    # The old index stored its own copy of the text; its triggers share
+    # names with the new ones, so all of them go before the rebuild
+    _drop_fts_triggers(conn)
+    conn.execute(text("DROP TABLE IF EXISTS articles_fts"))
+    logger.info(f"Full-text index built: {rebuild_fts(conn)} articles")
+
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def current_version(conn: Connection) -> Optional[int]:
+    """Applied schema version, 0 for an unversioned database, None for an empty one."""
+    try:
+        version = conn.execute(text("SELECT max(version) FROM schema_version")).scalar()
+        return version or 0
+    except OperationalError:
+        conn.rollback()
+    has_tables = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )).first()
+    return 0 if has_tables else None
+
+
+def _record(conn: Connection, step: Migration) -> None:
+    conn.execute(
+        text("INSERT INTO schema_version (version, description, applied_at) "
+             "VALUES (:version, :description, :applied_at)"),
+        {"version": step.version, "description": step.description,
+         "applied_at": datetime.now(timezone.utc).replace(tzinfo=None)},
+    )
+
+
+def migrate(engine: Engine) -> List[int]:
+    """Bring the database up to LATEST_VERSION. Returns the versions applied.
+
+    An up-to-date database costs one query. An empty one is created from
+    the models and stamped as current.
+    """
+    with engine.connect() as conn:
+        version = current_version(conn)
+        if version == LATEST_VERSION:
+            return []
+
+        if version is None:
+            Base.metadata.create_all(bind=conn)
+            conn.execute(text(_VERSION_TABLE))
+            for step in MIGRATIONS:
+                _record(conn, step)
+            conn.commit()
+            logger.info(f"Created database schema at version {LATEST_VERSION}")
+            return [step.version for step in MIGRATIONS]
+
+        conn.execute(text(_VERSION_TABLE))
+        conn.commit()
+        applied = []
+        for step in MIGRATIONS:
+            if step.version <= version:
+                continue
+            started = time.perf_counter()
+            step.apply(conn)
+            _record(conn, step)
+            conn.commit()
+            applied.append(step.version)
+            logger.info(f"Migration {step.version} applied ({step.description}) "
+                        f"in {time.perf_counter() - started:.1f}s")
+        return applied
+
+
+def status(engine: Engine) -> Dict[str, object]:
+    """Current and latest versions plus pending step descriptions."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+    return {
+        "current": version,
+        "latest": LATEST_VERSION,
+        "pending": [f"{m.version}: {m.description}" for m in MIGRATIONS
+                    if version is None or m.version > version],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or apply schema migrations")
+    parser.add_argument("command", choices=["status", "upgrade"])
+    args = parser.parse_args()
+
+    from src.database import engine
+
+    if args.command == "status":
+        info = status(engine)
+        current = "empty" if info["current"] is None else info["current"]
+        print(f"Schema version {current} (latest {info['latest']})")
+        for line in info["pending"]:
+            print(f"  pending {line}")
+    else:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        applied = migrate(engine)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@
 from src.models.feed import Feed
 from src.models.tag import Tag, article_tags
 from src.models.highlight import Highlight
-from src.models.article import Article  # import last — depends on tag + highlight
+from src.models.content_dictionary import ContentDictionary
+from src.models.article_body import ArticleBody
+from src.models.purged_url import PurgedUrl
+from src.models.article import Article  # import last — depends on tag, highlight + body
 
-__all__ = ["Feed", "Article", "Tag", "article_tags", "Highlight"]
+__all__ = ["Feed", "Article", "Tag", "article_tags", "Highlight", "ContentDictionary", "ArticleBody",
+           "PurgedUrl"]
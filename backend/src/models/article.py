@@ -1,27 +1,49 @@
 """Article model for storing fetched articles."""
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database import Base
 from src.models.tag import article_tags
+from src.models.article_body import ArticleBody
+
+
+def _default_sort_key(context):
+    """Merge published_at and fetch time into a single, always-set ordering key."""
+    return context.get_current_parameters().get("published_at") or datetime.now(timezone.utc)
 
 
 class Article(Base):
     """Article model."""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # All articles, and range seeks for keyset pagination
+        Index("ix_articles_sort", "sort_key", "id"),
+        # Per-feed listing (also serves feed_id FK lookups)
+        Index("ix_articles_feed_sort", "feed_id", "sort_key", "id"),
+        # Partial indexes for the sidebar views; predicates must match the
+        # literal boolean filters emitted by list_articles
+        Index("ix_articles_inbox", "sort_key", "id",
+              sqlite_where=text("is_read = 0 AND is_archived = 0")),
+        Index("ix_articles_feed_inbox", "feed_id", "sort_key", "id",
+              sqlite_where=text("is_read = 0 AND is_archived = 0")),
+        Index("ix_articles_saved", "sort_key", "id", sqlite_where=text("is_saved = 1")),
+        Index("ix_articles_archived", "sort_key", "id", sqlite_where=text("is_archived = 1")),
+    )
 
     id           = Column(Integer, primary_key=True, index=True)
     feed_id      = Column(Integer, ForeignKey("feeds.id"), nullable=False)
     title        = Column(String, nullable=False)
     url          = Column(String, unique=True, nullable=False, index=True)
     author       = Column(String, nullable=True)
-    content      = Column(Text, nullable=True)
-    content_text = Column(Text, nullable=True)
+    word_count   = Column(Integer, nullable=True)
+    excerpt      = Column(Text, nullable=True)   # plain-text preview computed at ingest
     note         = Column(Text, nullable=True)   # personal reader note
     published_at = Column(DateTime, nullable=True)
     fetched_at   = Column(DateTime, server_default=func.now())
+    sort_key     = Column(DateTime, default=_default_sort_key)  # COALESCE(published_at, fetched_at)
     is_read      = Column(Boolean, default=False)
     is_saved     = Column(Boolean, default=False)
     is_archived  = Column(Boolean, default=False)
@@ -29,6 +51,32 @@ class Article(Base):
     feed       = relationship("Feed", back_populates="articles")
     tags       = relationship("Tag", secondary=article_tags, back_populates="articles")
     highlights = relationship("Highlight", back_populates="article", cascade="all, delete-orphan")
+    # Bodies live in article_bodies (see ArticleBody); rows removed by trigger
+    body       = relationship("ArticleBody", back_populates="article", uselist=False,
+                              cascade="all, delete-orphan", passive_deletes=True)
+
+    def _writable_body(self):
+        if self.body is None:
+            self.body = ArticleBody()
+        return self.body
+
+    @property
+    def content(self):
+        """Body HTML, decompressed on access (None if the article has no body)."""
+        return self.body.content if self.body is not None else None
+
+    @content.setter
+    def content(self, value):
+        self._writable_body().content = value
+
+    @property
+    def content_text(self):
+        """Normalized plain text computed at ingest."""
+        return self.body.content_text if self.body is not None else None
+
+    @content_text.setter
+    def content_text(self, value):
+        self._writable_body().content_text = value
 
     def __repr__(self):
         return f"<Article(id={self.id}, title='{self.title[:30]}...')>"
@@ -0,0 +1,77 @@
+"""Article body model: the large per-article text, kept out of ``articles``."""
+
+from sqlalchemy import Column, Integer, LargeBinary, Text, ForeignKey, DDL, event
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
+from src.database import Base
+from src.utils.compression import compress_content, decompress_content
+
+# SQLite runs without foreign key enforcement here, so ON DELETE CASCADE is
+# not acted on; this covers ORM, bulk and feed-cascade deletes alike
+CLEANUP_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS articles_bodies_ad AFTER DELETE ON articles BEGIN "
+    "DELETE FROM article_bodies WHERE article_id = old.id; END"
+)
+
+
+class ContentBlob(TypeDecorator):
+    """A BLOB of compressed frames that also passes legacy text rows through.
+
+    LargeBinary would coerce every value to bytes, which fails on the plain
+    text of older and tiny bodies; the driver already stores and returns
+    bytes as BLOB and str as TEXT, so values go through untouched.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+
+class ArticleBody(Base):
+    """HTML and plain text of one article.
+
+    Kept in a side table so ``articles`` rows stay narrow: list scans and
+    flag updates never walk overflow pages of body text they do not need.
+    Read and written through ``Article.content`` / ``Article.content_text``.
+    """
+
+    __tablename__ = "article_bodies"
+
+    article_id   = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    # Body HTML as stored: a compressed frame, or plain text for legacy and
+    # tiny bodies. Read and write it through ``content``.
+    content_data = Column("content", ContentBlob, nullable=True)
+    content_dictionary_id = Column(Integer, ForeignKey("content_dictionaries.id"), nullable=True)
+    content_text = Column(Text, nullable=True)   # normalized plain text computed at ingest
+
+    article = relationship("Article", back_populates="body")
+    # Eager, so async sessions never lazy-load it; no query when no row uses one
+    content_dictionary = relationship("ContentDictionary", lazy="selectin")
+
+    @hybrid_property
+    def content(self):
+        """Body HTML, decompressed on access. In SQL, the stored value."""
+        dictionary = self.content_dictionary
+        return decompress_content(self.content_data, dictionary.data if dictionary else None)
+
+    @content.inplace.setter
+    def _content_setter(self, value):
+        self.content_data = compress_content(value)
+        self.content_dictionary = None
+
+    @content.inplace.expression
+    @classmethod
+    def _content_expression(cls):
+        return cls.content_data
+
+    def __repr__(self):
+        return f"<ArticleBody(article_id={self.article_id})>"
+
+
+event.listen(ArticleBody.__table__, "after_create", DDL(CLEANUP_DDL).execute_if(dialect="sqlite"))
@@ -0,0 +1,27 @@
+"""Per-feed preset dictionaries for compressed article bodies."""
+
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from src.database import Base
+
+
+class ContentDictionary(Base):
+    """Deflate dictionary trained from one feed's bodies (see src/utils/compression.py).
+
+    Rows are never modified: retraining adds a new row, and bodies keep
+    pointing at the dictionary they were compressed with.
+    """
+
+    __tablename__ = "content_dictionaries"
+
+    id         = Column(Integer, primary_key=True)
+    feed_id    = Column(Integer, ForeignKey("feeds.id"), nullable=False, index=True)
+    data       = Column(LargeBinary, nullable=False)
+    samples    = Column(Integer, nullable=False)  # bodies it was trained from
+    created_at = Column(DateTime, server_default=func.now())
+
+    feed = relationship("Feed", back_populates="content_dictionaries")
+
+    def __repr__(self):
+        return f"<ContentDictionary(id={self.id}, feed_id={self.feed_id}, size={len(self.data)})>"
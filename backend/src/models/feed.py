@@ -1,6 +1,7 @@
 """Feed model for storing RSS feed information."""
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database import Base
@@ -10,17 +11,36 @@ class Feed(Base):
     """RSS feed model."""
 
     __tablename__ = "feeds"
+    __table_args__ = (
+        # Scheduler range query: active feeds with next_fetch_at <= now
+        Index("ix_feeds_due", "is_active", "next_fetch_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     url = Column(String, unique=True, nullable=False, index=True)
-    fetch_interval = Column(Integer, default=900)  # seconds
+    fetch_interval = Column(Integer, default=900)  # seconds; base interval before adaptation
+    min_fetch_interval = Column(Integer, nullable=True)  # bounds for the adaptive interval,
+    max_fetch_interval = Column(Integer, nullable=True)  # falling back to Settings when unset
+    effective_interval = Column(Integer, nullable=True)  # last computed adaptive interval
+    unchanged_streak = Column(Integer, default=0)  # consecutive fetches with nothing new
     last_fetched = Column(DateTime, nullable=True)
+    next_fetch_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))  # due immediately
+    etag = Column(String, nullable=True)  # validators for conditional GET
+    last_modified = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    retention_days = Column(Integer, nullable=True)  # retention policy overrides (0 = keep all),
+    retention_keep = Column(Integer, nullable=True)  # falling back to Settings when unset
+    # Maintained by triggers on articles (see src/utils/counters.py)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    saved_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationship to articles
     articles = relationship("Article", back_populates="feed", cascade="all, delete-orphan")
+    content_dictionaries = relationship(
+        "ContentDictionary", back_populates="feed", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Feed(id={self.id}, name='{self.name}')>"
@@ -10,7 +10,8 @@ class Highlight(Base):
     __tablename__ = "highlights"
 
     id         = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False,
+                        index=True)
     text       = Column(Text, nullable=False)
     color      = Column(String, default="yellow", nullable=False)  # yellow | green | blue | pink
     note       = Column(Text, nullable=True)   # optional note on this specific highlight
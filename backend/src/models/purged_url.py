@@ -0,0 +1,34 @@
+"""Tombstones for articles removed by retention policies."""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, DDL, event
+from sqlalchemy.sql import func
+from src.database import Base
+
+# Re-adding a feed starts it from scratch; like the body cleanup, done by a
+# trigger because foreign keys are not enforced
+CLEANUP_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS feeds_purged_urls_ad AFTER DELETE ON feeds BEGIN "
+    "DELETE FROM purged_urls WHERE feed_id = old.id; END"
+)
+
+
+class PurgedUrl(Base):
+    """URL of a purged article, so ingest does not store it again.
+
+    Feeds keep listing items for a while after retention deletes them;
+    without these, every fetch would bring them back as new unread articles.
+    Rows go when their feed is deleted.
+    """
+
+    __tablename__ = "purged_urls"
+
+    url       = Column(String, primary_key=True)
+    feed_id   = Column(Integer, ForeignKey("feeds.id", ondelete="CASCADE"), nullable=False,
+                       index=True)
+    purged_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<PurgedUrl(url='{self.url}')>"
+
+
+event.listen(PurgedUrl.__table__, "after_create", DDL(CLEANUP_DDL).execute_if(dialect="sqlite"))
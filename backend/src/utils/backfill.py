@@ -0,0 +1,103 @@
+"""Backfill ingest-time text fields for articles stored before extraction existed.
+
+Rows are processed in small primary-key batches, each in its own short
+transaction, so readers and the fetcher are never blocked for long. The job
+is idempotent and resumable: it only touches rows whose content_text is
+still NULL.
+
+Run it by hand with::
+
+    python -m src.utils.backfill [--batch-size N]
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from src.database import SessionLocal
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.utils.cache import article_list_cache
+from src.utils.text import extract_text
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 200
+BACKFILL_PAUSE = 0.05  # seconds between batches, leaving room for other writers
+
+
+def backfill_content_text(
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    pause: float = BACKFILL_PAUSE,
+) -> int:
+    """Populate content_text, word_count and excerpt for articles missing them.
+
+    Args:
+        session_factory: Creates a session per batch
+        batch_size: Articles read and updated per transaction
+        pause: Seconds to sleep between batches
+
+    Returns:
+        Number of articles updated
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        db = session_factory()
+        try:
+            bodies = db.scalars(
+                select(ArticleBody)
+                .where(
+                    ArticleBody.article_id > last_id,
+                    ArticleBody.content_text.is_(None),
+                    ArticleBody.content.is_not(None),
+                )
+                .order_by(ArticleBody.article_id)
+                .limit(batch_size)
+            ).all()
+            if not bodies:
+                break
+            last_id = bodies[-1].article_id  # read before commit expires it
+
+            # Extract before writing so the write transaction stays short
+            texts, fields = [], []
+            for body in bodies:
+                extracted = extract_text(body.content)
+                texts.append({"article_id": body.article_id, "content_text": extracted.text})
+                fields.append({
+                    "id": body.article_id,
+                    "word_count": extracted.word_count,
+                    "excerpt": extracted.excerpt,
+                })
+            db.execute(update(ArticleBody), texts)
+            db.execute(update(Article), fields)
+            db.commit()
+            article_list_cache.invalidate()
+        finally:
+            db.close()
+
+        updated += len(bodies)
+        if pause:
+            time.sleep(pause)
+
+    if updated:
+        logger.info(f"Text backfill: {updated} articles updated")
+    return updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill article plain text fields")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    import src.models  # noqa: F401 — register all tables
+
+    count = backfill_content_text(batch_size=args.batch_size)
+    print(f"Backfilled {count} articles")
+
+
+if __name__ == "__main__":
+    main()
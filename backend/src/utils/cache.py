@@ -0,0 +1,118 @@
+"""In-process LRU cache for article list responses.
+
+Entries are keyed by the normalized list parameters and hold the encoded
+response, so a hit is served without touching SQLite. Writes that change
+what a list returns call ``invalidate()``. That bumps a write version and
+drops every entry. A result computed while a write was in flight carries
+the old version and is never stored.
+
+The cache is bounded by entry count and by the total size of the stored
+bodies, since one unpaginated ``view=full`` page can run to megabytes.
+
+``invalidate()`` only reaches this process. Jobs run from the command line
+(retention, backfills, recompression) write from another one, so entries
+also expire ``max_age`` seconds after they were stored.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from src.config import Settings
+
+
+class ListCache:
+    """Size-bounded LRU cache guarded by a write version.
+
+    Thread-safe: the fetcher invalidates from worker threads while requests
+    read on the event loop.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int = 0, max_age: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 0 = no size bound
+        self.max_age = max_age  # seconds; 0 = kept until invalidated or evicted
+        self.size = 0  # bytes held, as reported to put()
+        self.hits = 0
+        self.misses = 0
+        self._version = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._stored_at: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Current write version; read it before computing a value to store."""
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key and mark it recently used, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and self.max_age and (
+                time.monotonic() - self._stored_at[key] >= self.max_age
+            ):
+                self._drop(key)
+                value = None
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: int, size: int = 0) -> None:
+        """Store value if no write happened since ``version`` was read.
+
+        ``size`` is the value's weight in bytes against ``max_bytes``; a value
+        larger than the whole budget is not stored.
+        """
+        if self.max_entries <= 0 or (self.max_bytes and size > self.max_bytes):
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            self.size += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._stored_at[key] = time.monotonic()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self.size > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Hashable) -> None:
+        """Remove one entry; the caller holds the lock."""
+        del self._entries[key]
+        del self._stored_at[key]
+        self.size -= self._sizes.pop(key)
+
+    def invalidate(self) -> None:
+        """Record a write: bump the version and drop all entries."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._sizes.clear()
+            self._stored_at.clear()
+            self.size = 0
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._stored_at.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+settings = Settings()
+article_list_cache = ListCache(
+    settings.list_cache_size, settings.list_cache_bytes, settings.list_cache_ttl
+)
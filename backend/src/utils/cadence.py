@@ -0,0 +1,38 @@
+"""Adaptive fetch intervals learned from a feed's publishing cadence."""
+
+from datetime import datetime
+from typing import Sequence
+
+HISTORY_SIZE = 20  # most recent dated articles considered
+MIN_HISTORY = 3  # fewer dated articles than this: fall back to the base interval
+CADENCE_FRACTION = 0.5  # poll twice per average publishing gap
+STREAK_BACKOFF = 0.5  # +50% interval per consecutive fetch with nothing new
+
+
+def adaptive_interval(
+    published: Sequence[datetime],
+    base_interval: int,
+    unchanged_streak: int,
+    min_interval: int,
+    max_interval: int,
+) -> int:
+    """Compute the next fetch interval in seconds.
+
+    Args:
+        published: Recent publish times, newest first
+        base_interval: The feed's configured fetch_interval, used without history
+        unchanged_streak: Consecutive fetches that were 304 or added no articles
+        min_interval: Lower bound for the result
+        max_interval: Upper bound for the result
+
+    Returns:
+        Interval clamped to [min_interval, max_interval]
+    """
+    if len(published) >= MIN_HISTORY:
+        span = (published[0] - published[-1]).total_seconds()
+        interval = span / (len(published) - 1) * CADENCE_FRACTION
+    else:
+        interval = base_interval
+
+    interval *= 1 + STREAK_BACKOFF * unchanged_streak
+    return int(min(max(interval, min_interval), max(min_interval, max_interval)))
@@ -0,0 +1,107 @@
+"""Compressed storage for article bodies.
+
+Bodies are kept in ``article_bodies.content`` as a one-byte codec tag
+followed by a raw deflate stream (no zlib header or checksum; SQLite already
+guards its pages). Rows written before compression existed, and bodies too small to
+gain anything, hold plain text, so readers accept both: ``str`` values are
+returned unchanged and ``bytes`` are decoded by their tag.
+
+A feed may have a preset dictionary trained from its own recent bodies.
+Items from one feed repeat the same markup and boilerplate, and a
+dictionary lets even a short body refer to it instead of spelling it out.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import Optional, Sequence, Union
+from src.config import Settings
+
+settings = Settings()
+
+CODEC_DEFLATE = 1  # raw deflate
+CODEC_DEFLATE_DICT = 2  # raw deflate primed with the feed's dictionary
+
+# Deflate only looks back 32 KiB, so leave room in the window for the body
+DICTIONARY_SIZE = 16 * 1024
+MIN_SEGMENT = 4  # shorter tags and text runs are cheap to encode anyway
+
+# Markup tags and the text runs between them
+_SEGMENTS = re.compile(r"<[^>]*>|[^<]+")
+
+StoredContent = Union[str, bytes, None]
+
+
+def compress_content(
+    content: Optional[str],
+    dictionary: Optional[bytes] = None,
+    level: Optional[int] = None,
+) -> StoredContent:
+    """Encode a body for storage.
+
+    Returns the body unchanged when compression is disabled (level 0) or
+    would not make it smaller.
+    """
+    level = settings.content_compression_level if level is None else level
+    if content is None or level <= 0:
+        return content
+    raw = content.encode("utf-8")
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary)
+        tag = CODEC_DEFLATE_DICT
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        tag = CODEC_DEFLATE
+    frame = bytes([tag]) + compressor.compress(raw) + compressor.flush()
+    return frame if len(frame) < len(raw) else content
+
+
+def uses_dictionary(stored: StoredContent) -> bool:
+    """Whether a stored body can only be decoded with its feed's dictionary."""
+    return isinstance(stored, bytes) and stored[:1] == bytes([CODEC_DEFLATE_DICT])
+
+
+def decompress_content(stored: StoredContent, dictionary: Optional[bytes] = None) -> Optional[str]:
+    """Decode a stored body back to its HTML.
+
+    Raises:
+        ValueError: If the codec tag is unknown, or the body needs a
+            dictionary that was not given
+    """
+    if stored is None or isinstance(stored, str):
+        return stored
+    tag, payload = stored[0], memoryview(stored)[1:]
+    if tag == CODEC_DEFLATE:
+        decompressor = zlib.decompressobj(-15)
+    elif tag == CODEC_DEFLATE_DICT:
+        if dictionary is None:
+            raise ValueError("body was compressed with a dictionary that was not provided")
+        decompressor = zlib.decompressobj(-15, zdict=dictionary)
+    else:
+        raise ValueError(f"unknown content codec {tag}")
+    return (decompressor.decompress(payload) + decompressor.flush()).decode("utf-8")
+
+
+def train_dictionary(samples: Sequence[str], size: int = DICTIONARY_SIZE) -> bytes:
+    """Build a deflate preset dictionary from segments shared by several samples.
+
+    Bodies are split into tags and text runs. A segment seen in at least two
+    samples scores its length times the number of samples containing it;
+    the best fill the dictionary, and go last, where deflate reaches them
+    with the shortest distances. Returns b"" if the samples share nothing.
+    """
+    frequency = Counter()
+    for sample in samples:
+        frequency.update({s for s in _SEGMENTS.findall(sample) if len(s) >= MIN_SEGMENT})
+    shared = sorted(
+        (s for s, n in frequency.items() if n >= 2),
+        key=lambda s: len(s) * frequency[s],
+        reverse=True,
+    )
+    chosen, used = [], 0
+    for segment in shared:
+        encoded = segment.encode("utf-8")
+        if used + len(encoded) <= size:
+            chosen.append(encoded)
+            used += len(encoded)
+    return b"".join(reversed(chosen))
@@ -0,0 +1,122 @@
+"""Per-feed unread and saved counters maintained by SQLite triggers.
+
+``feeds.unread_count`` counts articles that are neither read nor archived
+(the inbox), and ``feeds.saved_count`` counts saved articles. Triggers on
+``articles`` adjust both inside the writing transaction. Every path is
+covered: ingest, single and bulk updates, and deletes, including the
+cascade from deleting a feed. Badge reads are then O(feeds).
+
+Detect and repair drift (e.g. after manual SQL edits) with::
+
+    python -m src.utils.counters check
+    python -m src.utils.counters reconcile
+"""
+
+import argparse
+import logging
+from typing import List, Tuple
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+from src.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+
+def _unread(ref: str) -> str:
+    return f"(COALESCE({ref}.is_read, 0) = 0 AND COALESCE({ref}.is_archived, 0) = 0)"
+
+
+def _saved(ref: str) -> str:
+    return f"(COALESCE({ref}.is_saved, 0) = 1)"
+
+
+def _adjust(sign: str, ref: str) -> str:
+    return (
+        f"UPDATE feeds SET unread_count = unread_count {sign} {_unread(ref)}, "
+        f"saved_count = saved_count {sign} {_saved(ref)} WHERE id = {ref}.feed_id;"
+    )
+
+
+TRIGGER_NAMES = ["articles_counts_ai", "articles_counts_au", "articles_counts_ad"]
+
+COUNTER_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS articles_counts_ai AFTER INSERT ON articles BEGIN "
+    f"{_adjust('+', 'new')} END",
+    "CREATE TRIGGER IF NOT EXISTS articles_counts_au "
+    "AFTER UPDATE OF is_read, is_saved, is_archived, feed_id ON articles "
+    f"WHEN {_unread('old')} != {_unread('new')} OR {_saved('old')} != {_saved('new')} "
+    "OR old.feed_id != new.feed_id BEGIN "
+    f"{_adjust('-', 'old')} {_adjust('+', 'new')} END",
+    "CREATE TRIGGER IF NOT EXISTS articles_counts_ad AFTER DELETE ON articles BEGIN "
+    f"{_adjust('-', 'old')} END",
+]
+
+# Actual counts per feed, computed the slow way
+_ACTUAL_COUNTS = (
+    "SELECT f.id AS feed_id, COALESCE(a.unread, 0) AS unread, COALESCE(a.saved, 0) AS saved "
+    f"FROM feeds f LEFT JOIN (SELECT feed_id, SUM({_unread('articles')}) AS unread, "
+    f"SUM({_saved('articles')}) AS saved FROM articles GROUP BY feed_id) a "
+    "ON a.feed_id = f.id"
+)
+
+# Install alongside the articles table whenever metadata.create_all creates it
+for _stmt in COUNTER_DDL:
+    event.listen(Article.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+
+
+def install_counters(conn: Connection) -> bool:
+    """Create the counter triggers if missing. Returns True if any were new."""
+    existing = {
+        row[0] for row in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'articles_counts_%'"
+        ))
+    }
+    for stmt in COUNTER_DDL:
+        conn.execute(text(stmt))
+    return not set(TRIGGER_NAMES) <= existing
+
+
+def check_counters(conn: Connection) -> List[Tuple[int, int, int, int, int]]:
+    """Return (feed_id, unread_count, actual_unread, saved_count, actual_saved) for drifted feeds."""
+    return [tuple(row) for row in conn.execute(text(
+        "SELECT f.id, f.unread_count, c.unread, f.saved_count, c.saved "
+        f"FROM feeds f JOIN ({_ACTUAL_COUNTS}) c ON c.feed_id = f.id "
+        "WHERE f.unread_count IS NOT c.unread OR f.saved_count IS NOT c.saved "
+        "ORDER BY f.id"
+    ))]
+
+
+def reconcile_counters(conn: Connection) -> int:
+    """Recompute counters from articles, fixing drifted feeds. Returns feeds repaired."""
+    result = conn.execute(text(
+        "UPDATE feeds SET unread_count = c.unread, saved_count = c.saved "
+        f"FROM ({_ACTUAL_COUNTS}) AS c "
+        "WHERE feeds.id = c.feed_id "
+        "AND (feeds.unread_count IS NOT c.unread OR feeds.saved_count IS NOT c.saved)"
+    ))
+    if result.rowcount:
+        logger.warning(f"Feed counters: repaired drift on {result.rowcount} feed(s)")
+    return result.rowcount
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or repair per-feed article counters")
+    parser.add_argument("command", choices=["check", "reconcile"])
+    args = parser.parse_args()
+
+    from src.database import engine
+    import src.models  # noqa: F401 — register all tables
+
+    with engine.begin() as conn:
+        if args.command == "check":
+            drifted = check_counters(conn)
+            for feed_id, unread, actual_unread, saved, actual_saved in drifted:
+                print(f"feed {feed_id}: unread {unread} (actual {actual_unread}), "
+                      f"saved {saved} (actual {actual_saved})")
+            print(f"{len(drifted)} feed(s) drifted")
+        else:
+            print(f"Repaired {reconcile_counters(conn)} feed(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Concurrent feed downloader used by the background scheduler.
+
+Downloads run in parallel on an async HTTP client, bounded by a global and a
+per-host concurrency limit. Parsing happens off the event loop — in a process
+pool when configured, so feedparser's CPU time does not hold the web
+process's GIL — and database writes are serialized through a single writer,
+since SQLite allows only one writer at a time.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+import httpx
+from src.database import SessionLocal
+from src.utils.fetcher import (
+    USER_AGENT, fetch_stats, mark_not_modified, parse_feed_bytes, store_entries,
+)
+from src.utils.metrics import FEED_FETCH_BYTES, FEED_FETCH_ENTRIES, FEED_FETCH_SECONDS, FEED_FETCHES
+
+logger = logging.getLogger(__name__)
+
+PARSE_TIMEOUT = 60.0  # seconds one document may take to parse
+
+
+def _report_worker(pids) -> None:
+    """Parse pool initializer: tell the engine this worker's PID."""
+    pids.put(os.getpid())
+
+
+class FeedTarget(NamedTuple):
+    """A feed to fetch, with the cache validators from its last fetch."""
+    id: int
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class FetchEngine:
+    """Fetch many feeds concurrently and hand parsed results to the DB writer."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        per_host_concurrency: int = 2,
+        timeout: float = 30.0,
+        parse_pool_size: int = 0,
+        parse_timeout: float = PARSE_TIMEOUT,
+        session_factory=SessionLocal,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout = timeout
+        self.parse_pool_size = parse_pool_size
+        self.parse_timeout = parse_timeout
+        self.session_factory = session_factory
+        self.transport = transport
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pids = None  # queue the current pool's workers report to
+
+    def _parse_executor(self) -> Optional[Executor]:
+        """Return the process pool for parsing, or None for the default thread executor."""
+        if self.parse_pool_size <= 0:
+            return None
+        if self._parse_pool is None:
+            # spawn, not fork: the parent runs threads (executor, uvicorn) that
+            # must not be duplicated mid-operation into the children
+            context = multiprocessing.get_context("spawn")
+            self._parse_pids = context.SimpleQueue()
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_pool_size,
+                mp_context=context,
+                initializer=_report_worker,
+                initargs=(self._parse_pids,),
+            )
+        return self._parse_pool
+
+    def _discard_parse_pool(self, pool: Executor) -> None:
+        """Drop a broken or stuck pool so the next parse starts a fresh one."""
+        if pool is None or pool is not self._parse_pool:
+            return  # the thread executor, or already replaced by another parse
+        pids, self._parse_pool, self._parse_pids = self._parse_pids, None, None
+        # shutdown() does not stop busy workers; a stuck one must be killed
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # already gone
+        pids.close()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _parse(self, content: bytes, headers: Dict[str, str]):
+        """Parse a document off the event loop, as parse_feed_bytes does.
+
+        A worker that crashes or is killed breaks the whole process pool; it
+        is replaced and the document retried once. A document that breaks
+        the fresh pool too, or outlasts parse_timeout, comes back as a parse
+        error instead of stalling later rounds.
+
+        Without a process pool the timeout only stops the wait: a thread
+        cannot be killed, so it stays busy until feedparser returns, taking
+        one of the default executor's threads with it.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._parse_executor()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, parse_feed_bytes, content, headers),
+                    self.parse_timeout,
+                )
+            except BrokenProcessPool:
+                logger.warning("Parse worker died; restarting the parse pool")
+                self._discard_parse_pool(executor)
+            except asyncio.TimeoutError:
+                if executor is None:
+                    logger.warning("Parse timed out in a thread, which keeps running; "
+                                   "set PARSE_POOL_SIZE so stuck parses can be killed")
+                self._discard_parse_pool(executor)
+                return [], f"parse timed out after {self.parse_timeout:g}s", self.parse_timeout
+        return [], "parse worker crashed", 0.0
+
+    def close(self) -> None:
+        """Shut down the parse pool, if one was started."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
+    def _store_with_session(self, feed_id: int, feed_url: str, entries, headers) -> int:
+        """Write parsed entries in a fresh DB session (runs in an executor)."""
+        db = self.session_factory()
+        try:
+            return store_entries(
+                feed_id, feed_url, entries, db,
+                etag=headers.get("etag"), last_modified=headers.get("last-modified"),
+            )
+        finally:
+            db.close()
+
+    def _mark_not_modified_with_session(self, feed_id: int) -> int:
+        """Stamp a 304'd feed in a fresh DB session (runs in an executor)."""
+        db = self.session_factory()
+        try:
+            mark_not_modified(feed_id, db)
+            return 0
+        finally:
+            db.close()
+
+    async def fetch_all(self, feeds: Iterable[tuple]) -> Dict[int, int]:
+        """Fetch every feed, given as FeedTarget or (id, url, ...) tuples.
+
+        Returns new-article counts keyed by feed id.
+        """
+        feeds = [FeedTarget(*feed) for feed in feeds]
+        if not feeds:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+        writer_lock = asyncio.Lock()
+        results: Dict[int, int] = {}
+
+        async def fetch_one(client: httpx.AsyncClient, feed: FeedTarget) -> None:
+            feed_id, feed_url = feed.id, feed.url
+            host = urlsplit(feed_url).hostname or ""
+            headers = {}
+            if feed.etag:
+                headers["If-None-Match"] = feed.etag
+            if feed.last_modified:
+                headers["If-Modified-Since"] = feed.last_modified
+            try:
+                async with host_limits[host], global_limit:
+                    started = time.perf_counter()  # after queueing for a slot
+                    try:
+                        response = await client.get(feed_url, headers=headers)
+                    finally:
+                        FEED_FETCH_SECONDS.observe(time.perf_counter() - started)
+                if response.status_code == 304:
+                    # Unchanged since last fetch: skip parsing and entry processing
+                    fetch_stats.record_not_modified(feed_id)
+                    FEED_FETCHES.labels("not_modified").inc()
+                    async with writer_lock:
+                        results[feed_id] = await loop.run_in_executor(
+                            None, self._mark_not_modified_with_session, feed_id
+                        )
+                    return
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to fetch feed {feed_url}: {e}")
+                FEED_FETCHES.labels("error").inc()
+                results[feed_id] = 0
+                return
+
+            response_headers = dict(response.headers)
+            entries, error, parse_seconds = await self._parse(response.content, response_headers)
+            fetch_stats.record_fetch(feed_id, len(response.content), parse_seconds)
+            FEED_FETCH_BYTES.observe(len(response.content))
+            if error:
+                logger.warning(f"Feed parse error for {feed_url}: {error}")
+                FEED_FETCHES.labels("parse_error").inc()
+                results[feed_id] = 0
+                return
+            FEED_FETCH_ENTRIES.observe(len(entries))
+            FEED_FETCHES.labels("ok").inc()
+
+            async with writer_lock:
+                results[feed_id] = await loop.run_in_executor(
+                    None, self._store_with_session, feed_id, feed_url, entries, response_headers
+                )
+
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            transport=self.transport,
+        ) as client:
+            outcomes = await asyncio.gather(
+                *(fetch_one(client, feed) for feed in feeds),
+                return_exceptions=True,
+            )
+
+        for feed, outcome in zip(feeds, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Unexpected error fetching feed {feed.url}", exc_info=outcome)
+                results.setdefault(feed.id, 0)
+        return results
@@ -1,71 +1,335 @@
 """RSS/Atom feed fetcher."""
 
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 import feedparser
+import httpx
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.config import Settings
+from src.models.content_dictionary import ContentDictionary
 from src.models.feed import Feed
+from src.models.purged_url import PurgedUrl
+from src.utils.cache import article_list_cache
+from src.utils.cadence import HISTORY_SIZE, adaptive_interval
+from src.utils.compression import compress_content, uses_dictionary
+from src.utils.metrics import (
+    FEED_FETCH_BYTES, FEED_FETCH_BYTES_SAVED, FEED_FETCH_ENTRIES, FEED_FETCH_SECONDS,
+    FEED_FETCHES, FEED_PARSE_SECONDS_SAVED, INGESTED_ARTICLES,
+)
+from src.utils.text import extract_text
 
 logger = logging.getLogger(__name__)
+settings = Settings()
+
+USER_AGENT = "Krepsys/0.1.0 (+https://github.com/electricsheepco/krepsys)"
+URL_LOOKUP_CHUNK = 500  # stay well under SQLite's bound-parameter limit
+
+
+class FetchStats:
+    """Process-wide counters for conditional GET savings.
+
+    A 304 response is credited with the body size and parse time last observed
+    for that feed, which is what the fetch would otherwise have cost.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.fetched = 0
+        self.not_modified = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.parse_seconds = 0.0
+        self.parse_seconds_saved = 0.0
+        self._last_cost: Dict[int, tuple] = {}
+
+    def record_fetch(self, feed_id: int, nbytes: int, parse_seconds: float) -> None:
+        self.fetched += 1
+        self.bytes_downloaded += nbytes
+        self.parse_seconds += parse_seconds
+        self._last_cost[feed_id] = (nbytes, parse_seconds)
+
+    def record_not_modified(self, feed_id: int) -> None:
+        self.not_modified += 1
+        nbytes, parse_seconds = self._last_cost.get(feed_id, (0, 0.0))
+        self.bytes_saved += nbytes
+        self.parse_seconds_saved += parse_seconds
+        FEED_FETCH_BYTES_SAVED.inc(nbytes)
+        FEED_PARSE_SECONDS_SAVED.inc(parse_seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "fetched": self.fetched,
+            "not_modified": self.not_modified,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_saved": self.bytes_saved,
+            "parse_seconds": round(self.parse_seconds, 6),
+            "parse_seconds_saved": round(self.parse_seconds_saved, 6),
+        }
+
+
+fetch_stats = FetchStats()
 
 
 def fetch_feed(feed_id: int, feed_url: str, db: Session) -> int:
-    """Fetch a feed and store new articles. Returns count of new articles added."""
+    """Fetch a feed and store new articles. Returns count of new articles added.
+
+    Sends the feed's stored ETag / Last-Modified validators so an unchanged
+    feed costs a 304 and a timestamp update instead of a full parse. Like the
+    fetch engine, downloads and parses in separate steps, so a full fetch
+    records the size and parse time a later 304 is credited with saving.
+    """
+    feed_obj = db.query(Feed).filter(Feed.id == feed_id).first()
+    headers = {"User-Agent": USER_AGENT}
+    if feed_obj is not None and feed_obj.etag:
+        headers["If-None-Match"] = feed_obj.etag
+    if feed_obj is not None and feed_obj.last_modified:
+        headers["If-Modified-Since"] = feed_obj.last_modified
+
+    started = time.perf_counter()
     try:
-        parsed = feedparser.parse(feed_url)
-    except Exception as e:
+        response = httpx.get(
+            feed_url, headers=headers, timeout=settings.fetch_timeout, follow_redirects=True
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+    except httpx.HTTPError as e:
         logger.error(f"Failed to fetch feed {feed_url}: {e}")
+        FEED_FETCHES.labels("error").inc()
         return 0
+    finally:
+        FEED_FETCH_SECONDS.observe(time.perf_counter() - started)
 
-    if parsed.bozo and not parsed.entries:
-        logger.warning(f"Feed parse error for {feed_url}: {parsed.bozo_exception}")
+    if response.status_code == 304:
+        fetch_stats.record_not_modified(feed_id)
+        FEED_FETCHES.labels("not_modified").inc()
+        mark_not_modified(feed_id, db)
         return 0
 
+    response_headers = dict(response.headers)
+    entries, error, parse_seconds = parse_feed_bytes(response.content, response_headers)
+    fetch_stats.record_fetch(feed_id, len(response.content), parse_seconds)
+    FEED_FETCH_BYTES.observe(len(response.content))
+    if error:
+        logger.warning(f"Feed parse error for {feed_url}: {error}")
+        FEED_FETCHES.labels("parse_error").inc()
+        return 0
+
+    FEED_FETCH_ENTRIES.observe(len(entries))
+    FEED_FETCHES.labels("ok").inc()
+    return store_entries(
+        feed_id, feed_url, entries, db,
+        etag=response_headers.get("etag"), last_modified=response_headers.get("last-modified"),
+    )
+
+
+def _stamp_fetched(db: Session, feed_id: int, now: datetime, new_count: int, **values) -> None:
+    """Record a completed fetch and schedule the next one.
+
+    The next interval adapts to the feed's recent publishing cadence and
+    backs off while fetches keep turning up nothing new.
+    """
+    feed = db.query(Feed).filter(Feed.id == feed_id).first()
+    if feed is None:
+        return  # feed deleted while the fetch was in flight
+
+    streak = 0 if new_count else (feed.unchanged_streak or 0) + 1
+    published = [
+        row[0] for row in db.query(Article.published_at)
+        .filter(Article.feed_id == feed_id, Article.published_at.isnot(None))
+        .order_by(Article.sort_key.desc())
+        .limit(HISTORY_SIZE)
+    ]
+    interval = adaptive_interval(
+        published,
+        base_interval=feed.fetch_interval,
+        unchanged_streak=streak,
+        min_interval=feed.min_fetch_interval or settings.adaptive_min_interval,
+        max_interval=feed.max_fetch_interval or settings.adaptive_max_interval,
+    )
+    db.execute(
+        update(Feed)
+        .where(Feed.id == feed_id)
+        .values(
+            last_fetched=now,
+            next_fetch_at=now + timedelta(seconds=interval),
+            effective_interval=interval,
+            unchanged_streak=streak,
+            **values,
+        )
+    )
+
+
+def mark_not_modified(feed_id: int, db: Session) -> None:
+    """Stamp last_fetched for a feed whose server answered 304 Not Modified."""
+    _stamp_fetched(db, feed_id, datetime.now(timezone.utc), new_count=0)
+    db.commit()
+
+
+class ParsedEntry(NamedTuple):
+    """Compact, picklable article fields extracted from one feed entry."""
+    title: str
+    url: str
+    author: Optional[str]
+    content: Optional[str]
+    content_text: Optional[str]
+    word_count: int
+    excerpt: Optional[str]
+    published_at: Optional[datetime]
+
+
+def _entry_fields(entry) -> Optional[ParsedEntry]:
+    """Extract article column values from a feedparser entry, or None if it has no link."""
+    url = entry.get("link")
+    if not url:
+        return None
+
+    # Extract content — prefer full content over summary
+    content = None
+    if entry.get("content"):
+        content = entry.content[0].get("value")
+    if not content:
+        content = entry.get("summary")
+
+    # Parse published date
+    published_at = None
+    if entry.get("published_parsed"):
+        try:
+            published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        except Exception:
+            pass
+
+    extracted = extract_text(content)
+    return ParsedEntry(
+        title=entry.get("title", "Untitled"),
+        url=url,
+        author=entry.get("author"),
+        content=content,
+        content_text=extracted.text if content is not None else None,
+        word_count=extracted.word_count if content is not None else None,
+        excerpt=extracted.excerpt,
+        published_at=published_at,
+    )
+
+
+def extract_entries(parsed) -> List[ParsedEntry]:
+    """Convert a feedparser result into ParsedEntry tuples, dropping link-less entries."""
+    return [fields for fields in map(_entry_fields, parsed.entries) if fields]
+
+
+def parse_feed_bytes(
+    content: bytes, headers: Dict[str, str]
+) -> Tuple[List[ParsedEntry], Optional[str], float]:
+    """Parse a downloaded feed body into compact entries.
+
+    Module-level and free of DB access so it can run in a worker process;
+    only the small result tuples are pickled back to the parent.
+
+    Returns:
+        (entries, error, parse_seconds) — error is set when the document could
+        not be parsed into any entries
+    """
+    started = time.perf_counter()
+    parsed = feedparser.parse(content, response_headers=headers)
+    error = None
+    if parsed.bozo and not parsed.entries:
+        error = str(parsed.get("bozo_exception", "unparseable feed"))
+    entries = extract_entries(parsed)
+    return entries, error, time.perf_counter() - started
+
+
+def _existing_urls(db: Session, urls: List[str]) -> Set[str]:
+    """Return the subset of urls already stored or purged, using set-based IN lookups."""
+    existing = set()
+    for start in range(0, len(urls), URL_LOOKUP_CHUNK):
+        chunk = urls[start:start + URL_LOOKUP_CHUNK]
+        existing.update(db.scalars(
+            select(Article.url).where(Article.url.in_(chunk))
+            .union(select(PurgedUrl.url).where(PurgedUrl.url.in_(chunk)))
+        ))
+    return existing
+
+
+def current_dictionary(db: Session, feed_id: int) -> Optional[ContentDictionary]:
+    """The feed's newest content dictionary, used to compress new bodies."""
+    return db.scalar(
+        select(ContentDictionary)
+        .where(ContentDictionary.feed_id == feed_id)
+        .order_by(ContentDictionary.id.desc())
+        .limit(1)
+    )
+
+
+def store_entries(
+    feed_id: int,
+    feed_url: str,
+    entries: List[ParsedEntry],
+    db: Session,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> int:
+    """Store new entries from a parsed feed and stamp the feed.
+
+    Known URLs, stored or purged by retention, are filtered with one
+    set-based lookup, and the remainder is written with a batched INSERT ...
+    ON CONFLICT(url) DO NOTHING, so a concurrent fetch of the same feed cannot
+    create duplicates or inflate the count. Bodies go to article_bodies,
+    compressed with the feed's dictionary if it has one. Records last_fetched
+    and the response's cache validators in the same transaction. Returns count
+    of new articles added.
+    """
+    # Deduplicate within the feed document, keeping the first occurrence
+    candidates = {}
+    for entry in entries:
+        candidates.setdefault(entry.url, entry)
+
+    existing = _existing_urls(db, list(candidates))
+    now = datetime.now(timezone.utc)
+    fresh = [entry for url, entry in candidates.items() if url not in existing]
+    dictionary = current_dictionary(db, feed_id) if fresh else None
+    rows, bodies = [], {}
+    for entry in fresh:
+        row = entry._asdict()
+        content, content_text = row.pop("content"), row.pop("content_text")
+        rows.append({**row, "feed_id": feed_id, "sort_key": entry.published_at or now})
+        if content is not None or content_text is not None:
+            # Compressed before the INSERT, outside the write lock
+            stored = compress_content(content, dictionary.data if dictionary else None)
+            bodies[entry.url] = {
+                "content_data": stored,
+                "content_dictionary_id": dictionary.id if uses_dictionary(stored) else None,
+                "content_text": content_text,
+            }
+
     new_count = 0
-    for entry in parsed.entries:
-        url = entry.get("link")
-        if not url:
-            continue
-
-        # Skip if already stored
-        if db.query(Article).filter(Article.url == url).first():
-            continue
-
-        # Extract content — prefer full content over summary
-        content = None
-        if entry.get("content"):
-            content = entry.content[0].get("value")
-        if not content:
-            content = entry.get("summary")
-
-        # Parse published date
-        published_at = None
-        if entry.get("published_parsed"):
-            try:
-                published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-            except Exception:
-                pass
-
-        article = Article(
-            feed_id=feed_id,
-            title=entry.get("title", "Untitled"),
-            url=url,
-            author=entry.get("author"),
-            content=content,
-            content_text=None,
-            published_at=published_at,
+    if rows:
+        stmt = (
+            sqlite_insert(Article)
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(Article.id, Article.url)
         )
-        db.add(article)
-        new_count += 1
+        inserted = db.execute(stmt, rows).all()
+        new_count = len(inserted)
+        body_rows = [
+            {"article_id": article_id, **bodies[url]}
+            for article_id, url in inserted if url in bodies
+        ]
+        if body_rows:
+            db.execute(insert(ArticleBody), body_rows)
+
+    _stamp_fetched(db, feed_id, now, new_count, etag=etag, last_modified=last_modified)
+    db.commit()
 
     if new_count:
-        db.commit()
+        article_list_cache.invalidate()
+        INGESTED_ARTICLES.inc(new_count)
         logger.info(f"Feed {feed_url}: added {new_count} new articles")
 
-    feed_obj = db.query(Feed).filter(Feed.id == feed_id).first()
-    if feed_obj:
-        feed_obj.last_fetched = datetime.now(timezone.utc)
-        db.commit()
-
     return new_count
@@ -0,0 +1,186 @@
+"""Per-request SQL instrumentation.
+
+Hooks every engine created through ``src.database`` and a request
+middleware, so that each request gets:
+- its own query count and SQL time, in the per-request JSON log line and,
+  when DB_TIMING_HEADERS is set, in ``Server-Timing`` / ``X-DB-Queries``
+  response headers
+- the request metrics exported at ``/metrics``
+
+Statements slower than SLOW_QUERY_MS are logged with their SQL and the
+shapes of their bound parameters (types and counts, never values).
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.config import Settings
+from src.utils.metrics import (
+    DB_QUERY_SECONDS, HTTP_DB_QUERIES, HTTP_DB_SECONDS, HTTP_LATENCY, HTTP_REQUESTS,
+)
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+MAX_LOGGED_STATEMENT = 2000  # characters of SQL kept in a slow-query record
+QUIET_ROUTES = {"/health", "/metrics"}  # polled by probes; no per-request log line
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request."""
+
+    __slots__ = ("path", "count", "seconds")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Mutable holder, so statements run in copied contexts (worker threads,
+# SQLAlchemy's async greenlets) still add to the request's totals
+_request_queries: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+
+def _type_runs(values) -> List[str]:
+    """Type names of values, with consecutive repeats collapsed to ``name*count``."""
+    runs: List[list] = []
+    for value in values:
+        name = type(value).__name__
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return [name if count == 1 else f"{name}*{count}" for name, count in runs]
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type, without their values.
+
+    ``("a", "b", 3)`` becomes ``["str*2", "int"]``; a named mapping keeps its
+    keys; an executemany batch reports its row count and the first row's shape.
+    """
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return _type_runs(parameters)
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own context, which is discarded whether or not
+    # the statement raises; a stack on the pooled connection would leak an
+    # entry for every failed statement
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    threshold = settings.slow_query_ms
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        logger.warning(
+            f"Slow query: {elapsed * 1000:.1f} ms",
+            extra={
+                "duration_ms": round(elapsed * 1000, 3),
+                "statement": " ".join(statement.split())[:MAX_LOGGED_STATEMENT],
+                "parameters": parameter_shape(parameters, executemany),
+                "request_path": stats.path if stats is not None else None,
+            },
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run on engine (for async engines, pass ``sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _timing_headers(queries: QueryStats, elapsed_ms: float) -> List[tuple]:
+    """Raw ASGI headers reporting SQL cost so far and total time to first byte."""
+    server_timing = (
+        f'db;dur={queries.seconds * 1000:.3f};desc="{queries.count} queries", '
+        f"app;dur={elapsed_ms:.3f}"
+    )
+    return [
+        (b"server-timing", server_timing.encode()),
+        (b"x-db-queries", str(queries.count).encode()),
+    ]
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware timing each request and the SQL it issues.
+
+    Plain ASGI rather than BaseHTTPMiddleware, which would add a task and
+    stream copy to every request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        finished: Optional[float] = None
+        queries = QueryStats(scope["path"])
+        response_queries = (0, 0.0)
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message):
+            nonlocal status, finished, response_queries
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.db_timing_headers:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    message["headers"] = [
+                        *message.get("headers", []), *_timing_headers(queries, elapsed_ms)
+                    ]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                # Background tasks run after this; their time and SQL are not the response's
+                finished = time.perf_counter()
+                response_queries = (queries.count, queries.seconds)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            if finished is None:
+                finished, response_queries = time.perf_counter(), (queries.count, queries.seconds)
+            elapsed = finished - started
+            query_count, query_seconds = response_queries
+            # Unmatched paths share one label so scanners cannot add series
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, status).inc()
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_DB_QUERIES.labels(method, route).observe(query_count)
+            HTTP_DB_SECONDS.labels(method, route).observe(query_seconds)
+            if route not in QUIET_ROUTES:
+                logger.info(
+                    f"{method} {scope['path']} {status}",
+                    extra={
+                        "method": method,
+                        "route": route,
+                        "status": status,
+                        "duration_ms": round(elapsed * 1000, 3),
+                        "db_queries": query_count,
+                        "db_ms": round(query_seconds * 1000, 3),
+                    },
+                )
+
@@ -0,0 +1,283 @@
+"""Prometheus-style metrics in the text exposition format.
+
+A deliberately small registry — counters, gauges and fixed-bucket histograms —
+so instrumenting a hot path costs a dict lookup and a lock, with no extra
+dependency. ``render()`` produces the text served at ``/metrics``.
+
+Request metrics are labelled with the route template (``/api/articles/{article_id}``),
+never the raw path, and per-feed measurements are histograms rather than
+per-feed series, so the number of series stays bounded however many feeds
+and articles there are.
+"""
+
+import asyncio
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import anyio.to_thread
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Value:
+    """One counter or gauge series."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class _Buckets:
+    """One histogram series: per-bucket counts plus sum and count."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["Registry"] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _new_series(self):
+        return _Value()
+
+    def labels(self, *values) -> object:
+        """Return the series for these label values, creating it on first use."""
+        key = tuple(str(v) for v in values)
+        series = self._series.get(key)
+        if series is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(series.value)}"
+            for key, series in list(self._series.items())
+        ]
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; often set at scrape time."""
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed, cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_series(self):
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in list(self._series.items()):
+            with series._lock:
+                counts, total, count = list(series.counts), series.sum, series.count
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                labels = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Ordered set of metrics plus collectors that refresh gauges before a scrape."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def render() -> str:
+    """Text exposition of every registered metric."""
+    return REGISTRY.render()
+
+
+# ── Application metrics ──────────────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "krepsys_http_requests_total", "HTTP requests by route and status.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "krepsys_http_request_duration_seconds", "HTTP request latency until the response is sent.",
+    ("method", "route"),
+)
+HTTP_DB_QUERIES = Histogram(
+    "krepsys_http_request_db_queries", "SQL statements executed per HTTP request.",
+    ("method", "route"), buckets=COUNT_BUCKETS,
+)
+HTTP_DB_SECONDS = Histogram(
+    "krepsys_http_request_db_seconds", "Time spent in SQL per HTTP request.",
+    ("method", "route"), buckets=QUERY_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "krepsys_db_query_duration_seconds", "Duration of every SQL statement, in any context.",
+    buckets=QUERY_BUCKETS,
+)
+FEED_FETCHES = Counter(
+    "krepsys_feed_fetches_total", "Feed fetches by outcome.", ("outcome",),
+)
+FEED_FETCH_BYTES_SAVED = Counter(
+    "krepsys_feed_fetch_bytes_saved_total",
+    "Body bytes not downloaded thanks to 304 responses, per the feed's last full fetch.",
+)
+FEED_PARSE_SECONDS_SAVED = Counter(
+    "krepsys_feed_parse_seconds_saved_total",
+    "Parse time skipped thanks to 304 responses, per the feed's last full fetch.",
+)
+FEED_FETCH_SECONDS = Histogram(
+    "krepsys_feed_fetch_duration_seconds", "Time to download one feed document.",
+    buckets=FETCH_BUCKETS,
+)
+FEED_FETCH_BYTES = Histogram(
+    "krepsys_feed_fetch_bytes", "Size of downloaded feed documents.", buckets=BYTES_BUCKETS,
+)
+FEED_FETCH_ENTRIES = Histogram(
+    "krepsys_feed_fetch_entries", "Entries per parsed feed document.", buckets=COUNT_BUCKETS,
+)
+INGESTED_ARTICLES = Counter(
+    "krepsys_ingested_articles_total", "New articles stored; rate() gives ingest rows per second.",
+)
+PURGED_ARTICLES = Counter(
+    "krepsys_purged_articles_total", "Articles deleted by retention policies.",
+)
+SCHEDULER_LAG = Gauge(
+    "krepsys_scheduler_lag_seconds", "Now minus the oldest next_fetch_at among due active feeds.",
+)
+THREADPOOL_IN_USE = Gauge(
+    "krepsys_threadpool_in_use", "Worker threads currently busy.", ("pool",),
+)
+THREADPOOL_QUEUE_DEPTH = Gauge(
+    "krepsys_threadpool_queue_depth", "Tasks waiting for a worker thread.", ("pool",),
+)
+
+
+def _collect_threadpools() -> None:
+    """Sample the thread pools serving sync work; must run on the event loop."""
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # not in an event loop: nothing to sample
+    # Starlette's pool: sync endpoints and background tasks
+    THREADPOOL_IN_USE.labels("anyio").set(limiter.borrowed_tokens)
+    THREADPOOL_QUEUE_DEPTH.labels("anyio").set(limiter.statistics().tasks_waiting)
+    # The loop's default executor: the fetch engine's parse and write steps
+    executor = getattr(loop, "_default_executor", None)
+    queue = getattr(executor, "_work_queue", None)
+    THREADPOOL_QUEUE_DEPTH.labels("executor").set(queue.qsize() if queue is not None else 0)
+
+
+REGISTRY.add_collector(_collect_threadpools)
+
@@ -0,0 +1,283 @@
+"""Compress stored article bodies and report the space saved.
+
+Rewrites bodies that are still plain text, or were compressed without their
+feed's current dictionary, in small primary-key batches with a short
+transaction each, like the text backfill. With ``--train`` it first builds a
+dictionary for every feed with enough bodies to learn from. The job is
+idempotent and resumable: rows already in their final form are skipped.
+
+SQLite keeps pages freed by the smaller rows for reuse instead of shrinking
+the file; ``--vacuum`` rebuilds the file afterwards to hand them back.
+
+Run it by hand with::
+
+    python -m src.utils.recompress [--train] [--vacuum] [--batch-size N]
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy import delete, exists, func, select, text, update
+from sqlalchemy.orm import Session, aliased
+from src.database import SessionLocal
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.content_dictionary import ContentDictionary
+from src.utils.compression import compress_content, train_dictionary, uses_dictionary
+from src.utils.fetcher import current_dictionary
+
+logger = logging.getLogger(__name__)
+
+RECOMPRESS_BATCH_SIZE = 200
+RECOMPRESS_PAUSE = 0.05  # seconds between batches, leaving room for other writers
+DICTIONARY_SAMPLES = 200  # most recent bodies a dictionary is trained from
+DICTIONARY_MIN_SAMPLES = 20  # feeds with fewer bodies get no dictionary
+# How long a superseded dictionary is kept after its successor appears. Ingest
+# reads the current dictionary before its write, so bodies compressed with
+# the old one may still be on their way in.
+DICTIONARY_GRACE = timedelta(hours=1)
+
+
+def content_size(db: Session) -> Dict[str, int]:
+    """Body counts and storage use, in bytes."""
+    bodies, compressed, content_bytes = db.execute(text(
+        "SELECT count(content), coalesce(sum(typeof(content) = 'blob'), 0), "
+        "coalesce(sum(length(CAST(content AS BLOB))), 0) FROM article_bodies"
+    )).one()
+    dictionary_bytes = db.scalar(
+        select(func.coalesce(func.sum(func.length(ContentDictionary.data)), 0))
+    )
+    page_size = db.execute(text("PRAGMA page_size")).scalar()
+    return {
+        "bodies": bodies,
+        "compressed": compressed,
+        "content_bytes": content_bytes,
+        "dictionary_bytes": dictionary_bytes,
+        "file_bytes": page_size * db.execute(text("PRAGMA page_count")).scalar(),
+        "free_bytes": page_size * db.execute(text("PRAGMA freelist_count")).scalar(),
+    }
+
+
+def _dictionary_pays_off(data: bytes, samples) -> bool:
+    """Whether data saves more than its own size over the samples."""
+    plain = sum(len(compress_content(s) or "") for s in samples)
+    primed = sum(len(compress_content(s, data) or "") for s in samples)
+    return plain - primed > len(data)
+
+
+def train_dictionaries(
+    session_factory: Callable[[], Session] = SessionLocal,
+    samples: int = DICTIONARY_SAMPLES,
+    min_samples: int = DICTIONARY_MIN_SAMPLES,
+) -> int:
+    """Train a dictionary from each feed's most recent bodies.
+
+    A dictionary is stored only if it saves more than its own size across
+    the bodies it was trained from. Returns the number stored.
+    """
+    db = session_factory()
+    try:
+        feed_ids = db.scalars(
+            select(Article.feed_id)
+            .join(Article.body)
+            .where(ArticleBody.content.is_not(None))
+            .group_by(Article.feed_id)
+            .having(func.count() >= min_samples)
+        ).all()
+    finally:
+        db.close()
+
+    trained = 0
+    for feed_id in feed_ids:
+        db = session_factory()
+        try:
+            bodies = [body.content for body in db.scalars(
+                select(ArticleBody)
+                .join(ArticleBody.article)
+                .where(Article.feed_id == feed_id, ArticleBody.content.is_not(None))
+                .order_by(Article.sort_key.desc(), Article.id.desc())
+                .limit(samples)
+            )]
+            data = train_dictionary(bodies)
+            current = current_dictionary(db, feed_id)
+            if current is not None and current.data == data:
+                continue  # nothing new to learn
+            if data and _dictionary_pays_off(data, bodies):
+                db.add(ContentDictionary(feed_id=feed_id, data=data, samples=len(bodies)))
+                db.commit()
+                trained += 1
+        finally:
+            db.close()
+
+    if trained:
+        logger.info(f"Content dictionaries: trained {trained} of {len(feed_ids)} feeds")
+    return trained
+
+
+def recompress_articles(
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = RECOMPRESS_BATCH_SIZE,
+    pause: float = RECOMPRESS_PAUSE,
+    level: Optional[int] = None,
+) -> int:
+    """Compress every body not yet stored with its feed's current dictionary.
+
+    Returns:
+        Number of articles rewritten
+    """
+    # feed_id -> (id, data) of its current dictionary; plain values, since
+    # ORM rows expire when their batch commits
+    dictionaries: Dict[int, Tuple[Optional[int], Optional[bytes]]] = {}
+    rewritten = 0
+    last_id = 0
+    while True:
+        db = session_factory()
+        try:
+            rows = db.execute(
+                select(ArticleBody, Article.feed_id)
+                .join(ArticleBody.article)
+                .where(ArticleBody.article_id > last_id, ArticleBody.content.is_not(None))
+                .order_by(ArticleBody.article_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0].article_id  # read before commit expires it
+
+            # Compress before writing so the write transaction stays short
+            values = []
+            for body, feed_id in rows:
+                if feed_id not in dictionaries:
+                    current = current_dictionary(db, feed_id)
+                    dictionaries[feed_id] = (current.id, current.data) if current \
+                        else (None, None)
+                target_id, data = dictionaries[feed_id]
+                if isinstance(body.content_data, bytes) \
+                        and body.content_dictionary_id == target_id:
+                    continue
+                stored = compress_content(body.content, data, level)
+                dictionary_id = target_id if uses_dictionary(stored) else None
+                if stored == body.content_data \
+                        and dictionary_id == body.content_dictionary_id:
+                    continue  # too small to gain anything; stays text
+                values.append({
+                    "article_id": body.article_id,
+                    "content_data": stored,
+                    "content_dictionary_id": dictionary_id,
+                })
+            if values:
+                # Decoded bodies are unchanged, so cached list pages stay valid
+                db.execute(update(ArticleBody), values)
+                db.commit()
+        finally:
+            db.close()
+
+        rewritten += len(values)
+        if pause:
+            time.sleep(pause)
+
+    if rewritten:
+        logger.info(f"Recompressed {rewritten} article bodies")
+    return rewritten
+
+
+def prune_dictionaries(db: Session, grace: timedelta = DICTIONARY_GRACE) -> int:
+    """Delete dictionaries no body uses, superseded for their feed at least grace ago."""
+    successor = aliased(ContentDictionary)
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - grace
+    result = db.execute(
+        delete(ContentDictionary)
+        .where(
+            exists().where(
+                successor.feed_id == ContentDictionary.feed_id,
+                successor.id > ContentDictionary.id,
+                successor.created_at <= cutoff,
+            ),
+            ~exists().where(ArticleBody.content_dictionary_id == ContentDictionary.id),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def recompress(
+    session_factory: Callable[[], Session] = SessionLocal,
+    train: bool = False,
+    vacuum: bool = False,
+    batch_size: int = RECOMPRESS_BATCH_SIZE,
+    pause: float = RECOMPRESS_PAUSE,
+    prune_grace: timedelta = DICTIONARY_GRACE,
+) -> Dict[str, object]:
+    """Run the whole job and report storage before and after."""
+    db = session_factory()
+    try:
+        before = content_size(db)
+    finally:
+        db.close()
+
+    trained = train_dictionaries(session_factory) if train else 0
+    rewritten = recompress_articles(session_factory, batch_size, pause)
+
+    db = session_factory()
+    try:
+        pruned = prune_dictionaries(db, prune_grace)
+        if vacuum:
+            with db.get_bind().connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+        after = content_size(db)
+    finally:
+        db.close()
+
+    return {
+        "trained": trained,
+        "rewritten": rewritten,
+        "pruned": pruned,
+        "before": before,
+        "after": after,
+    }
+
+
+def _mib(size: int) -> str:
+    return f"{size / 1048576:.1f} MiB"
+
+
+def format_report(report: Dict[str, object]) -> str:
+    """Human-readable summary of a recompress() report."""
+    before, after = report["before"], report["after"]
+    stored_before = before["content_bytes"] + before["dictionary_bytes"]
+    stored_after = after["content_bytes"] + after["dictionary_bytes"]
+    ratio = stored_after / stored_before if stored_before else 1.0
+    lines = [
+        f"Rewrote {report['rewritten']} bodies; trained {report['trained']} dictionaries, "
+        f"pruned {report['pruned']}",
+        f"Bodies compressed: {before['compressed']}/{before['bodies']} -> "
+        f"{after['compressed']}/{after['bodies']}",
+        f"Body storage: {_mib(stored_before)} -> {_mib(stored_after)} ({ratio:.0%}), "
+        f"dictionaries {_mib(after['dictionary_bytes'])}",
+        f"Database file: {_mib(before['file_bytes'])} -> {_mib(after['file_bytes'])}, "
+        f"{_mib(after['free_bytes'])} free",
+    ]
+    if after["free_bytes"] and after["free_bytes"] >= after["file_bytes"] // 10:
+        lines.append("Run with --vacuum to return the free pages to the filesystem")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compress stored article bodies")
+    parser.add_argument("--train", action="store_true", help="train per-feed dictionaries first")
+    parser.add_argument("--vacuum", action="store_true", help="rebuild the file afterwards")
+    parser.add_argument("--batch-size", type=int, default=RECOMPRESS_BATCH_SIZE)
+    args = parser.parse_args()
+
+    import src.models  # noqa: F401 — register all tables
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    report = recompress(train=args.train, vacuum=args.vacuum, batch_size=args.batch_size)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Retention policies: purge old articles and reclaim the space they held.
+
+Two rules, set globally in Settings and overridable per feed (``NULL``
+falls back to the global value, ``0`` turns the rule off):
+
+- ``retention_days``: drop read articles fetched more than N days ago
+- ``retention_keep``: drop everything beyond the newest N of the feed
+
+Saved articles, articles with highlights and articles with a reader note are
+never purged, whatever the policy says.
+
+Deletes run in small batches with a short transaction each, like the text
+backfill, so the API and the fetcher get the write lock in between. Tag
+links are removed alongside; triggers take care of bodies, the search index
+and the feed counters. Each purged URL is recorded in ``purged_urls`` in the
+same transaction, so fetches do not store the item again while the feed
+still lists it. Feeds drop items long before ``retention_tombstone_days``
+have passed, so the records are deleted after that.
+
+Afterwards the freed pages are handed back to the filesystem with
+``PRAGMA incremental_vacuum``, again in steps. That needs a file created
+with ``auto_vacuum = INCREMENTAL``; ``--vacuum`` converts an older file with
+one full VACUUM.
+
+The app runs a pass every ``retention_interval`` seconds. Run it by hand with::
+
+    python -m src.utils.retention [--dry-run] [--vacuum] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy import (
+    String, and_, delete, exists, func, literal, or_, select, true, tuple_, type_coerce,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from src.config import Settings
+from src.database import SessionLocal
+from src.models.article import Article
+from src.models.feed import Feed
+from src.models.highlight import Highlight
+from src.models.purged_url import PurgedUrl
+from src.models.tag import article_tags
+from src.utils.cache import article_list_cache
+from src.utils.metrics import PURGED_ARTICLES
+
+logger = logging.getLogger(__name__)
+
+RETENTION_BATCH_SIZE = 500
+RETENTION_PAUSE = 0.05  # seconds between batches, leaving room for other writers
+VACUUM_STEP = 1024  # pages returned to the filesystem per incremental vacuum step
+
+# Compared as stored, like the list API's keyset bounds
+_sort_key_raw = type_coerce(Article.sort_key, String)
+
+
+class Policy(NamedTuple):
+    days: int  # purge read articles fetched longer ago than this (0 = off)
+    keep: int  # purge beyond the newest this many (0 = off)
+
+
+def feed_policy(feed: Feed, settings: Settings) -> Policy:
+    """The feed's own retention values, falling back to the global ones."""
+    days, keep = feed.retention_days, feed.retention_keep
+    return Policy(
+        settings.retention_days if days is None else days,
+        settings.retention_keep_per_feed if keep is None else keep,
+    )
+
+
+def _utcnow() -> datetime:
+    # SQLite returns naive datetimes, so compare in naive UTC throughout
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _unprotected():
+    """Articles the reader has not kept: unsaved, unannotated, unhighlighted."""
+    return and_(
+        Article.is_saved.is_not(True),
+        Article.note.is_(None),
+        ~exists().where(Highlight.article_id == Article.id),
+    )
+
+
+def _purge_rule(db: Session, feed_id: int, policy: Policy, now: datetime):
+    """SQL condition for the feed's articles its policy lets go, or None."""
+    rules = []
+    if policy.days > 0:
+        # By arrival, not publication: a newly added feed's back catalogue
+        # carries old dates but was only just read
+        cutoff = now - timedelta(days=policy.days)
+        rules.append(and_(Article.is_read == true(), Article.fetched_at < cutoff))
+    if policy.keep > 0:
+        # The oldest article still kept; anything after it in list order goes
+        boundary = db.execute(
+            select(_sort_key_raw, Article.id)
+            .where(Article.feed_id == feed_id)
+            .order_by(Article.sort_key.desc(), Article.id.desc())
+            .offset(policy.keep - 1)
+            .limit(1)
+        ).first()
+        if boundary is not None:
+            rules.append(tuple_(_sort_key_raw, Article.id) <
+                         tuple_(literal(boundary[0], String), literal(boundary[1])))
+    return or_(*rules) if rules else None
+
+
+def purge_feed(
+    session_factory: Callable[[], Session],
+    feed_id: int,
+    policy: Policy,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_PAUSE,
+    dry_run: bool = False,
+) -> int:
+    """Delete one feed's purgeable articles in batches. Returns articles deleted.
+
+    With dry_run, only counts them.
+    """
+    db = session_factory()
+    try:
+        rule = _purge_rule(db, feed_id, policy, _utcnow())
+        if rule is None:
+            return 0
+        condition = and_(Article.feed_id == feed_id, rule, _unprotected())
+        if dry_run:
+            return db.scalar(select(func.count()).select_from(Article).where(condition))
+    finally:
+        db.close()
+
+    deleted = 0
+    while True:
+        db = session_factory()
+        try:
+            ids: List[int] = db.scalars(select(Article.id).where(condition).limit(batch_size)).all()
+            if not ids:
+                break
+            db.execute(
+                sqlite_insert(PurgedUrl)
+                .from_select(
+                    ["url", "feed_id"],
+                    select(Article.url, Article.feed_id).where(Article.id.in_(ids)),
+                )
+                .on_conflict_do_nothing()
+            )
+            db.execute(delete(article_tags).where(article_tags.c.article_id.in_(ids)))
+            db.execute(
+                delete(Article).where(Article.id.in_(ids)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+        finally:
+            db.close()
+        deleted += len(ids)
+        PURGED_ARTICLES.inc(len(ids))
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+    return deleted
+
+
+def expire_tombstones(
+    session_factory: Callable[[], Session],
+    days: int,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_PAUSE,
+) -> int:
+    """Forget URLs purged more than ``days`` ago, in batches. Returns rows deleted."""
+    if days <= 0:
+        return 0
+    expired = select(PurgedUrl.url).where(PurgedUrl.purged_at < _utcnow() - timedelta(days=days))
+    deleted = 0
+    while True:
+        db = session_factory()
+        try:
+            count = db.execute(
+                delete(PurgedUrl).where(PurgedUrl.url.in_(expired.limit(batch_size)))
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        deleted += count
+        if count < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def incremental_vacuum(
+    session_factory: Callable[[], Session] = SessionLocal,
+    step: int = VACUUM_STEP,
+    pause: float = RETENTION_PAUSE,
+) -> Optional[int]:
+    """Return free pages to the filesystem a step at a time. Returns pages freed.
+
+    Returns None when the file is not in incremental auto-vacuum mode.
+    """
+    db = session_factory()
+    try:
+        with db.get_bind().connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:  # INCREMENTAL
+                return None
+            # pysqlite steps a statement without result columns only once,
+            # freeing a single page; executescript runs it to completion
+            driver = conn.connection.driver_connection
+            freed = 0
+            while True:
+                free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+                if not free:
+                    return freed
+                # Each step is its own short write transaction
+                driver.executescript(f"PRAGMA incremental_vacuum({step})")
+                freed += min(free, step)
+                time.sleep(pause)
+    finally:
+        db.close()
+
+
+def full_vacuum(session_factory: Callable[[], Session] = SessionLocal) -> None:
+    """Rebuild the file, applying the configured auto_vacuum mode to it."""
+    db = session_factory()
+    try:
+        with db.get_bind().connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+    finally:
+        db.close()
+
+
+def purge(
+    session_factory: Callable[[], Session] = SessionLocal,
+    settings: Optional[Settings] = None,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_PAUSE,
+    dry_run: bool = False,
+    vacuum: bool = False,
+) -> Dict[str, object]:
+    """Apply every feed's retention policy, then reclaim the freed space.
+
+    Args:
+        session_factory: Creates the job's sessions (default: SessionLocal)
+        settings: Source of the global policy (default: loaded from the environment)
+        batch_size: Articles deleted per transaction
+        pause: Seconds to sleep between batches
+        dry_run: Count purgeable articles without deleting or vacuuming
+        vacuum: Run a full VACUUM instead of the incremental one
+
+    Returns:
+        Report with articles ``deleted`` per feed id, purged URLs
+        ``expired`` and pages ``freed`` (None if the file does not support
+        incremental vacuum)
+    """
+    settings = settings or Settings()
+    db = session_factory()
+    try:
+        policies = {feed.id: feed_policy(feed, settings) for feed in db.query(Feed)}
+    finally:
+        db.close()
+
+    deleted = {}
+    for feed_id, policy in policies.items():
+        count = purge_feed(session_factory, feed_id, policy, batch_size, pause, dry_run)
+        if count:
+            deleted[feed_id] = count
+    report = {"deleted": deleted, "expired": 0, "freed": 0}
+    if dry_run:
+        return report
+
+    report["expired"] = expire_tombstones(
+        session_factory, settings.retention_tombstone_days, batch_size, pause
+    )
+
+    if deleted:
+        article_list_cache.invalidate()
+        logger.info(f"Retention: purged {sum(deleted.values())} article(s) "
+                    f"from {len(deleted)} feed(s)")
+    if vacuum:
+        full_vacuum(session_factory)
+    else:
+        report["freed"] = incremental_vacuum(session_factory, pause=pause)
+    return report
+
+
+async def run_retention(
+    session_factory: Optional[Callable[[], Session]] = None,
+    settings: Optional[Settings] = None,
+) -> None:
+    """Background task: applies retention policies every retention_interval seconds."""
+    session_factory = session_factory or SessionLocal
+    settings = settings or Settings()
+    logger.info("Retention job started")
+    try:
+        while True:
+            try:
+                # Blocking and batched; keep it off the event loop
+                await asyncio.to_thread(purge, session_factory, settings)
+            except Exception:
+                logger.exception("Retention pass failed (continuing)")
+            await asyncio.sleep(settings.retention_interval)
+    except asyncio.CancelledError:
+        logger.info("Retention job shutting down")
+        raise
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Purge articles past their retention policy")
+    parser.add_argument("--dry-run", action="store_true", help="count without deleting")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="rebuild the file afterwards; converts it to incremental vacuum")
+    parser.add_argument("--batch-size", type=int, default=RETENTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    import src.models  # noqa: F401 — register all tables
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    report = purge(batch_size=args.batch_size, dry_run=args.dry_run, vacuum=args.vacuum)
+    total = sum(report["deleted"].values())
+    verb = "Would purge" if args.dry_run else "Purged"
+    print(f"{verb} {total} article(s) from {len(report['deleted'])} feed(s)")
+    if report["expired"]:
+        print(f"Forgot {report['expired']} purged URL(s) past the tombstone age")
+    if report["freed"] is None:
+        print("Database file is not in incremental auto-vacuum mode; "
+              "run once with --vacuum to convert it")
+    elif report["freed"]:
+        print(f"Returned {report['freed']} free page(s) to the filesystem")
+
+
+if __name__ == "__main__":
+    main()
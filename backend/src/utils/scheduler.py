@@ -1,61 +1,154 @@
-"""Background scheduler for periodic feed fetching."""
+"""Background scheduler for periodic feed fetching.
+
+Each feed carries a persisted, indexed ``next_fetch_at``. The scheduler claims
+due feeds with a single range query, fetches them, then sleeps until the
+earliest upcoming ``next_fetch_at`` — or until the feeds API signals a change.
+"""
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import func, true
+from sqlalchemy.orm import Session
+from src.config import Settings
 from src.database import SessionLocal
 from src.models.feed import Feed
-from src.utils.fetcher import fetch_feed
+from src.utils.fetch_engine import FeedTarget, FetchEngine
 
 logger = logging.getLogger(__name__)
 
-TICK_INTERVAL = 60  # seconds
+MAX_SLEEP = 3600  # seconds; upper bound on a single idle wait
+ERROR_RETRY_DELAY = 60  # seconds to back off after a failed scheduling pass
+
+# Set while run_scheduler is running so API threads can wake it
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _utcnow() -> datetime:
+    # SQLite returns naive datetimes, so compare in naive UTC throughout
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _claim_due_feeds(db: Session, now: datetime) -> List[FeedTarget]:
+    """Return active feeds whose next_fetch_at has passed, leasing them forward.
+
+    Each claimed feed's next_fetch_at is pushed out by its current interval, so a
+    fetch that fails (and therefore never reschedules the feed) is retried on
+    its normal cadence instead of on every wake-up.
+    """
+    feeds = (
+        db.query(Feed)
+        .filter(Feed.is_active == true(), Feed.next_fetch_at <= now)
+        .order_by(Feed.next_fetch_at)
+        .all()
+    )
+    for feed in feeds:
+        interval = feed.effective_interval or feed.fetch_interval
+        feed.next_fetch_at = now + timedelta(seconds=interval)
+    db.commit()
+    return [FeedTarget(f.id, f.url, f.etag, f.last_modified) for f in feeds]
+
+
+def _next_due_at(db: Session) -> Optional[datetime]:
+    """Return the earliest next_fetch_at among active feeds, if any."""
+    return db.query(func.min(Feed.next_fetch_at)).filter(Feed.is_active == true()).scalar()
+
+
+def scheduler_lag(db: Session) -> float:
+    """Seconds the longest-overdue active feed has been waiting; 0 when none is due."""
+    now = _utcnow()
+    oldest = db.query(func.min(Feed.next_fetch_at)).filter(
+        Feed.is_active == true(), Feed.next_fetch_at <= now
+    ).scalar()
+    return (now - oldest).total_seconds() if oldest is not None else 0.0
 
 
-def _is_feed_due(feed: Feed) -> bool:
-    """Return True if the feed is due for a fetch."""
-    if feed.last_fetched is None:
-        return True
-    last = feed.last_fetched
-    if last.tzinfo is None:
-        last = last.replace(tzinfo=timezone.utc)
-    elapsed = (datetime.now(timezone.utc) - last).total_seconds()
-    return elapsed >= feed.fetch_interval
+def _seconds_until(due_at: Optional[datetime], now: datetime) -> float:
+    """Seconds to sleep before due_at, clamped to [0, MAX_SLEEP]."""
+    if due_at is None:
+        return MAX_SLEEP
+    return min(max((due_at - now).total_seconds(), 0.0), MAX_SLEEP)
 
 
-def _fetch_feed_with_session(feed_id: int, feed_url: str) -> int:
-    """Fetch a feed in its own DB session (safe for thread executor use)."""
-    db = SessionLocal()
+def _plan_pass(session_factory: Callable[[], Session]) -> Tuple[List[FeedTarget], float]:
+    """Claim the due feeds in a fresh session; with none due, also the idle wait.
+
+    Blocking; run_scheduler calls it in a worker thread.
+    """
+    db = session_factory()
     try:
-        return fetch_feed(feed_id, feed_url, db)
+        now = _utcnow()
+        due = _claim_due_feeds(db, now)
+        return due, (0.0 if due else _seconds_until(_next_due_at(db), now))
     finally:
         db.close()
 
 
-async def run_scheduler() -> None:
-    """Background task: checks and fetches due feeds every TICK_INTERVAL seconds."""
-    logger.info("Scheduler started (tick interval: %ds)", TICK_INTERVAL)
-    loop = asyncio.get_running_loop()
-    while True:
-        try:
-            await asyncio.sleep(TICK_INTERVAL)
-            db = SessionLocal()
+def notify_feeds_changed() -> None:
+    """Wake the scheduler after feeds are created, updated or deleted.
+
+    Safe to call from any thread; a no-op when the scheduler is not running.
+    """
+    if _loop is not None and _wakeup is not None:
+        _loop.call_soon_threadsafe(_wakeup.set)
+
+
+def _build_engine() -> FetchEngine:
+    """Create a fetch engine from the configured concurrency limits."""
+    settings = Settings()
+    return FetchEngine(
+        max_concurrency=settings.fetch_concurrency,
+        per_host_concurrency=settings.fetch_per_host_concurrency,
+        timeout=settings.fetch_timeout,
+        parse_pool_size=settings.parse_pool_size,
+    )
+
+
+async def run_scheduler(
+    session_factory: Optional[Callable[[], Session]] = None,
+    engine: Optional[FetchEngine] = None,
+) -> None:
+    """Background task: fetches feeds as they come due, sleeping in between.
+
+    Args:
+        session_factory: Creates the scheduler's sessions (default: SessionLocal)
+        engine: Fetch engine to use, closed on exit (default: built from settings)
+    """
+    global _loop, _wakeup
+    _loop = asyncio.get_running_loop()
+    _wakeup = asyncio.Event()
+    logger.info("Scheduler started")
+    session_factory = session_factory or SessionLocal
+    engine = engine or _build_engine()
+    try:
+        while True:
+            # Clear before querying so a change signalled mid-pass is not lost
+            _wakeup.clear()
+            delay = ERROR_RETRY_DELAY
             try:
-                due = [
-                    (f.id, f.url) for f in db.query(Feed).filter(Feed.is_active.is_(True)).all()
-                    if _is_feed_due(f)
-                ]
-            finally:
-                db.close()
-
-            if due:
-                logger.info("Scheduler: %d feed(s) due for refresh", len(due))
-            for feed_id, feed_url in due:
-                await loop.run_in_executor(
-                    None, _fetch_feed_with_session, feed_id, feed_url
-                )
-        except asyncio.CancelledError:
-            logger.info("Scheduler shutting down")
-            raise
-        except Exception:
-            logger.exception("Scheduler tick error (continuing)")
+                # The claim commits a write; keep it off the event loop
+                due, delay = await asyncio.to_thread(_plan_pass, session_factory)
+                if due:
+                    logger.info("Scheduler: %d feed(s) due for refresh", len(due))
+                    results = await engine.fetch_all(due)
+                    logger.info(
+                        "Scheduler: refreshed %d feed(s), %d new article(s)",
+                        len(results), sum(results.values())
+                    )
+                    continue  # more feeds may have come due while fetching
+            except Exception:
+                logger.exception("Scheduler tick error (continuing)")
+
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+    except asyncio.CancelledError:
+        logger.info("Scheduler shutting down")
+        raise
+    finally:
+        engine.close()
+        _loop = None
+        _wakeup = None
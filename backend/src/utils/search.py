@@ -0,0 +1,187 @@
+"""SQLite FTS5 full-text index over articles and their highlights.
+
+``articles_fts`` indexes one row per article (rowid = article id): the
+article's title, author, plain text and concatenated highlight text, as the
+``articles_fts_source`` view presents them. It is an external-content table,
+so only the index is stored and snippets are cut from the view. Triggers on
+articles, their bodies and highlights keep it in step with every insert,
+update and delete, so neither the ingest path nor the API has to maintain it
+explicitly.
+
+Rebuild the index for an existing database with::
+
+    python -m src.utils.search rebuild
+"""
+
+import argparse
+import logging
+import re
+from typing import List, Tuple
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.highlight import Highlight
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights: title, author, content_text, highlights
+RANK_FUNCTION = "bm25(10.0, 2.0, 1.0, 5.0)"
+SNIPPET_TOKENS = 24
+
+_COLUMNS = "title, author, content_text, highlights"
+
+# What the index covers, one row per article: FTS5 reads it back for
+# snippet() and rebuilds, so the text is not stored a second time
+SOURCE_DDL = (
+    "CREATE VIEW IF NOT EXISTS articles_fts_source AS "
+    "SELECT a.id AS id, a.title AS title, a.author AS author, b.content_text AS content_text, "
+    "(SELECT group_concat(h.text, ' ') FROM highlights h WHERE h.article_id = a.id) AS highlights "
+    "FROM articles a LEFT JOIN article_bodies b ON b.article_id = a.id"
+)
+
+# An external-content index cannot look up what it indexed; removing a row
+# takes the 'delete' command with the old values. BEFORE triggers read them
+# from the view while it still shows them, AFTER triggers index the new ones.
+_UNINDEX = (
+    f"INSERT INTO articles_fts(articles_fts, rowid, {_COLUMNS}) "
+    f"SELECT 'delete', id, {_COLUMNS} FROM articles_fts_source WHERE id = {{ref}};"
+)
+_INDEX = (
+    f"INSERT INTO articles_fts(rowid, {_COLUMNS}) "
+    f"SELECT id, {_COLUMNS} FROM articles_fts_source WHERE id = {{ref}};"
+)
+
+
+def _trigger(name: str, timing: str, action: str, ref: str, when: str = "") -> str:
+    """A trigger (un)indexing the article at ref; action is 'INSERT ON table' etc."""
+    body = _UNINDEX if timing == "BEFORE" else _INDEX
+    return (f"CREATE TRIGGER IF NOT EXISTS {name} {timing} {action} {when}"
+            f"BEGIN {body.format(ref=ref)} END")
+
+
+ARTICLE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    f"{_COLUMNS}, content='articles_fts_source', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    # The body row is written after its article, and fills in content_text
+    _trigger("articles_fts_ai", "AFTER", "INSERT ON articles", "new.id"),
+    _trigger("articles_fts_bu", "BEFORE", "UPDATE OF title, author ON articles", "old.id"),
+    _trigger("articles_fts_au", "AFTER", "UPDATE OF title, author ON articles", "new.id"),
+    # Its body and highlights are deleted after it, with no view row left to unindex
+    _trigger("articles_fts_bd", "BEFORE", "DELETE ON articles", "old.id"),
+]
+
+BODY_DDL = [
+    _trigger("article_bodies_fts_bi", "BEFORE", "INSERT ON article_bodies", "new.article_id",
+             "WHEN new.content_text IS NOT NULL "),
+    _trigger("article_bodies_fts_ai", "AFTER", "INSERT ON article_bodies", "new.article_id",
+             "WHEN new.content_text IS NOT NULL "),
+    _trigger("article_bodies_fts_bu", "BEFORE", "UPDATE OF content_text ON article_bodies",
+             "old.article_id"),
+    _trigger("article_bodies_fts_au", "AFTER", "UPDATE OF content_text ON article_bodies",
+             "new.article_id"),
+    _trigger("article_bodies_fts_bd", "BEFORE", "DELETE ON article_bodies", "old.article_id"),
+    _trigger("article_bodies_fts_ad", "AFTER", "DELETE ON article_bodies", "old.article_id"),
+]
+
+HIGHLIGHT_DDL = [
+    _trigger("highlights_fts_bi", "BEFORE", "INSERT ON highlights", "new.article_id"),
+    _trigger("highlights_fts_ai", "AFTER", "INSERT ON highlights", "new.article_id"),
+    _trigger("highlights_fts_bu", "BEFORE", "UPDATE OF text ON highlights", "old.article_id"),
+    _trigger("highlights_fts_au", "AFTER", "UPDATE OF text ON highlights", "new.article_id"),
+    _trigger("highlights_fts_bd", "BEFORE", "DELETE ON highlights", "old.article_id"),
+    _trigger("highlights_fts_ad", "AFTER", "DELETE ON highlights", "old.article_id"),
+]
+
+# Install alongside the tables whenever metadata.create_all creates them;
+# SQLite resolves the view's tables when it is read, not when it is created
+for _stmt in [SOURCE_DDL] + ARTICLE_DDL:
+    event.listen(Article.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(
+    Article.__table__, "after_create",
+    DDL(f"INSERT INTO articles_fts(articles_fts, rank) VALUES ('rank', '{RANK_FUNCTION}')")
+    .execute_if(dialect="sqlite"),
+)
+event.listen(
+    Article.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    Article.__table__, "after_drop",
+    DDL("DROP VIEW IF EXISTS articles_fts_source").execute_if(dialect="sqlite"),
+)
+for _stmt in BODY_DDL:
+    event.listen(ArticleBody.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in HIGHLIGHT_DDL:
+    event.listen(Highlight.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+
+
+def install_fts(conn: Connection) -> bool:
+    """Create the FTS table and triggers if missing. Returns True if the table was new."""
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    )).first() is not None
+    for stmt in [SOURCE_DDL] + ARTICLE_DDL + BODY_DDL + HIGHLIGHT_DDL:
+        conn.execute(text(stmt))
+    if not exists:
+        conn.execute(text(
+            f"INSERT INTO articles_fts(articles_fts, rank) VALUES ('rank', '{RANK_FUNCTION}')"
+        ))
+    return not exists
+
+
+def rebuild_fts(conn: Connection) -> int:
+    """Repopulate the FTS index from articles and highlights. Returns rows indexed."""
+    install_fts(conn)
+    conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')"))
+    return conn.execute(text("SELECT count(*) FROM articles_fts_source")).scalar()
+
+
+def build_match_query(q: str) -> str:
+    """Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted phrase (so FTS5 operators in the input are
+    inert), all words are required, and the last word matches as a prefix to
+    support search-as-you-type. Returns an empty string if q has no words.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return ""
+    phrases = [f'"{word}"' for word in words]
+    phrases[-1] += "*"
+    return " ".join(phrases)
+
+
+def search_articles(db: Session, q: str, limit: int, offset: int) -> List[Tuple]:
+    """Return ranked matches for q as (article_id, snippet, rank) rows, best first."""
+    match = build_match_query(q)
+    if not match:
+        return []
+    return db.execute(
+        text(
+            "SELECT rowid, snippet(articles_fts, -1, '<mark>', '</mark>', '…', :tokens), rank "
+            "FROM articles_fts WHERE articles_fts MATCH :match "
+            "ORDER BY rank LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "tokens": SNIPPET_TOKENS, "limit": limit, "offset": offset},
+    ).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the article full-text index")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from src.database import engine
+    import src.models  # noqa: F401 — register all tables
+
+    with engine.begin() as conn:
+        count = rebuild_fts(conn)
+    print(f"Indexed {count} articles")
+
+
+if __name__ == "__main__":
+    main()
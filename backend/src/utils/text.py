@@ -0,0 +1,136 @@
+"""HTML-to-text helpers used at ingest time."""
+
+from html.parser import HTMLParser
+from typing import Iterable, NamedTuple, Optional
+
+EXCERPT_LENGTH = 280
+MAX_TEXT_CHARS = 200_000  # cap on stored plain text per article
+CHUNK_SIZE = 64 * 1024    # characters fed to the parser at a time
+
+# Elements whose text content is never shown to the reader
+_SKIP_TAGS = {"script", "style", "head", "title", "noscript"}
+
+# Elements that separate words even when the markup has no whitespace
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "img", "li", "main", "nav", "ol", "p", "pre", "section", "table", "td",
+    "th", "tr", "ul",
+}
+
+
+class ExtractedText(NamedTuple):
+    """Plain-text fields derived from an article body."""
+    text: str
+    word_count: int
+    excerpt: Optional[str]
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible, whitespace-normalized text from an HTML stream.
+
+    Text is normalized as it arrives, and nothing past ``max_chars`` is kept, so
+    memory stays bounded however large the body is. Words are still counted
+    to the end of the document.
+    """
+
+    def __init__(self, max_chars: int = MAX_TEXT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.length = 0
+        self.word_count = 0
+        self.max_chars = max_chars
+        self._skip_depth = 0
+        self._space = False    # a word break is pending before the next text
+        self._in_word = False  # the last text seen ended mid-word
+
+    def _break(self):
+        self._space = True
+        self._in_word = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_data(self, data):
+        if self._skip_depth or not data:
+            return
+        words = data.split()
+        if not words:
+            self._break()
+            return
+
+        # A word split across inline tags ("<b>in</b>line") counts once
+        continues_word = self._in_word and not data[0].isspace()
+        self.word_count += len(words) - continues_word
+        separator = " " if self.length and (self._space or data[0].isspace()) else ""
+        self._space = data[-1].isspace()
+        self._in_word = not self._space
+
+        remaining = self.max_chars - self.length
+        if remaining <= 0:
+            return
+        piece = (separator + " ".join(words))[:remaining]
+        self.parts.append(piece)
+        self.length += len(piece)
+
+    def result(self) -> str:
+        return "".join(self.parts).strip()
+
+
+def excerpt_from_text(text: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """Return a preview of at most ``length`` characters, cut on a word boundary."""
+    if not text:
+        return None
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def extract_text_stream(
+    chunks: Iterable[str], max_chars: int = MAX_TEXT_CHARS
+) -> ExtractedText:
+    """Extract plain text, word count and excerpt from HTML delivered in chunks."""
+    parser = _TextExtractor(max_chars)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    text = parser.result()
+    return ExtractedText(text, parser.word_count, excerpt_from_text(text))
+
+
+def extract_text(html: Optional[str], max_chars: int = MAX_TEXT_CHARS) -> ExtractedText:
+    """Extract plain text, word count and excerpt from an HTML fragment.
+
+    The fragment is fed to the parser in CHUNK_SIZE slices, so working memory
+    beyond the input itself is bounded by max_chars.
+    """
+    if not html:
+        return ExtractedText("", 0, None)
+    return extract_text_stream(
+        (html[start:start + CHUNK_SIZE] for start in range(0, len(html), CHUNK_SIZE)),
+        max_chars,
+    )
+
+
+def html_to_text(html: Optional[str]) -> str:
+    """Strip tags from an HTML fragment and collapse whitespace."""
+    return extract_text(html).text
+
+
+def make_excerpt(html: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """Return a plain-text excerpt of at most ``length`` characters, cut on a word boundary."""
+    return excerpt_from_text(html_to_text(html), length)
@@ -3,42 +3,52 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from src.database import Base, get_db
+from sqlalchemy.pool import NullPool
+from src.database import (
+    Base, configure_sqlite, create_async_db_engine, get_db, get_session_factory, settings,
+)
 # Import all models to register them with Base
 from src.models.feed import Feed  # noqa: F401
 from src.models.article import Article  # noqa: F401
 from src.main import app
+from src.utils.cache import article_list_cache
 
 
 # Test database URL (shared by all API tests)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
 # Create test engine
-test_engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+test_engine = configure_sqlite(
+    create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}),
+    settings,
 )
 
-# Test session factory
+# Async engine used by the API routes. TestClient runs each request on a
+# fresh event loop, so connections must not outlive a request.
+test_async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL, settings, poolclass=NullPool)
+
+# Test session factories
 TestingSessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=test_engine
 )
+TestingAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, autoflush=False, expire_on_commit=False
+)
 
 
-def override_get_db():
+async def override_get_db():
     """Override database dependency for testing."""
-    try:
-        db = TestingSessionLocal()
+    async with TestingAsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-# Set dependency override once at module level
+# Set dependency overrides once at module level
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
 
 @pytest.fixture(autouse=True, scope="function")
@@ -48,6 +58,7 @@ def setup_database():
     This fixture runs automatically for every test function.
     """
     Base.metadata.create_all(bind=test_engine)
+    article_list_cache.clear()
     yield
     Base.metadata.drop_all(bind=test_engine)
 
@@ -1,9 +1,13 @@
 """Tests for article API endpoints."""
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
 from src.models.feed import Feed
 from src.models.article import Article
+from src.models.highlight import Highlight
+from src.models.tag import Tag
+from tests.conftest import test_async_engine
 
 # Other fixtures (client, db_session, setup_database) are provided by conftest.py
 
@@ -367,3 +371,302 @@ def test_update_article_not_found(client):
     update_data = {"is_read": True}
     response = client.patch("/api/articles/999", json=update_data)
     assert response.status_code == 404
+
+
+@pytest.fixture
+def paged_articles(db_session, test_feed):
+    """Create articles with tied and missing published_at values."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    published = [
+        base, base, base + timedelta(hours=1), None, base - timedelta(days=1),
+        None, base + timedelta(hours=1), base, None, base + timedelta(days=2),
+    ]
+    articles = [
+        Article(
+            feed_id=test_feed.id,
+            title=f"Paged {i}",
+            url=f"https://example.com/paged{i}",
+            published_at=published_at,
+        )
+        for i, published_at in enumerate(published)
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    return articles
+
+
+def _collect_pages(client, sort, limit):
+    """Walk every page via X-Next-Cursor and return (ids, page_count)."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        params = {"sort": sort, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/articles", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= limit
+        ids.extend(a["id"] for a in page)
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids, pages
+
+
+@pytest.mark.parametrize("sort", ["newest", "oldest"])
+@pytest.mark.parametrize("limit", [1, 3, 4, 10])
+def test_list_articles_pagination_matches_full_listing(client, paged_articles, sort, limit):
+    """Test paging through every cursor yields the unpaginated order exactly."""
+    expected = [a["id"] for a in client.get(f"/api/articles?sort={sort}").json()]
+    ids, pages = _collect_pages(client, sort, limit)
+
+    assert ids == expected
+    assert pages == -(-len(expected) // limit)
+
+
+def test_list_articles_pagination_null_published_ordering(client, paged_articles):
+    """Test NULL published_at rows are ordered by their fetch time."""
+    undated = {a.id for a in paged_articles if a.published_at is None}
+
+    # Undated fixtures were fetched "now", after every dated fixture
+    newest, _ = _collect_pages(client, "newest", 2)
+    assert set(newest[:len(undated)]) == undated
+
+    oldest, _ = _collect_pages(client, "oldest", 2)
+    assert set(oldest[-len(undated):]) == undated
+
+
+def test_list_articles_pagination_respects_filters(client, db_session, paged_articles):
+    """Test cursors combine with filters."""
+    for article in paged_articles[::2]:
+        article.is_read = True
+    db_session.commit()
+
+    ids, _ = _collect_pages(client, "newest", 2)
+    assert len(ids) == len(paged_articles)
+
+    response = client.get("/api/articles?is_read=false&limit=2")
+    first_page = response.json()
+    cursor = response.headers["x-next-cursor"]
+    second_page = client.get(f"/api/articles?is_read=false&limit=10&cursor={cursor}").json()
+
+    unread = first_page + second_page
+    assert len(unread) == len(paged_articles) // 2
+    assert all(a["is_read"] is False for a in unread)
+
+
+def test_list_articles_last_page_has_no_cursor(client, test_articles):
+    """Test X-Next-Cursor is omitted once all rows are returned."""
+    response = client.get("/api/articles?limit=4")
+    assert len(response.json()) == 4
+    assert "x-next-cursor" not in response.headers
+
+
+def test_list_articles_invalid_cursor(client, test_articles):
+    """Test a malformed cursor is rejected with 400."""
+    response = client.get("/api/articles?limit=2&cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_list_articles_limit_bounds(client):
+    """Test limit must be between 1 and the maximum page size."""
+    assert client.get("/api/articles?limit=0").status_code == 422
+    assert client.get("/api/articles?limit=100000").status_code == 422
+
+
+def test_list_articles_summary_view(client, db_session, test_articles):
+    """Test view=summary returns list-view fields and omits bodies."""
+    test_articles[0].excerpt = "Content 1"
+    db_session.commit()
+
+    response = client.get("/api/articles?view=summary&sort=oldest")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert len(data) == 4
+    article = data[0]
+    assert article["excerpt"] == "Content 1"
+    for field in ("id", "feed_id", "title", "url", "published_at", "fetched_at",
+                  "is_read", "is_saved", "is_archived"):
+        assert field in article
+    for field in ("content", "content_text", "note", "tags", "highlights"):
+        assert field not in article
+
+
+def test_list_articles_summary_view_paginates(client, paged_articles):
+    """Test view=summary works with cursor pagination."""
+    full = [a["id"] for a in client.get("/api/articles").json()]
+
+    response = client.get("/api/articles?view=summary&limit=4")
+    cursor = response.headers["x-next-cursor"]
+    rest = client.get(f"/api/articles?view=summary&cursor={cursor}").json()
+
+    assert [a["id"] for a in response.json() + rest] == full
+
+
+def test_list_articles_invalid_view(client):
+    """Test an unknown view is rejected."""
+    assert client.get("/api/articles?view=everything").status_code == 422
+
+
+def _add_tagged_articles(db_session, feed, count):
+    """Create articles that each carry tags and highlights."""
+    tags = [Tag(name="alpha"), Tag(name="beta")]
+    for i in range(count):
+        article = Article(
+            feed_id=feed.id,
+            title=f"Tagged {i}",
+            url=f"https://example.com/tagged{i}",
+            content="<p>Body</p>",
+        )
+        article.tags.extend(tags)
+        article.highlights.append(Highlight(text="Body"))
+        db_session.add(article)
+    db_session.commit()
+
+
+def _count_list_queries(client, url):
+    """Return (response, number of SQL statements issued) for a GET."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(test_async_engine.sync_engine, "before_cursor_execute", record)
+    return response, len(statements)
+
+
+def test_list_articles_query_count_constant(client, db_session, test_feed):
+    """Test tags and highlights are batch-loaded regardless of page size."""
+    _add_tagged_articles(db_session, test_feed, 30)
+
+    small, small_count = _count_list_queries(client, "/api/articles?limit=3")
+    large, large_count = _count_list_queries(client, "/api/articles?limit=25")
+
+    assert len(small.json()) == 3
+    assert len(large.json()) == 25
+    assert small_count == large_count
+    for article in large.json():
+        assert {t["name"] for t in article["tags"]} == {"alpha", "beta"}
+        assert [h["text"] for h in article["highlights"]] == ["Body"]
+
+
+def test_list_articles_cache_hit_skips_database(client, test_articles):
+    """Test a repeated list request is served from the cache."""
+    first, first_count = _count_list_queries(client, "/api/articles?view=summary&limit=2")
+    second, second_count = _count_list_queries(client, "/api/articles?view=summary&limit=2")
+
+    assert first_count > 0
+    assert second_count == 0
+    assert second.json() == first.json()
+    assert second.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+
+
+def test_list_articles_cache_invalidated_by_update(client, test_articles):
+    """Test PATCHing an article drops cached list pages."""
+    assert len(client.get("/api/articles?is_read=false").json()) == 3
+
+    client.patch(f"/api/articles/{test_articles[0].id}", json={"is_read": True})
+
+    assert len(client.get("/api/articles?is_read=false").json()) == 2
+
+
+def test_list_articles_cache_invalidated_by_tags(client, test_articles):
+    """Test tag changes show up in cached full-view pages."""
+    client.get("/api/articles")
+    client.post(f"/api/articles/{test_articles[0].id}/tags", json={"name": "later"})
+
+    article = next(a for a in client.get("/api/articles").json() if a["id"] == test_articles[0].id)
+    assert [t["name"] for t in article["tags"]] == ["later"]
+
+
+def test_list_articles_cache_invalidated_by_feed_delete(client, test_articles, test_feed):
+    """Test deleting a feed drops cached pages listing its articles."""
+    assert len(client.get("/api/articles").json()) == 4
+
+    client.delete(f"/api/feeds/{test_feed.id}")
+
+    assert client.get("/api/articles").json() == []
+
+
+def _bulk(client, payload):
+    """PATCH /api/articles/bulk, returning (response, SQL statements issued)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.patch("/api/articles/bulk", json=payload)
+    finally:
+        event.remove(test_async_engine.sync_engine, "before_cursor_execute", record)
+    return response, statements
+
+
+def test_bulk_mark_feed_read_is_one_statement(client, test_articles, test_feed):
+    """Test "mark all as read" for a feed runs as a single UPDATE."""
+    response, statements = _bulk(client, {
+        "filter": {"feed_id": test_feed.id, "is_read": False},
+        "changes": {"is_read": True},
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {"updated": 3}
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE articles")
+    assert client.get("/api/articles?is_read=false").json() == []
+
+
+def test_bulk_update_by_ids(client, test_articles):
+    """Test flags are set only on the listed articles."""
+    ids = [test_articles[0].id, test_articles[3].id]
+    response = client.patch("/api/articles/bulk", json={"ids": ids, "changes": {"is_saved": True}})
+
+    assert response.json() == {"updated": 2}
+    saved = {a["id"] for a in client.get("/api/articles?is_saved=true").json()}
+    assert saved == {test_articles[0].id, test_articles[2].id, test_articles[3].id}
+
+
+def test_bulk_update_counts_only_changed_rows(client, test_articles):
+    """Test articles already holding the requested values are not counted."""
+    response = client.patch("/api/articles/bulk", json={"filter": {}, "changes": {"is_read": True}})
+    assert response.json() == {"updated": 3}
+
+    response = client.patch("/api/articles/bulk", json={"filter": {}, "changes": {"is_read": True}})
+    assert response.json() == {"updated": 0}
+
+
+def test_bulk_archive_older_than(client, db_session, test_feed):
+    """Test "archive everything older than 30 days" by sort time."""
+    now = datetime.now(timezone.utc)
+    for i, age in enumerate([40, 31, 5]):
+        db_session.add(Article(
+            feed_id=test_feed.id, title=f"Aged {i}", url=f"https://example.com/aged{i}",
+            published_at=now - timedelta(days=age),
+        ))
+    db_session.commit()
+
+    cutoff = (now - timedelta(days=30)).isoformat()
+    response = client.patch("/api/articles/bulk", json={
+        "filter": {"older_than": cutoff}, "changes": {"is_archived": True},
+    })
+
+    assert response.json() == {"updated": 2}
+    archived = client.get("/api/articles?is_archived=true").json()
+    assert sorted(a["title"] for a in archived) == ["Aged 0", "Aged 1"]
+
+
+@pytest.mark.parametrize("payload", [
+    {"changes": {"is_read": True}},
+    {"ids": [1], "filter": {}, "changes": {"is_read": True}},
+    {"ids": [], "changes": {"is_read": True}},
+    {"filter": {}, "changes": {}},
+])
+def test_bulk_update_rejects_invalid_payload(client, payload):
+    """Test the selector must be exactly one of ids/filter and changes non-empty."""
+    assert client.patch("/api/articles/bulk", json=payload).status_code == 422
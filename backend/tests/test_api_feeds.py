@@ -1,5 +1,11 @@
 """Tests for feed API endpoints."""
 
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from src.models.feed import Feed
+from src.utils.scheduler import _claim_due_feeds, _utcnow
+from tests.conftest import TestingSessionLocal
+
 # Fixtures are provided by conftest.py
 
 
@@ -29,6 +35,20 @@ def test_create_feed(client):
     assert "created_at" in data
 
 
+def test_create_feed_is_fetched_once(client):
+    """The background fetch owns the first fetch; the scheduler does not claim the feed too."""
+    with patch("src.api.feeds.fetch_feed") as fetch:
+        response = client.post("/api/feeds", json={
+            "name": "Once", "url": "https://once.example.com/feed.xml",
+        })
+    assert response.status_code == 201
+    fetch.assert_called_once()
+
+    db = TestingSessionLocal()
+    assert _claim_due_feeds(db, _utcnow()) == []
+    db.close()
+
+
 def test_list_feeds_with_data(client):
     """Test GET /api/feeds returns created feeds."""
     # Create two feeds
@@ -122,3 +142,47 @@ def test_create_feed_duplicate_url(client):
     response2 = client.post("/api/feeds", json=duplicate_data)
     assert response2.status_code == 400
     assert "already exists" in response2.json()["detail"].lower()
+
+
+def test_update_feed_interval_reschedules_next_fetch(client, db_session):
+    """Test PATCH /api/feeds/{id} re-times next_fetch_at from last_fetched."""
+    create_response = client.post("/api/feeds", json={
+        "name": "Resched", "url": "https://resched.example.com/feed.xml"
+    })
+    feed_id = create_response.json()["id"]
+    last = datetime(2026, 10, 1, 12, 0, 0)
+    feed = db_session.query(Feed).filter(Feed.id == feed_id).one()
+    feed.last_fetched = last
+    db_session.commit()
+
+    client.patch(f"/api/feeds/{feed_id}", json={"fetch_interval": 3600})
+
+    db_session.expire_all()
+    feed = db_session.query(Feed).filter(Feed.id == feed_id).one()
+    assert feed.next_fetch_at == last + timedelta(seconds=3600)
+
+
+def test_feed_response_exposes_adaptive_fields(client):
+    """Test interval bounds round-trip and effective_interval is exposed."""
+    response = client.post("/api/feeds", json={
+        "name": "Bounded",
+        "url": "https://bounded.example.com/feed.xml",
+        "min_fetch_interval": 600,
+        "max_fetch_interval": 7200,
+    })
+    assert response.status_code == 201
+    data = response.json()
+    assert data["min_fetch_interval"] == 600
+    assert data["max_fetch_interval"] == 7200
+    assert "effective_interval" in data
+
+
+def test_feed_bounds_validated(client):
+    """Test min_fetch_interval may not exceed max_fetch_interval."""
+    response = client.post("/api/feeds", json={
+        "name": "Inverted",
+        "url": "https://inverted.example.com/feed.xml",
+        "min_fetch_interval": 7200,
+        "max_fetch_interval": 600,
+    })
+    assert response.status_code == 422
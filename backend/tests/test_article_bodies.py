@@ -0,0 +1,66 @@
+"""Tests for article bodies kept in the article_bodies side table."""
+
+from sqlalchemy import text
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.feed import Feed
+from tests.conftest import TestingSessionLocal
+
+
+def _article(db, **fields):
+    feed = db.query(Feed).first()
+    if feed is None:
+        feed = Feed(name="Feed", url="https://feed.example.com/rss")
+        db.add(feed)
+        db.commit()
+    article = Article(feed_id=feed.id, title="Title", url=f"https://e.com/{fields.pop('slug')}",
+                      **fields)
+    db.add(article)
+    db.commit()
+    return article
+
+
+def _count(db, sql):
+    return db.execute(text(sql)).scalar()
+
+
+def test_bodies_are_stored_outside_articles(setup_database):
+    db = TestingSessionLocal()
+    article = _article(db, slug="a", content="<p>Rye bread</p>", content_text="Rye bread")
+    _article(db, slug="bare")
+    article_id = article.id
+    db.expunge_all()
+
+    columns = {row[1] for row in db.execute(text("PRAGMA table_info(articles)"))}
+    assert not {"content", "content_text"} & columns
+    assert _count(db, "SELECT count(*) FROM article_bodies") == 1
+
+    article = db.get(Article, article_id)
+    assert (article.content, article.content_text) == ("<p>Rye bread</p>", "Rye bread")
+    bare = db.query(Article).filter(Article.url == "https://e.com/bare").one()
+    assert bare.content is None and bare.body is None
+
+    # Writing through the article updates its body row
+    article.content_text = "Spelt bread"
+    db.commit()
+    assert db.get(ArticleBody, article_id).content_text == "Spelt bread"
+    assert _count(db, "SELECT count(*) FROM articles_fts WHERE articles_fts MATCH 'spelt'") == 1
+    db.close()
+
+
+def test_deletes_remove_bodies(client, setup_database):
+    db = TestingSessionLocal()
+    for slug in ("a", "b", "c"):
+        _article(db, slug=slug, content=f"<p>{slug}</p>", content_text=slug)
+    feed_id = db.query(Feed).one().id
+
+    # Bulk delete bypasses the ORM cascade; the trigger still cleans up
+    db.execute(text("DELETE FROM articles WHERE url = 'https://e.com/a'"))
+    db.commit()
+    assert _count(db, "SELECT count(*) FROM article_bodies") == 2
+    db.close()
+
+    assert client.delete(f"/api/feeds/{feed_id}").status_code == 204
+    db = TestingSessionLocal()
+    assert _count(db, "SELECT count(*) FROM article_bodies") == 0
+    db.close()
@@ -0,0 +1,58 @@
+"""Tests for the plain-text backfill job."""
+
+from sqlalchemy import event
+from src.models.article import Article
+from src.models.feed import Feed
+from src.utils.backfill import backfill_content_text
+from tests.conftest import TestingSessionLocal, test_engine
+
+
+def _seed(db, count):
+    feed = Feed(name="Feed", url="https://feed.example.com/rss")
+    db.add(feed)
+    db.commit()
+    db.add_all(
+        Article(feed_id=feed.id, title=f"Post {i}", url=f"https://e.com/{i}",
+                content=f"<p>Body <b>number</b> {i}</p>")
+        for i in range(count)
+    )
+    db.add(Article(feed_id=feed.id, title="No body", url="https://e.com/empty"))
+    db.add(Article(feed_id=feed.id, title="Done", url="https://e.com/done",
+                   content="<p>raw</p>", content_text="already set"))
+    db.commit()
+
+
+def test_backfill_populates_missing_text(setup_database):
+    db = TestingSessionLocal()
+    _seed(db, 5)
+
+    assert backfill_content_text(TestingSessionLocal, batch_size=2, pause=0) == 5
+
+    articles = {a.url: a for a in db.query(Article)}
+    assert articles["https://e.com/3"].content_text == "Body number 3"
+    assert articles["https://e.com/3"].word_count == 3
+    assert articles["https://e.com/3"].excerpt == "Body number 3"
+    assert articles["https://e.com/empty"].content_text is None
+    assert articles["https://e.com/done"].content_text == "already set"
+
+    # Idempotent: nothing left to do on a second run
+    assert backfill_content_text(TestingSessionLocal, batch_size=2, pause=0) == 0
+    db.close()
+
+
+def test_backfill_commits_each_batch(setup_database):
+    db = TestingSessionLocal()
+    _seed(db, 5)
+    db.close()
+
+    commits = []
+
+    def record(conn):
+        commits.append(conn)
+
+    event.listen(test_engine, "commit", record)
+    try:
+        backfill_content_text(TestingSessionLocal, batch_size=2, pause=0)
+    finally:
+        event.remove(test_engine, "commit", record)
+    assert len(commits) == 3
@@ -0,0 +1,84 @@
+"""Smoke tests for the benchmark package."""
+
+import hashlib
+import pytest
+from sqlalchemy import create_engine, text
+from benchmarks.datagen import Scale, database_url, ensure_database, generate
+from benchmarks.runner import compare, run, summarize
+
+SCALE = Scale(feeds=5, articles=300, tags=5)
+
+
+def _fingerprint(db_path):
+    engine = create_engine(database_url(db_path))
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, feed_id, title, sort_key, is_read, is_saved FROM articles ORDER BY id"
+        )).all()
+        extras = conn.execute(text(
+            "SELECT (SELECT count(*) FROM article_tags), (SELECT count(*) FROM highlights), "
+            "(SELECT sum(unread_count) FROM feeds)"
+        )).one()
+    engine.dispose()
+    return hashlib.sha256(repr((rows, extras)).encode()).hexdigest(), extras
+
+
+def test_generator_is_deterministic(tmp_path):
+    generate(tmp_path / "a.db", SCALE)
+    generate(tmp_path / "b.db", SCALE)
+
+    fingerprint, (tags, highlights, unread) = _fingerprint(tmp_path / "a.db")
+    assert fingerprint == _fingerprint(tmp_path / "b.db")[0]
+    assert tags > 0 and highlights > 0 and unread > 0
+
+
+def test_ensure_database_reuses_matching_database(tmp_path):
+    db_path = tmp_path / "bench.db"
+    assert ensure_database(db_path, SCALE) is True
+    assert ensure_database(db_path, SCALE) is False
+    assert ensure_database(db_path, Scale(feeds=5, articles=300, tags=5, seed=7)) is True
+
+
+def test_run_records_results_and_leaves_data_unchanged(tmp_path):
+    db_path = tmp_path / "bench.db"
+    generate(db_path, SCALE)
+    before = _fingerprint(db_path)
+
+    results = run(db_path, SCALE, ["list_summary_page", "update_article", "ingest_store_entries",
+                                   "scheduler_claim"], iterations=2)
+
+    assert results["meta"]["scale"]["articles"] == 300
+    assert set(results["scenarios"]) == {
+        "list_summary_page", "update_article", "ingest_store_entries", "scheduler_claim",
+    }
+    assert results["scenarios"]["list_summary_page"]["n"] == 2
+    assert _fingerprint(db_path) == before
+
+
+def test_run_rejects_unknown_scenario(tmp_path):
+    with pytest.raises(ValueError):
+        run(tmp_path / "bench.db", SCALE, ["nope"], iterations=1)
+
+
+def test_summarize():
+    stats = summarize([4.0, 1.0, 3.0, 2.0])
+    assert stats["n"] == 4
+    assert stats["p50_ms"] == 2.5
+    assert (stats["min_ms"], stats["max_ms"]) == (1.0, 4.0)
+
+
+def test_compare_flags_only_material_regressions():
+    meta = {"scale": {"articles": 1}}
+    baseline = {"meta": meta, "scenarios": {
+        "a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}, "c": {"p50_ms": 0.2},
+    }}
+    current = {"meta": meta, "scenarios": {
+        "a": {"p50_ms": 20.0},  # regressed
+        "b": {"p50_ms": 11.0},  # within threshold
+        "c": {"p50_ms": 0.6},   # large ratio, negligible delta
+        "d": {"p50_ms": 50.0},  # new scenario
+    }}
+    assert compare(current, baseline) == ["a: p50 10.0 ms -> 20.0 ms (+100%)"]
+
+    with pytest.raises(ValueError):
+        compare(current, {"meta": {"scale": {"articles": 2}}, "scenarios": {}})
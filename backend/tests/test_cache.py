@@ -0,0 +1,95 @@
+"""Tests for the article list cache."""
+
+from unittest.mock import patch
+import feedparser
+from src.models.feed import Feed
+from src.utils.cache import ListCache, article_list_cache
+from src.utils.fetcher import extract_entries, store_entries
+from tests.conftest import TestingSessionLocal
+
+
+def test_get_returns_stored_value():
+    cache = ListCache(max_entries=4)
+    cache.put("a", 1, cache.version)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_evicted():
+    cache = ListCache(max_entries=2)
+    cache.put("a", 1, cache.version)
+    cache.put("b", 2, cache.version)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", 3, cache.version)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_total_size_bounded():
+    cache = ListCache(max_entries=10, max_bytes=100)
+    cache.put("a", "a", cache.version, size=40)
+    cache.put("b", "b", cache.version, size=40)
+    cache.put("c", "c", cache.version, size=40)  # evicts "a" to stay within 100 bytes
+    assert cache.get("a") is None
+    assert (cache.get("b"), cache.get("c"), cache.size) == ("b", "c", 80)
+
+    cache.put("huge", "huge", cache.version, size=101)  # over the whole budget
+    assert cache.get("huge") is None and len(cache) == 2
+
+    cache.invalidate()
+    assert cache.size == 0
+
+
+def test_invalidate_drops_entries():
+    cache = ListCache(max_entries=4)
+    cache.put("a", 1, cache.version)
+    cache.invalidate()
+    assert cache.get("a") is None
+
+
+def test_put_ignored_when_write_raced_computation():
+    cache = ListCache(max_entries=4)
+    version = cache.version
+    cache.invalidate()  # a write lands while the value is being computed
+    cache.put("a", "stale", version)
+    assert cache.get("a") is None
+
+
+def test_entries_expire_after_max_age():
+    # Writes from another process never call invalidate(); age bounds staleness
+    cache = ListCache(max_entries=4, max_bytes=100, max_age=30)
+    with patch("src.utils.cache.time.monotonic", return_value=1000.0):
+        cache.put("a", "a", cache.version, size=10)
+    with patch("src.utils.cache.time.monotonic", return_value=1029.0):
+        assert cache.get("a") == "a"
+    with patch("src.utils.cache.time.monotonic", return_value=1030.0):
+        assert cache.get("a") is None
+    assert (len(cache), cache.size) == (0, 0)
+
+
+def test_zero_size_disables_cache():
+    cache = ListCache(max_entries=0)
+    cache.put("a", 1, cache.version)
+    assert cache.get("a") is None
+
+
+def test_store_entries_invalidates_only_when_articles_added(setup_database):
+    db = TestingSessionLocal()
+    feed = Feed(name="Test", url="https://example.com/feed.xml")
+    db.add(feed)
+    db.commit()
+    parsed = feedparser.FeedParserDict({"entries": [
+        feedparser.FeedParserDict({"link": "https://example.com/1", "title": "One"}),
+    ]})
+
+    version = article_list_cache.version
+    store_entries(feed.id, feed.url, extract_entries(parsed), db)
+    assert article_list_cache.version == version + 1
+
+    store_entries(feed.id, feed.url, extract_entries(parsed), db)  # nothing new
+    assert article_list_cache.version == version + 1
+    db.close()
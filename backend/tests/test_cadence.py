@@ -0,0 +1,33 @@
+"""Tests for adaptive fetch interval computation."""
+
+from datetime import datetime, timedelta
+from src.utils.cadence import adaptive_interval
+
+
+def _every(seconds, count=10):
+    newest = datetime(2026, 10, 17, 12, 0, 0)
+    return [newest - timedelta(seconds=seconds * i) for i in range(count)]
+
+
+def test_daily_feed_polls_twice_a_day():
+    assert adaptive_interval(_every(86400), 900, 0, 300, 86400) == 43200
+
+
+def test_busy_feed_clamped_to_minimum():
+    assert adaptive_interval(_every(120), 900, 0, 300, 86400) == 300
+
+
+def test_short_history_uses_base_interval():
+    assert adaptive_interval(_every(86400, count=2), 900, 0, 300, 86400) == 900
+
+
+def test_unchanged_streak_backs_off():
+    assert adaptive_interval([], 900, 2, 300, 86400) == 1800
+
+
+def test_result_clamped_to_maximum():
+    assert adaptive_interval(_every(7 * 86400), 900, 10, 300, 86400) == 86400
+
+
+def test_inverted_bounds_use_minimum():
+    assert adaptive_interval([], 900, 0, 3600, 600) == 3600
@@ -0,0 +1,131 @@
+"""Tests for compressed article body storage."""
+
+import feedparser
+import pytest
+from sqlalchemy import text
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.content_dictionary import ContentDictionary
+from src.models.feed import Feed
+from src.utils.compression import (
+    compress_content, decompress_content, train_dictionary, uses_dictionary,
+)
+from src.utils.fetcher import extract_entries, store_entries
+from tests.conftest import TestingSessionLocal
+
+TEMPLATE = (
+    '<div class="post"><header><span class="kicker">Weekly dispatch</span></header>'
+    "<p>{body}</p><footer><p>Thanks for reading the newsletter. Forward it to a friend, "
+    'or <a href="https://news.example.com/subscribe">subscribe here</a>.</p></footer></div>'
+)
+
+
+def _bodies(count):
+    return [TEMPLATE.format(body=f"Issue {i} covers topic {i * 7} in brief.") for i in range(count)]
+
+
+def test_round_trip_and_plain_text_passthrough():
+    html = "<p>" + "sourdough starter " * 50 + "</p>"
+    stored = compress_content(html, level=6)
+    assert isinstance(stored, bytes) and len(stored) < len(html)
+    assert decompress_content(stored) == html
+
+    # Legacy rows and bodies too small to shrink are plain text
+    assert compress_content("<p>hi</p>", level=6) == "<p>hi</p>"
+    assert decompress_content("<p>legacy</p>") == "<p>legacy</p>"
+    assert compress_content(html, level=0) == html
+    assert compress_content(None) is None
+
+
+def test_trained_dictionary_shrinks_short_bodies():
+    samples = _bodies(30)
+    dictionary = train_dictionary(samples)
+    assert b"subscribe here" in dictionary
+
+    body = TEMPLATE.format(body="A brand new issue about rye.")
+    plain = compress_content(body, level=6)
+    primed = compress_content(body, dictionary, level=6)
+    assert uses_dictionary(primed) and not uses_dictionary(plain)
+    assert len(primed) < len(plain) / 2
+    assert decompress_content(primed, dictionary) == body
+    with pytest.raises(ValueError):
+        decompress_content(primed)
+
+    assert train_dictionary(["<p>alpha</p>", "<b>beta</b>"]) == b""
+
+
+def test_article_content_is_compressed_transparently(setup_database):
+    db = TestingSessionLocal()
+    feed = Feed(name="Feed", url="https://feed.example.com/rss")
+    db.add(feed)
+    db.commit()
+    html = "<p>" + "long form body " * 100 + "</p>"
+    db.add(Article(feed_id=feed.id, title="New", url="https://e.com/new", content=html))
+    db.add(Article(feed_id=feed.id, title="Tiny", url="https://e.com/tiny", content="<p>hi</p>"))
+    db.commit()
+    old = Article(feed_id=feed.id, title="Old", url="https://e.com/old")
+    db.add(old)
+    db.commit()
+    db.execute(text(
+        "INSERT INTO article_bodies (article_id, content) VALUES (:id, '<p>stored before</p>')"
+    ), {"id": old.id})
+    db.commit()
+    db.expunge_all()
+
+    # Declared BLOB; bodies that did not shrink stay text, as legacy rows are
+    assert {row[1]: row[2] for row in db.execute(text(
+        "PRAGMA table_info(article_bodies)"
+    ))}["content"] == "BLOB"
+    assert db.execute(text(
+        "SELECT typeof(content) FROM article_bodies ORDER BY article_id"
+    )).scalars().all() == ["blob", "text", "text"]
+    articles = {a.url: a for a in db.query(Article)}
+    assert articles["https://e.com/new"].content == html
+    assert articles["https://e.com/tiny"].content == "<p>hi</p>"
+    assert articles["https://e.com/old"].content == "<p>stored before</p>"
+    db.close()
+
+
+def test_get_article_returns_decompressed_body(client, db_session):
+    feed = Feed(name="Feed", url="https://feed.example.com/rss")
+    db_session.add(feed)
+    db_session.commit()
+    dictionary = ContentDictionary(feed_id=feed.id, data=train_dictionary(_bodies(30)), samples=30)
+    db_session.add(dictionary)
+    db_session.commit()
+    body = TEMPLATE.format(body="Read me through the API.")
+    article = Article(feed_id=feed.id, title="Primed", url="https://e.com/primed")
+    article.body = ArticleBody(
+        content_data=compress_content(body, dictionary.data), content_dictionary_id=dictionary.id
+    )
+    db_session.add(article)
+    db_session.commit()
+
+    response = client.get(f"/api/articles/{article.id}")
+    assert response.status_code == 200
+    assert response.json()["content"] == body
+
+    listed = client.get("/api/articles/").json()
+    assert listed[0]["content"] == body
+
+
+def test_store_entries_compresses_with_feed_dictionary(setup_database):
+    db = TestingSessionLocal()
+    feed = Feed(name="Feed", url="https://feed.example.com/rss")
+    db.add(feed)
+    db.commit()
+    db.add(ContentDictionary(feed_id=feed.id, data=train_dictionary(_bodies(30)), samples=30))
+    db.commit()
+
+    body = TEMPLATE.format(body="Fresh from the feed.")
+    entries = extract_entries(feedparser.FeedParserDict({"bozo": False, "entries": [
+        feedparser.FeedParserDict({"link": "https://e.com/fresh", "title": "Fresh", "summary": body})
+    ]}))
+    assert store_entries(feed.id, feed.url, entries, db) == 1
+
+    db.expunge_all()
+    article = db.query(Article).one()
+    assert uses_dictionary(article.body.content_data)
+    assert article.body.content_dictionary_id is not None
+    assert article.content == body
+    db.close()
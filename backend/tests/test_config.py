@@ -50,7 +50,25 @@ def test_settings_has_sensible_defaults():
     assert settings.allowed_origins == "http://localhost:18300,http://krepsys.local"
     assert settings.fetch_interval == 900
     assert settings.log_level == "INFO"
+    assert settings.sqlite_journal_mode == "WAL"
+    assert settings.sqlite_synchronous == "NORMAL"
+    assert settings.slow_query_ms == 100.0
+    assert settings.db_timing_headers is False
+    assert settings.content_compression_level == 6
+    assert settings.retention_days == 0
+    assert settings.retention_keep_per_feed == 0
+    assert settings.list_cache_ttl == 30.0
+    assert settings.retention_tombstone_days == 180
     
     # Restore original environment
     for var, value in original_values.items():
         os.environ[var] = value
+
+
+def test_sqlite_pragma_settings_are_validated():
+    """PRAGMA keywords are checked at startup instead of on the first connect."""
+    assert Settings(sqlite_journal_mode="wal").sqlite_journal_mode == "WAL"
+    with pytest.raises(ValueError):
+        Settings(sqlite_journal_mode="wall")
+    with pytest.raises(ValueError):
+        Settings(sqlite_auto_vacuum="SOMETIMES")
@@ -0,0 +1,108 @@
+"""Tests for trigger-maintained per-feed counters."""
+
+import feedparser
+import pytest
+from sqlalchemy import text
+from src.models.article import Article
+from src.models.feed import Feed
+from src.utils.counters import check_counters, install_counters, reconcile_counters
+from src.utils.fetcher import extract_entries, store_entries
+from tests.conftest import TestingSessionLocal, test_engine
+
+
+@pytest.fixture
+def feeds(db_session):
+    feeds = [Feed(name="A", url="https://a.example.com/rss"),
+             Feed(name="B", url="https://b.example.com/rss")]
+    db_session.add_all(feeds)
+    db_session.commit()
+    return feeds
+
+
+def _ingest(db, feed, count, prefix="post"):
+    parsed = feedparser.FeedParserDict({"entries": [
+        feedparser.FeedParserDict({"link": f"{feed.url}/{prefix}{i}", "title": f"{prefix} {i}"})
+        for i in range(count)
+    ]})
+    store_entries(feed.id, feed.url, extract_entries(parsed), db)
+
+
+def _counts(client):
+    return {c["feed_id"]: (c["unread_count"], c["saved_count"])
+            for c in client.get("/api/feeds/counts").json()}
+
+
+def test_ingest_increments_unread(client, db_session, feeds):
+    _ingest(db_session, feeds[0], 3)
+    _ingest(db_session, feeds[1], 2)
+    _ingest(db_session, feeds[0], 3)  # duplicates add nothing
+
+    assert _counts(client) == {feeds[0].id: (3, 0), feeds[1].id: (2, 0)}
+
+
+def test_single_updates_adjust_counts(client, db_session, feeds):
+    _ingest(db_session, feeds[0], 3)
+    ids = [a.id for a in db_session.query(Article).order_by(Article.id)]
+
+    client.patch(f"/api/articles/{ids[0]}", json={"is_read": True})
+    client.patch(f"/api/articles/{ids[1]}", json={"is_saved": True})
+    client.patch(f"/api/articles/{ids[1]}", json={"is_saved": True})  # no-op
+    client.patch(f"/api/articles/{ids[2]}", json={"is_archived": True})
+    assert _counts(client)[feeds[0].id] == (1, 1)
+
+    client.patch(f"/api/articles/{ids[0]}", json={"is_read": False})
+    assert _counts(client)[feeds[0].id] == (2, 1)
+
+
+def test_bulk_update_adjusts_counts(client, db_session, feeds):
+    _ingest(db_session, feeds[0], 4)
+    _ingest(db_session, feeds[1], 2)
+
+    client.patch("/api/articles/bulk", json={
+        "filter": {"feed_id": feeds[0].id}, "changes": {"is_read": True, "is_saved": True},
+    })
+    assert _counts(client) == {feeds[0].id: (0, 4), feeds[1].id: (2, 0)}
+
+
+def test_deletes_adjust_counts(client, db_session, feeds):
+    _ingest(db_session, feeds[0], 3)
+    db_session.delete(db_session.query(Article).first())
+    db_session.commit()
+    assert _counts(client)[feeds[0].id] == (2, 0)
+
+    assert client.delete(f"/api/feeds/{feeds[0].id}").status_code == 204
+    assert _counts(client) == {feeds[1].id: (0, 0)}
+
+
+def test_feed_response_includes_counts(client, db_session, feeds):
+    _ingest(db_session, feeds[1], 2)
+    feed = client.get(f"/api/feeds/{feeds[1].id}").json()
+    assert (feed["unread_count"], feed["saved_count"]) == (2, 0)
+
+
+def test_reconcile_detects_and_repairs_drift(db_session, feeds):
+    _ingest(db_session, feeds[0], 3)
+    with test_engine.begin() as conn:
+        assert check_counters(conn) == []
+        conn.execute(text("UPDATE feeds SET unread_count = 99, saved_count = 7 WHERE id = :id"),
+                     {"id": feeds[0].id})
+
+        assert check_counters(conn) == [(feeds[0].id, 99, 3, 7, 0)]
+        assert reconcile_counters(conn) == 1
+        assert check_counters(conn) == []
+        assert reconcile_counters(conn) == 0
+
+
+def test_install_counters_on_existing_database(db_session, feeds):
+    with test_engine.begin() as conn:
+        assert install_counters(conn) is False
+        for name in ("articles_counts_ai", "articles_counts_au", "articles_counts_ad"):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+    _ingest(db_session, feeds[0], 2)  # not counted without triggers
+
+    with test_engine.begin() as conn:
+        assert install_counters(conn) is True
+        assert reconcile_counters(conn) == 1
+    db = TestingSessionLocal()
+    assert db.get(Feed, feeds[0].id).unread_count == 2
+    db.close()
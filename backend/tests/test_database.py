@@ -0,0 +1,55 @@
+"""Tests for the SQLite connection profile."""
+
+from sqlalchemy import text
+from src.config import Settings
+from src.database import create_db_engine
+
+
+def _pragma(conn, name):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_connection_profile_applied_on_connect(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/profile.db", Settings())
+    with engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == 5000
+        assert _pragma(conn, "cache_size") == -65536
+        assert _pragma(conn, "temp_store") == 2  # MEMORY
+        assert _pragma(conn, "auto_vacuum") == 2  # INCREMENTAL
+    engine.dispose()
+
+
+def test_connection_profile_is_configurable(tmp_path):
+    settings = Settings(
+        sqlite_journal_mode="DELETE",
+        sqlite_synchronous="FULL",
+        sqlite_busy_timeout=250,
+        sqlite_cache_size=-2000,
+        sqlite_mmap_size=0,
+        sqlite_temp_store="DEFAULT",
+    )
+    engine = create_db_engine(f"sqlite:///{tmp_path}/custom.db", settings)
+    with engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "delete"
+        assert _pragma(conn, "synchronous") == 2  # FULL
+        assert _pragma(conn, "busy_timeout") == 250
+        assert _pragma(conn, "mmap_size") == 0
+    engine.dispose()
+
+
+def test_reads_proceed_during_open_write_transaction(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/wal.db", Settings(sqlite_busy_timeout=0))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    with engine.connect() as writer, engine.connect() as reader:
+        writer.execute(text("BEGIN IMMEDIATE"))
+        writer.execute(text("INSERT INTO t VALUES (2)"))
+        # The reader gets the last committed snapshot without waiting
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        writer.execute(text("COMMIT"))
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 2
+    engine.dispose()
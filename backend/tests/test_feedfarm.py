@@ -0,0 +1,90 @@
+"""Tests for the local feed farm and the ingest load harness."""
+
+import asyncio
+from dataclasses import replace
+import feedparser
+import httpx
+import pytest
+from benchmarks.feedfarm import FarmProfile, FeedFarm
+from benchmarks.ingest_load import run_load
+
+QUIET = FarmProfile(latency_ms=0.001, latency_spread=0.0, error_rate=0.0,
+                    redirect_fraction=0.0, conditional_fraction=1.0, speed=0.0)
+
+
+@pytest.fixture
+def farm():
+    with FeedFarm(QUIET) as farm:
+        yield farm
+
+
+def test_feeds_are_deterministic_and_parseable(farm):
+    first = httpx.get(farm.feed_url(3))
+    second = httpx.get(farm.feed_url(3))
+
+    assert first.status_code == 200
+    assert first.content == second.content
+    parsed = feedparser.parse(first.content)
+    assert not parsed.bozo
+    assert len(parsed.entries) == QUIET.items
+    assert all(e.link.startswith("https://farm42.example/3/") for e in parsed.entries)
+
+    with FeedFarm(QUIET) as other:
+        assert httpx.get(other.feed_url(3)).content == first.content
+
+
+def test_serves_rss_and_atom():
+    profile = replace(QUIET, atom_fraction=0.5)
+    with FeedFarm(profile) as farm:
+        versions = {feedparser.parse(httpx.get(farm.feed_url(n)).content).version
+                    for n in range(20)}
+    assert {"rss20", "atom10"} <= versions
+
+
+def test_conditional_get_returns_304(farm):
+    response = httpx.get(farm.feed_url(1))
+    etag = response.headers["etag"]
+
+    assert httpx.get(farm.feed_url(1), headers={"If-None-Match": etag}).status_code == 304
+    modified = {"If-Modified-Since": response.headers["last-modified"]}
+    assert httpx.get(farm.feed_url(1), headers=modified).status_code == 304
+    assert farm.stats["status_304"] == 2
+
+
+def test_redirects_and_errors():
+    profile = replace(QUIET, redirect_fraction=1.0, error_rate=1.0)
+    with FeedFarm(profile) as farm:
+        response = httpx.get(farm.feed_url(1))
+        assert response.status_code == 301
+        assert response.headers["location"] == "/moved/1.xml"
+        assert httpx.get(farm.feed_url(1), follow_redirects=True).status_code in (429, 500, 503)
+
+
+def test_stall_dribbles_the_body():
+    profile = replace(QUIET, stall_rate=1.0, stall_seconds=1.0)
+    with FeedFarm(profile) as farm:
+        with pytest.raises(httpx.ReadTimeout):
+            httpx.get(farm.feed_url(1), timeout=httpx.Timeout(5.0, read=0.1))
+        response = httpx.get(farm.feed_url(1), timeout=5.0)
+        assert response.status_code == 200
+        assert feedparser.parse(response.content).entries
+        assert response.elapsed.total_seconds() >= 0.9
+
+
+def test_unknown_paths_404(farm):
+    base = farm.feed_url(0).rsplit("/feeds/", 1)[0]
+    assert httpx.get(f"{base}/feeds/abc.xml").status_code == 404
+    assert httpx.get(f"{base}/_stats").json()["status_404"] == 1
+
+
+def test_run_load_registers_feeds_and_runs_scheduler_rounds(farm, tmp_path):
+    urls = [farm.feed_url(n) for n in range(4)]
+
+    results = asyncio.run(run_load(tmp_path / "ingest.db", urls, rounds=2))
+
+    assert results["register"]["feeds"] == 4
+    assert results["articles"] == 4 * QUIET.items
+    assert [r["feeds"] for r in results["rounds"]] == [4, 4]
+    # Nothing new was published, so every scheduler fetch is a 304
+    assert results["requests"]["outcomes"] == {"304": 8}
+    assert results["fetch_stats"]["not_modified"] == 8
@@ -0,0 +1,225 @@
+"""Tests for the concurrent fetch engine."""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from unittest.mock import patch
+import httpx
+from src.models.article import Article
+from src.models.feed import Feed
+from src.utils.fetch_engine import FeedTarget, FetchEngine
+from src.utils.fetcher import fetch_stats
+from tests.conftest import TestingSessionLocal
+
+
+def _rss(host, count):
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://{host}/post{i}</link>"
+        f"<description>&lt;p&gt;Body {i}&lt;/p&gt;</description></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{host}</title>{items}</channel></rss>'
+
+
+def _create_feeds(urls):
+    db = TestingSessionLocal()
+    feeds = [Feed(name=url, url=url) for url in urls]
+    db.add_all(feeds)
+    db.commit()
+    pairs = [(f.id, f.url) for f in feeds]
+    db.close()
+    return pairs
+
+
+class _ConcurrencyTracker:
+    """Async mock transport handler recording peak in-flight requests."""
+
+    def __init__(self, delay=0.02, status=200):
+        self.delay = delay
+        self.status = status
+        self.in_flight = 0
+        self.peak = 0
+        self.host_in_flight = {}
+        self.host_peak = {}
+
+    async def __call__(self, request):
+        host = request.url.host
+        self.in_flight += 1
+        self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+        self.peak = max(self.peak, self.in_flight)
+        self.host_peak[host] = max(self.host_peak.get(host, 0), self.host_in_flight[host])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+            self.host_in_flight[host] -= 1
+        return httpx.Response(
+            self.status,
+            content=_rss(host, 2).encode(),
+            headers={"content-type": "application/rss+xml"},
+        )
+
+
+def _engine(handler, **kwargs):
+    return FetchEngine(
+        session_factory=TestingSessionLocal,
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def test_fetch_all_stores_entries_and_stamps_feeds(setup_database):
+    feeds = _create_feeds([f"https://host{i}.example.com/feed.xml" for i in range(3)])
+    engine = _engine(_ConcurrencyTracker(delay=0))
+
+    results = asyncio.run(engine.fetch_all(feeds))
+
+    assert results == {feed_id: 2 for feed_id, _ in feeds}
+    db = TestingSessionLocal()
+    assert db.query(Article).count() == 6
+    assert all(f.last_fetched is not None for f in db.query(Feed).all())
+    db.close()
+
+
+def test_fetch_all_respects_global_and_per_host_limits(setup_database):
+    urls = [f"https://host{i % 3}.example.com/feed{i}.xml" for i in range(12)]
+    feeds = _create_feeds(urls)
+    tracker = _ConcurrencyTracker()
+    engine = _engine(tracker, max_concurrency=4, per_host_concurrency=1)
+
+    asyncio.run(engine.fetch_all(feeds))
+
+    assert tracker.peak <= 4
+    assert max(tracker.host_peak.values()) == 1
+
+
+def test_fetch_all_runs_downloads_in_parallel(setup_database):
+    feeds = _create_feeds([f"https://host{i}.example.com/feed.xml" for i in range(8)])
+    tracker = _ConcurrencyTracker()
+    engine = _engine(tracker, max_concurrency=8, per_host_concurrency=1)
+
+    asyncio.run(engine.fetch_all(feeds))
+
+    assert tracker.peak > 1
+
+
+def test_fetch_all_http_error_does_not_stamp_feed(setup_database):
+    feeds = _create_feeds(["https://gone.example.com/feed.xml"])
+    engine = _engine(_ConcurrencyTracker(delay=0, status=404))
+
+    results = asyncio.run(engine.fetch_all(feeds))
+
+    assert results == {feeds[0][0]: 0}
+    db = TestingSessionLocal()
+    assert db.query(Feed).one().last_fetched is None
+    assert db.query(Article).count() == 0
+    db.close()
+
+
+def test_conditional_get_short_circuits_304(setup_database):
+    feeds = _create_feeds(["https://cond.example.com/feed.xml"])
+    body = _rss("cond.example.com", 3).encode()
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={
+            "etag": '"v1"', "last-modified": "Sat, 17 Oct 2026 00:00:00 GMT",
+        })
+
+    engine = _engine(handler)
+    fetch_stats.reset()
+
+    assert asyncio.run(engine.fetch_all(feeds)) == {feeds[0][0]: 3}
+    db = TestingSessionLocal()
+    feed = db.query(Feed).one()
+    assert feed.etag == '"v1"'
+    assert feed.last_modified == "Sat, 17 Oct 2026 00:00:00 GMT"
+    first_fetched = feed.last_fetched
+    db.close()
+
+    target = FeedTarget(feed.id, feed.url, feed.etag, feed.last_modified)
+    with patch("src.utils.fetch_engine.parse_feed_bytes") as parse:
+        assert asyncio.run(engine.fetch_all([target])) == {feed.id: 0}
+        parse.assert_not_called()
+
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[1]["if-modified-since"] == "Sat, 17 Oct 2026 00:00:00 GMT"
+
+    db = TestingSessionLocal()
+    feed = db.query(Feed).one()
+    assert feed.last_fetched >= first_fetched
+    assert feed.etag == '"v1"'  # validators kept across a 304
+    assert db.query(Article).count() == 3
+    db.close()
+
+    stats = fetch_stats.snapshot()
+    assert stats["fetched"] == 1
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len(body)
+    assert stats["parse_seconds_saved"] == stats["parse_seconds"]
+
+
+def test_fetch_all_with_process_pool_parsing(setup_database):
+    feeds = _create_feeds([f"https://pool{i}.example.com/feed.xml" for i in range(3)])
+    engine = _engine(_ConcurrencyTracker(delay=0), parse_pool_size=2)
+    try:
+        results = asyncio.run(engine.fetch_all(feeds))
+    finally:
+        engine.close()
+
+    assert results == {feed_id: 2 for feed_id, _ in feeds}
+    db = TestingSessionLocal()
+    assert {a.excerpt for a in db.query(Article).all()} == {"Body 0", "Body 1"}
+    db.close()
+
+
+def test_broken_parse_pool_is_replaced(setup_database):
+    feeds = _create_feeds(["https://crash.example.com/feed.xml"])
+    engine = _engine(_ConcurrencyTracker(delay=0), parse_pool_size=1)
+    try:
+        # A worker dying (OOM kill, segfault) breaks the pool it belonged to
+        broken = engine._parse_executor()
+        broken.submit(os._exit, 1).exception()
+        results = asyncio.run(engine.fetch_all(feeds))
+        assert engine._parse_pool is not broken
+    finally:
+        engine.close()
+
+    assert results == {feeds[0][0]: 2}
+
+
+def _slow_parse(content, headers):
+    time.sleep(0.3)
+    return [], None, 0.3
+
+
+def _stuck_parse(content, headers):
+    time.sleep(60)
+    return [], None, 60.0
+
+
+def test_parse_timeout_kills_the_stuck_worker(setup_database):
+    feeds = _create_feeds(["https://stuck.example.com/feed.xml"])
+    engine = _engine(_ConcurrencyTracker(delay=0), parse_pool_size=1, parse_timeout=0.5)
+    try:
+        worker = engine._parse_executor().submit(os.getpid).result()
+        with patch("src.utils.fetch_engine.parse_feed_bytes", _stuck_parse):
+            assert asyncio.run(engine.fetch_all(feeds)) == {feeds[0][0]: 0}
+        deadline = time.monotonic() + 10
+        while any(p.pid == worker for p in multiprocessing.active_children()):
+            assert time.monotonic() < deadline, "stuck parse worker still running"
+            time.sleep(0.05)
+    finally:
+        engine.close()
+
+
+def test_parse_timeout_reports_a_parse_error(setup_database):
+    feeds = _create_feeds(["https://slow.example.com/feed.xml"])
+    engine = _engine(_ConcurrencyTracker(delay=0), parse_timeout=0.05)
+    with patch("src.utils.fetch_engine.parse_feed_bytes", _slow_parse):
+        results = asyncio.run(engine.fetch_all(feeds))
+    assert results == {feeds[0][0]: 0}
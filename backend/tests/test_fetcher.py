@@ -1,27 +1,53 @@
 """Tests for fetch_feed utility."""
 
 from unittest.mock import patch
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import feedparser
-from tests.conftest import TestingSessionLocal
+import httpx
+from sqlalchemy import event
+from tests.conftest import TestingSessionLocal, test_engine
 from src.models.feed import Feed
-from src.utils.fetcher import fetch_feed
+from src.models.article import Article
+from src.utils.fetcher import (
+    ParsedEntry, extract_entries, fetch_feed, fetch_stats, parse_feed_bytes, store_entries,
+)
+from src.utils.metrics import FEED_FETCH_BYTES_SAVED
 
 
-EMPTY_FEED = feedparser.FeedParserDict({"entries": [], "bozo": False})
+RSS = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>'
+    "<item><title>Post</title><link>https://example.com/post</link>"
+    "<description>&lt;p&gt;Hello &lt;em&gt;there&lt;/em&gt;&lt;/p&gt;&lt;p&gt;friend&lt;/p&gt;"
+    "</description></item></channel></rss>"
+)
+EMPTY_RSS = '<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title></channel></rss>'
 
 
-def test_fetch_feed_sets_last_fetched(setup_database):
-    db = TestingSessionLocal()
-    feed = Feed(name="Test", url="https://example.com/feed.xml")
+def _serve(body="", status=200, headers=None):
+    """Patch the download fetch_feed makes with a canned response."""
+    response = httpx.Response(
+        status, content=body.encode(),
+        headers={"content-type": "application/rss+xml", **(headers or {})},
+        request=httpx.Request("GET", "https://example.com/feed.xml"),
+    )
+    return patch("src.utils.fetcher.httpx.get", return_value=response)
+
+
+def _new_feed(db, **fields):
+    feed = Feed(name="Test", url="https://example.com/feed.xml", **fields)
     db.add(feed)
     db.commit()
     db.refresh(feed)
-    feed_id = feed.id
+    return feed
+
+
+def test_fetch_feed_sets_last_fetched(setup_database):
+    db = TestingSessionLocal()
+    feed_id = _new_feed(db).id
     db.close()
 
     before = datetime.now(timezone.utc).replace(tzinfo=None)
-    with patch("src.utils.fetcher.feedparser.parse", return_value=EMPTY_FEED):
+    with _serve(EMPTY_RSS):
         db2 = TestingSessionLocal()
         fetch_feed(feed_id, "https://example.com/feed.xml", db2)
         feed = db2.query(Feed).filter(Feed.id == feed_id).first()
@@ -29,3 +55,198 @@ def test_fetch_feed_sets_last_fetched(setup_database):
         assert feed.last_fetched is not None
         assert feed.last_fetched >= before
         db2.close()
+
+
+def test_fetch_feed_stores_plain_text_fields(setup_database):
+    db = TestingSessionLocal()
+    feed = _new_feed(db)
+
+    with _serve(RSS):
+        assert fetch_feed(feed.id, feed.url, db) == 1
+
+    article = db.query(Article).one()
+    assert article.content == "<p>Hello <em>there</em></p><p>friend</p>"
+    assert article.content_text == "Hello there friend"
+    assert article.word_count == 3
+    assert article.excerpt == "Hello there friend"
+    db.close()
+
+
+def test_fetch_feed_sends_validators_and_handles_304(setup_database):
+    db = TestingSessionLocal()
+    feed = _new_feed(db, etag='"abc"', last_modified="Sat, 17 Oct 2026 00:00:00 GMT")
+
+    with _serve(status=304) as get:
+        assert fetch_feed(feed.id, feed.url, db) == 0
+
+    headers = get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Sat, 17 Oct 2026 00:00:00 GMT"
+    db.refresh(feed)
+    assert feed.last_fetched is not None
+    assert feed.etag == '"abc"'
+    db.close()
+
+
+def test_fetch_feed_stores_new_validators(setup_database):
+    db = TestingSessionLocal()
+    feed = _new_feed(db)
+
+    with _serve(EMPTY_RSS, headers={
+        "etag": '"v2"', "last-modified": "Sun, 18 Oct 2026 00:00:00 GMT",
+    }):
+        fetch_feed(feed.id, feed.url, db)
+
+    db.refresh(feed)
+    assert feed.etag == '"v2"'
+    assert feed.last_modified == "Sun, 18 Oct 2026 00:00:00 GMT"
+    db.close()
+
+
+def test_fetch_feed_primes_conditional_get_savings(setup_database):
+    db = TestingSessionLocal()
+    feed = _new_feed(db)
+    saved = FEED_FETCH_BYTES_SAVED.labels().value
+    fetch_stats.reset()
+
+    with _serve(RSS, headers={"etag": '"v1"'}):
+        fetch_feed(feed.id, feed.url, db)
+    with _serve(status=304):
+        fetch_feed(feed.id, feed.url, db)
+
+    stats = fetch_stats.snapshot()
+    assert (stats["fetched"], stats["not_modified"]) == (1, 1)
+    assert stats["bytes_saved"] == len(RSS)
+    assert stats["parse_seconds_saved"] == stats["parse_seconds"] > 0
+    assert FEED_FETCH_BYTES_SAVED.labels().value == saved + len(RSS)
+    db.close()
+
+
+def _parsed_entries(urls):
+    return extract_entries(feedparser.FeedParserDict({
+        "bozo": False,
+        "entries": [
+            feedparser.FeedParserDict({"link": url, "title": url, "summary": "<p>x</p>"})
+            for url in urls
+        ],
+    }))
+
+
+def _make_feed(db):
+    feed = Feed(name="Test", url="https://example.com/feed.xml")
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
+    return feed
+
+
+def test_store_entries_issues_batched_statements(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db)
+    counts = {}
+
+    for size in (5, 200):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        urls = [f"https://example.com/{size}/post{i}" for i in range(size)]
+        event.listen(test_engine, "before_cursor_execute", record)
+        try:
+            assert store_entries(feed.id, feed.url, _parsed_entries(urls), db) == size
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record)
+        counts[size] = len(statements)
+
+    # Lookup, content dictionary, batched INSERTs of articles and bodies
+    # (split only at SQLite's parameter limit), then feed read,
+    # publish-history read and stamp
+    assert counts[5] == 7
+    assert counts[200] <= 10
+    assert db.query(Article).count() == 205
+    db.close()
+
+
+def test_store_entries_counts_only_new_rows(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db)
+    first = ["https://example.com/a", "https://example.com/b"]
+    assert store_entries(feed.id, feed.url, _parsed_entries(first), db) == 2
+
+    # One known URL, one new URL repeated within the same document
+    second = ["https://example.com/b", "https://example.com/c", "https://example.com/c"]
+    assert store_entries(feed.id, feed.url, _parsed_entries(second), db) == 1
+
+    articles = db.query(Article).order_by(Article.id).all()
+    assert [a.url for a in articles] == first + ["https://example.com/c"]
+    assert all(a.is_read is False and a.sort_key is not None for a in articles)
+    db.close()
+
+
+def test_store_entries_safe_against_concurrent_insert(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db)
+    urls = ["https://example.com/raced", "https://example.com/fresh"]
+
+    # Another fetch stores "raced" between our lookup and our insert
+    other = TestingSessionLocal()
+    other.add(Article(feed_id=feed.id, title="raced", url=urls[0]))
+    other.commit()
+    other.close()
+
+    with patch("src.utils.fetcher._existing_urls", return_value=set()):
+        assert store_entries(feed.id, feed.url, _parsed_entries(urls), db) == 1
+
+    assert db.query(Article).count() == 2
+    db.close()
+
+
+def test_parse_feed_bytes_returns_compact_entries():
+    body = (
+        b'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>'
+        b'<item><title>One</title><link>https://example.com/1</link>'
+        b'<description>&lt;p&gt;Hello&lt;/p&gt;</description>'
+        b'<pubDate>Sat, 17 Oct 2026 08:00:00 GMT</pubDate></item>'
+        b'<item><title>No link</title></item>'
+        b'</channel></rss>'
+    )
+    entries, error, seconds = parse_feed_bytes(body, {"content-type": "application/rss+xml"})
+
+    assert error is None
+    assert seconds >= 0
+    assert len(entries) == 1
+    entry = entries[0]
+    assert (entry.title, entry.url, entry.excerpt) == ("One", "https://example.com/1", "Hello")
+    assert entry.published_at == datetime(2026, 10, 17, 8, 0, tzinfo=timezone.utc)
+
+
+def test_parse_feed_bytes_reports_unparseable_document():
+    entries, error, _ = parse_feed_bytes(b"<html><body>not a feed", {})
+    assert entries == []
+    assert error
+
+
+def test_store_entries_learns_interval_from_cadence(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db)
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    # A daily newsletter: ten issues, one per day
+    entries = [
+        ParsedEntry(f"Issue {i}", f"https://example.com/issue{i}", None, None, None, None,
+                    None, start + timedelta(days=i))
+        for i in range(10)
+    ]
+    store_entries(feed.id, feed.url, entries, db)
+
+    db.refresh(feed)
+    assert feed.effective_interval == 43200  # half the daily gap
+    assert feed.unchanged_streak == 0
+    assert feed.next_fetch_at == feed.last_fetched + timedelta(seconds=43200)
+
+    # Nothing new on the next fetch: back off, but stay within the ceiling
+    store_entries(feed.id, feed.url, entries, db)
+    db.refresh(feed)
+    assert feed.unchanged_streak == 1
+    assert feed.effective_interval == 64800
+    db.close()
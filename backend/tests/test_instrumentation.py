@@ -0,0 +1,98 @@
+"""Tests for per-request SQL instrumentation."""
+
+import json
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.config import Settings
+from src.database import create_db_engine
+from src.main import JSONFormatter
+from src.models.feed import Feed
+from src.utils import instrumentation
+from src.utils.instrumentation import parameter_shape
+
+LOGGER = "src.utils.instrumentation"
+
+
+def test_parameter_shape_reports_types_not_values():
+    assert parameter_shape(("a", "b", 3, None)) == ["str*2", "int", "NoneType"]
+    assert parameter_shape({"id": 1, "title": "secret"}) == {"id": "int", "title": "str"}
+    assert parameter_shape([("a", 1), ("b", 2)], executemany=True) == {
+        "rows": 2, "row": ["str", "int"],
+    }
+    assert parameter_shape((), executemany=False) == []
+
+
+def test_failed_statements_leave_no_timing_state(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/errors.db", Settings())
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert not conn.info.get("query_started")
+    engine.dispose()
+
+
+def test_timing_headers_are_off_by_default(client):
+    response = client.get("/api/articles/")
+    assert "x-db-queries" not in response.headers
+    assert "server-timing" not in response.headers
+
+
+def test_timing_headers_report_query_count(client, monkeypatch):
+    monkeypatch.setattr(instrumentation.settings, "db_timing_headers", True)
+
+    response = client.get("/api/feeds/")
+
+    assert int(response.headers["x-db-queries"]) >= 1
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert f'desc="{response.headers["x-db-queries"]} queries"' in server_timing
+    assert "app;dur=" in server_timing
+
+
+def test_request_log_line_carries_query_totals(client, caplog):
+    with caplog.at_level(logging.INFO, logger=LOGGER):
+        client.get("/api/feeds/")
+        client.get("/health")
+
+    records = [r for r in caplog.records if r.name == LOGGER]
+    assert len(records) == 1  # probes are not logged
+    record = records[0]
+    assert record.getMessage() == "GET /api/feeds/ 200"
+    assert record.route == "/api/feeds/"
+    assert record.db_queries >= 1
+    assert record.db_ms >= 0
+
+    line = json.loads(JSONFormatter().format(record))
+    assert line["db_queries"] == record.db_queries
+    assert line["status"] == 200
+    assert line["message"] == "GET /api/feeds/ 200"
+
+
+def test_slow_queries_are_logged_with_parameter_shapes(client, db_session, caplog, monkeypatch):
+    db_session.add(Feed(name="Slow", url="https://slow.example.com/rss"))
+    db_session.commit()
+    monkeypatch.setattr(instrumentation.settings, "slow_query_ms", 1e-6)
+
+    with caplog.at_level(logging.WARNING, logger=LOGGER):
+        client.get("/api/feeds/1")
+
+    slow = [r for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert slow
+    record = slow[0]
+    assert record.statement.startswith("SELECT")
+    assert "feeds" in record.statement
+    assert record.parameters == ["int"]
+    assert record.request_path == "/api/feeds/1"
+    assert "slow.example.com" not in json.dumps(JSONFormatter().format(record))
+
+
+@pytest.mark.parametrize("threshold", [0, 10_000])
+def test_fast_or_disabled_threshold_logs_nothing(client, caplog, monkeypatch, threshold):
+    monkeypatch.setattr(instrumentation.settings, "slow_query_ms", threshold)
+    with caplog.at_level(logging.WARNING, logger=LOGGER):
+        client.get("/api/feeds/")
+    assert not [r for r in caplog.records if r.getMessage().startswith("Slow query")]
@@ -56,3 +56,14 @@ def test_app_title_and_version():
     assert app.title == "Krepsys API"
     assert app.version == "0.1.0"
     assert "newsletter reader" in app.description.lower()
+
+
+def test_api_routes_are_async():
+    """Test API routes run on the event loop rather than the threadpool."""
+    import inspect
+    from src.main import app
+
+    api_routes = [r for r in app.routes if getattr(r, "path", "").startswith("/api/")]
+    assert api_routes
+    for route in api_routes:
+        assert inspect.iscoroutinefunction(route.endpoint), route.path
@@ -0,0 +1,124 @@
+"""Tests for the metrics registry and the /metrics endpoint."""
+
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from src.models.feed import Feed
+from src.utils.fetch_engine import FetchEngine
+from src.utils.metrics import Counter, Gauge, Histogram, Registry
+from tests.conftest import TestingSessionLocal
+
+
+def _sample(text, name, **labels):
+    """Value of one sample in exposition text, or 0 if absent."""
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    pattern = "^" + re.escape(name + (f"{{{wanted}}}" if labels else "")) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_registry_renders_text_exposition():
+    registry = Registry()
+    requests = Counter("demo_total", "Demo counter.", ("path",), registry=registry)
+    depth = Gauge("demo_depth", "Demo gauge.", registry=registry)
+    latency = Histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0), registry=registry)
+
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    depth.set(7)
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{path="/a\\"b"} 3.0' in text
+    assert "demo_depth 7.0" in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_seconds_count 3" in text
+    assert "demo_seconds_sum 5.55" in text
+
+
+def test_labels_must_match_label_names():
+    counter = Counter("demo_checked_total", "Demo.", ("a", "b"), registry=Registry())
+    with pytest.raises(ValueError):
+        counter.labels("only-one")
+
+
+def test_metrics_endpoint_records_route_latency_and_queries(client):
+    labels = {"method": "GET", "route": "/api/articles/{article_id}"}
+    before = client.get("/metrics").text
+
+    assert client.get("/api/articles/12345").status_code == 404
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    name = "krepsys_http_request_duration_seconds_count"
+    assert _sample(text, name, **labels) == _sample(before, name, **labels) + 1
+    requests = "krepsys_http_requests_total"
+    assert _sample(text, requests, **labels, status=404) > _sample(before, requests, **labels, status=404)
+    queries = "krepsys_http_request_db_queries_sum"
+    assert _sample(text, queries, **labels) >= _sample(before, queries, **labels) + 1
+
+
+def test_unmatched_paths_share_one_label(client):
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+    text = client.get("/metrics").text
+    assert 'route="unmatched"' in text
+    assert "/no/such/path" not in text
+
+
+def test_scheduler_lag_reports_oldest_due_feed(client, db_session):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db_session.add_all([
+        Feed(name="Overdue", url="https://a.example.com/rss", next_fetch_at=now - timedelta(hours=2)),
+        Feed(name="Paused", url="https://b.example.com/rss", is_active=False,
+             next_fetch_at=now - timedelta(days=5)),
+        Feed(name="Later", url="https://c.example.com/rss", next_fetch_at=now + timedelta(hours=1)),
+    ])
+    db_session.commit()
+
+    lag = _sample(client.get("/metrics").text, "krepsys_scheduler_lag_seconds")
+    assert 7200 <= lag < 7300
+
+
+def test_threadpool_gauges_are_exported(client):
+    text = client.get("/metrics").text
+    assert 'krepsys_threadpool_in_use{pool="anyio"}' in text
+    assert 'krepsys_threadpool_queue_depth{pool="executor"}' in text
+
+
+def test_fetch_engine_records_fetch_and_ingest_metrics(client, db_session):
+    feed = Feed(name="Metrics", url="https://metrics.example.com/rss")
+    db_session.add(feed)
+    db_session.commit()
+    body = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>M</title>'
+        "<item><title>One</title><link>https://metrics.example.com/1</link></item>"
+        "<item><title>Two</title><link>https://metrics.example.com/2</link></item>"
+        "</channel></rss>"
+    ).encode()
+    engine = FetchEngine(
+        session_factory=TestingSessionLocal,
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)),
+    )
+    before = client.get("/metrics").text
+
+    asyncio.run(engine.fetch_all([(feed.id, feed.url)]))
+
+    after = client.get("/metrics").text
+    for name, delta in [
+        ("krepsys_ingested_articles_total", 2),
+        ("krepsys_feed_fetch_duration_seconds_count", 1),
+        ("krepsys_feed_fetch_bytes_sum", len(body)),
+        ("krepsys_feed_fetch_entries_sum", 2),
+    ]:
+        assert _sample(after, name) - _sample(before, name) == delta, name
+    ok = "krepsys_feed_fetches_total"
+    assert _sample(after, ok, outcome="ok") - _sample(before, ok, outcome="ok") == 1
@@ -0,0 +1,167 @@
+"""Tests for the versioned schema migration runner."""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from src.migrations import (
+    LATEST_VERSION, MIGRATIONS, add_column, backfill, current_version, migrate, status,
+)
+
+# The schema as the first release created it, before any migration existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE feeds (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+    "url VARCHAR NOT NULL UNIQUE, fetch_interval INTEGER, last_fetched DATETIME, "
+    "is_active BOOLEAN, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE TABLE articles (id INTEGER PRIMARY KEY, feed_id INTEGER NOT NULL REFERENCES feeds(id), "
+    "title VARCHAR NOT NULL, url VARCHAR NOT NULL UNIQUE, author VARCHAR, content TEXT, "
+    "content_text TEXT, note TEXT, published_at DATETIME, "
+    "fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP, is_read BOOLEAN, is_saved BOOLEAN, "
+    "is_archived BOOLEAN)",
+    "CREATE TABLE tags (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, "
+    "created_at DATETIME DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE TABLE article_tags (article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE, "
+    "tag_id INTEGER REFERENCES tags(id) ON DELETE CASCADE, PRIMARY KEY (article_id, tag_id))",
+    "CREATE TABLE highlights (id INTEGER PRIMARY KEY, article_id INTEGER NOT NULL "
+    "REFERENCES articles(id) ON DELETE CASCADE, text TEXT NOT NULL, color VARCHAR NOT NULL, "
+    "note TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _legacy(engine, articles=3):
+    with engine.begin() as conn:
+        for stmt in LEGACY_SCHEMA:
+            conn.execute(text(stmt))
+        conn.execute(text(
+            "INSERT INTO feeds (id, name, url, fetch_interval, last_fetched, is_active) "
+            "VALUES (1, 'Old', 'https://old.example.com/rss', 900, '2026-01-01 00:00:00', 1)"
+        ))
+        for i in range(1, articles + 1):
+            conn.execute(text(
+                "INSERT INTO articles (id, feed_id, title, url, content_text, published_at, "
+                "fetched_at, is_read, is_saved, is_archived) VALUES (:id, 1, 'Sourdough ' || :id, "
+                "'https://old.example.com/' || :id, 'starter', :published, '2026-02-01 00:00:00', "
+                ":read, 0, 0)"
+            ), {"id": i, "published": None if i % 2 else "2026-01-15 00:00:00", "read": i == 1})
+
+
+def _names(conn, kind):
+    return {row[0] for row in conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = :kind"), {"kind": kind}
+    )}
+
+
+def test_versions_are_sequential():
+    assert [m.version for m in MIGRATIONS] == list(range(1, LATEST_VERSION + 1))
+
+
+def test_empty_database_is_created_and_stamped(engine):
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+
+    with engine.connect() as conn:
+        assert current_version(conn) == LATEST_VERSION
+        assert {"feeds", "articles", "articles_fts", "schema_version"} <= _names(conn, "table")
+        assert "articles_counts_ai" in _names(conn, "trigger")
+        assert "ix_articles_sort" in _names(conn, "index")
+
+
+def test_up_to_date_database_costs_one_query(engine):
+    migrate(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+
+    assert migrate(engine) == []
+    assert statements == ["SELECT max(version) FROM schema_version"]
+
+
+def test_legacy_database_is_upgraded_in_place(engine):
+    _legacy(engine, articles=7)
+    with engine.connect() as conn:
+        assert current_version(conn) == 0
+
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+
+    with engine.connect() as conn:
+        assert current_version(conn) == LATEST_VERSION
+        assert conn.execute(text("SELECT count(*) FROM articles WHERE sort_key IS NULL")).scalar() == 0
+        assert conn.execute(text(
+            "SELECT sort_key FROM articles WHERE id = 2"
+        )).scalar() == "2026-01-15 00:00:00"
+        assert conn.execute(text("SELECT next_fetch_at FROM feeds")).scalar() == "2026-01-01 00:15:00"
+        assert conn.execute(text("SELECT unread_count FROM feeds")).scalar() == 6
+        assert conn.execute(text(
+            "SELECT count(*) FROM articles_fts WHERE articles_fts MATCH 'sourdough'"
+        )).scalar() == 7
+        # Bodies moved to the side table, still searchable
+        assert conn.execute(text(
+            "SELECT count(*) FROM article_bodies WHERE content_text = 'starter'"
+        )).scalar() == 7
+        assert conn.execute(text(
+            "SELECT count(*) FROM articles WHERE content_text IS NOT NULL"
+        )).scalar() == 0
+        assert conn.execute(text(
+            "SELECT count(*) FROM articles_fts WHERE articles_fts MATCH 'starter'"
+        )).scalar() == 7
+        assert {"ix_articles_feed_inbox", "ix_feeds_due"} <= _names(conn, "index")
+
+
+def test_only_pending_steps_run(engine):
+    _legacy(engine)
+    migrate(engine)
+    counters = next(m.version for m in MIGRATIONS if m.description == "feed counter triggers")
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM schema_version WHERE version >= {counters}"))
+        conn.execute(text("DROP TRIGGER articles_counts_ai"))
+
+    assert migrate(engine) == list(range(counters, LATEST_VERSION + 1))
+    with engine.connect() as conn:
+        assert "articles_counts_ai" in _names(conn, "trigger")
+
+
+def test_failed_step_is_not_recorded(engine):
+    _legacy(engine)
+    failing = MIGRATIONS[2]
+
+    def boom(conn):
+        raise RuntimeError("disk full")
+
+    MIGRATIONS[2] = failing._replace(apply=boom)
+    try:
+        with pytest.raises(RuntimeError):
+            migrate(engine)
+    finally:
+        MIGRATIONS[2] = failing
+    with engine.connect() as conn:
+        assert current_version(conn) == failing.version - 1
+
+    assert migrate(engine)[0] == failing.version
+
+
+def test_backfill_commits_in_batches_and_resumes(engine):
+    _legacy(engine, articles=10)
+    with engine.connect() as conn:
+        add_column(conn, "articles", "sort_key", "DATETIME")
+        assert not add_column(conn, "articles", "sort_key", "DATETIME")
+        commits = []
+        event.listen(conn, "commit", lambda c: commits.append(1))
+
+        where = "sort_key IS NULL"
+        assert backfill(conn, "articles", "sort_key = fetched_at", where, batch_size=3) == 10
+        assert len(commits) == 5  # the DDL, then four batches
+        assert backfill(conn, "articles", "sort_key = fetched_at", where, batch_size=3) == 0
+
+
+def test_status_lists_pending_steps(engine):
+    assert status(engine)["current"] is None
+    _legacy(engine)
+    info = status(engine)
+    assert info["current"] == 0
+    assert len(info["pending"]) == LATEST_VERSION
+    migrate(engine)
+    assert status(engine)["pending"] == []
@@ -0,0 +1,111 @@
+"""Tests for the body recompression job."""
+
+from datetime import timedelta
+from sqlalchemy import text
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.content_dictionary import ContentDictionary
+from src.models.feed import Feed
+from src.utils.recompress import format_report, recompress, recompress_articles
+from tests.conftest import TestingSessionLocal
+
+TEMPLATE = (
+    '<article><nav class="crumbs"><a href="https://blog.example.com/">Home</a></nav>'
+    "<p>{body}</p><aside>Comments are closed. Follow the blog for new posts every "
+    "week, and see the archive for everything published so far.</aside></article>"
+)
+
+
+def _insert_post(db, feed_id, url, content, sort_key="2026-01-01"):
+    article_id = db.execute(text(
+        "INSERT INTO articles (feed_id, title, url, sort_key) "
+        "VALUES (:feed, :url, :url, :sort_key) RETURNING id"
+    ), {"feed": feed_id, "url": url, "sort_key": sort_key}).scalar()
+    db.execute(text(
+        "INSERT INTO article_bodies (article_id, content) VALUES (:id, :content)"
+    ), {"id": article_id, "content": content})
+
+
+def _insert_posts(db, feed_id, numbers, template=TEMPLATE, sort_key="2026-01-01"):
+    for i in numbers:
+        _insert_post(db, feed_id, f"https://e.com/{i}",
+                     template.format(body=f"Post number {i} about item {i * 3}."), sort_key)
+
+
+def _seed_legacy(db, count):
+    """Articles as stored before compression: raw HTML text."""
+    feed = Feed(name="Feed", url="https://blog.example.com/rss")
+    db.add(feed)
+    db.commit()
+    _insert_posts(db, feed.id, range(count))
+    _insert_post(db, feed.id, "https://e.com/tiny", "<p>ok</p>")
+    db.commit()
+    return feed.id
+
+
+def _typeof(db):
+    return dict(db.execute(text(
+        "SELECT typeof(content), count(*) FROM article_bodies GROUP BY 1"
+    )).all())
+
+
+def test_recompress_rewrites_legacy_rows_and_is_idempotent(setup_database):
+    db = TestingSessionLocal()
+    _seed_legacy(db, 5)
+    originals = {a.url: a.content for a in db.query(Article)}
+    db.close()
+
+    assert recompress_articles(TestingSessionLocal, batch_size=2, pause=0) == 5
+    assert recompress_articles(TestingSessionLocal, batch_size=2, pause=0) == 0
+
+    db = TestingSessionLocal()
+    assert _typeof(db) == {"blob": 5, "text": 1}  # the tiny body would not shrink
+    assert {a.url: a.content for a in db.query(Article)} == originals
+    db.close()
+
+
+def test_recompress_trains_dictionaries_and_reports_sizes(setup_database):
+    db = TestingSessionLocal()
+    feed_id = _seed_legacy(db, 40)
+    db.close()
+
+    report = recompress(TestingSessionLocal, train=True, pause=0)
+
+    assert report["trained"] == 1
+    assert report["rewritten"] == 40
+    before, after = report["before"], report["after"]
+    assert before["bodies"] == after["bodies"] == 41
+    assert (before["compressed"], after["compressed"]) == (0, 40)
+    assert after["content_bytes"] + after["dictionary_bytes"] < before["content_bytes"]
+    assert "Body storage" in format_report(report)
+
+    db = TestingSessionLocal()
+    dictionary = db.query(ContentDictionary).one()
+    first_id = dictionary.id
+    assert dictionary.feed_id == feed_id
+    assert db.query(ArticleBody).filter(
+        ArticleBody.content_dictionary_id == dictionary.id
+    ).count() == 40
+    assert db.query(Article).filter(Article.url == "https://e.com/7").one().content == \
+        TEMPLATE.format(body="Post number 7 about item 21.")
+    db.close()
+
+    # Retraining on unchanged bodies learns nothing new
+    report = recompress(TestingSessionLocal, train=True, pause=0)
+    assert (report["trained"], report["rewritten"], report["pruned"]) == (0, 0, 0)
+
+    # After a redesign the new dictionary supersedes the old. Ingest may still
+    # be writing bodies compressed with the old one, so it is kept for a grace
+    # period, then pruned once no body uses it
+    db = TestingSessionLocal()
+    redesign = TEMPLATE.replace("Comments are closed.", "Replies go to the mailbag.")
+    _insert_posts(db, feed_id, range(40, 240), redesign, sort_key="2026-02-01")
+    db.commit()
+    db.close()
+    report = recompress(TestingSessionLocal, train=True, pause=0)
+    assert (report["trained"], report["rewritten"], report["pruned"]) == (1, 240, 0)
+    report = recompress(TestingSessionLocal, pause=0, prune_grace=timedelta(0))
+    assert (report["rewritten"], report["pruned"]) == (0, 1)
+    db = TestingSessionLocal()
+    assert db.query(ContentDictionary).one().id != first_id
+    db.close()
@@ -0,0 +1,229 @@
+"""Tests for retention policies and the purge job."""
+
+from datetime import datetime
+import feedparser
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from src.config import Settings
+from src.database import Base, create_db_engine
+from src.models.article import Article
+from src.models.feed import Feed
+from src.models.highlight import Highlight
+from src.models.purged_url import PurgedUrl
+from src.models.tag import Tag
+from src.utils.fetcher import extract_entries, store_entries
+from src.utils.retention import Policy, incremental_vacuum, full_vacuum, purge, purge_feed
+from tests.conftest import TestingSessionLocal
+
+OLD, NEW = datetime(2020, 1, 1), datetime(2099, 1, 1)
+
+
+def _feed(db, name, **fields):
+    feed = Feed(name=name, url=f"https://{name}.example.com/rss", **fields)
+    db.add(feed)
+    db.commit()
+    return feed
+
+
+def _article(db, feed, slug, sort_key=OLD, fetched_at=OLD, **fields):
+    article = Article(feed_id=feed.id, title=slug, url=f"https://e.com/{slug}", sort_key=sort_key,
+                      fetched_at=fetched_at, content=f"<p>{slug} body</p>",
+                      content_text=f"{slug} body", **fields)
+    db.add(article)
+    db.commit()
+    return article
+
+
+def _urls(db):
+    return {url.rsplit("/", 1)[1] for url in db.scalars(text("SELECT url FROM articles"))}
+
+
+def _count(db, sql):
+    return db.execute(text(sql)).scalar()
+
+
+def test_age_policy_purges_only_articles_the_reader_let_go(setup_database):
+    db = TestingSessionLocal()
+    feed = _feed(db, "feed")
+    for i in range(3):
+        _article(db, feed, f"read{i}", is_read=True)
+    _article(db, feed, "unread")
+    _article(db, feed, "recent", fetched_at=NEW, is_read=True)
+    _article(db, feed, "saved", is_read=True, is_saved=True)
+    _article(db, feed, "noted", is_read=True, note="keep this")
+    highlighted = _article(db, feed, "highlighted", is_read=True)
+    db.add(Highlight(article_id=highlighted.id, text="a line"))
+    tagged = _article(db, feed, "tagged", is_read=True)
+    tagged.tags.append(Tag(name="later"))
+    db.commit()
+    db.close()
+
+    report = purge(TestingSessionLocal, Settings(retention_days=30), batch_size=2, pause=0)
+
+    db = TestingSessionLocal()
+    assert sum(report["deleted"].values()) == 4
+    assert _urls(db) == {"unread", "recent", "saved", "noted", "highlighted"}
+    # Tag links, bodies and the search index go with the articles
+    assert _count(db, "SELECT count(*) FROM article_tags") == 0
+    assert _count(db, "SELECT count(*) FROM article_bodies") == 5
+    assert _count(db, "SELECT count(*) FROM articles_fts WHERE articles_fts MATCH 'read0'") == 0
+    assert _count(db, "SELECT unread_count FROM feeds") == 1
+    db.close()
+
+
+def test_age_policy_counts_from_fetch_not_publication(setup_database):
+    # A newly subscribed feed's archive: published years ago, read today
+    db = TestingSessionLocal()
+    feed = _feed(db, "archive")
+    for i in range(3):
+        _article(db, feed, f"back{i}", sort_key=OLD, fetched_at=datetime.now(), is_read=True)
+    _article(db, feed, "stale", sort_key=NEW, is_read=True)
+    db.close()
+
+    report = purge(TestingSessionLocal, Settings(retention_days=30), pause=0)
+
+    db = TestingSessionLocal()
+    assert sum(report["deleted"].values()) == 1
+    assert _urls(db) == {"back0", "back1", "back2"}
+    db.close()
+
+
+def test_keep_policy_with_feed_overrides(setup_database):
+    db = TestingSessionLocal()
+    capped = _feed(db, "capped", retention_keep=2)
+    exempt = _feed(db, "exempt", retention_keep=0)
+    default = _feed(db, "default")
+    for feed in (capped, exempt, default):
+        for i in range(4):
+            _article(db, feed, f"{feed.name}{i}", sort_key=datetime(2026, 1, i + 1))
+    _article(db, capped, "capped-saved", sort_key=datetime(2025, 12, 1), is_saved=True)
+    capped_id = capped.id
+    db.close()
+
+    settings = Settings(retention_keep_per_feed=3)
+    assert purge_feed(TestingSessionLocal, capped_id, Policy(0, 2), dry_run=True) == 2
+    report = purge(TestingSessionLocal, settings, batch_size=1, pause=0)
+
+    db = TestingSessionLocal()
+    assert sum(report["deleted"].values()) == 3
+    assert _urls(db) == {
+        "capped2", "capped3", "capped-saved",
+        "exempt0", "exempt1", "exempt2", "exempt3",
+        "default1", "default2", "default3",
+    }
+    db.close()
+
+    # A second pass finds nothing left to do
+    assert purge(TestingSessionLocal, settings, pause=0)["deleted"] == {}
+
+
+def _document(numbers):
+    return extract_entries(feedparser.FeedParserDict({"bozo": False, "entries": [
+        feedparser.FeedParserDict({
+            "link": f"https://e.com/post{i}", "title": f"Post {i}",
+            "published_parsed": (2026, 1, i + 1, 0, 0, 0, 0, 0, 0),
+        })
+        for i in numbers
+    ]}))
+
+
+def test_purged_articles_are_not_ingested_again(client, setup_database):
+    db = TestingSessionLocal()
+    feed = _feed(db, "feed", retention_keep=2)
+    feed_id, feed_url = feed.id, feed.url
+    assert store_entries(feed_id, feed_url, _document(range(5)), db) == 5
+    db.close()
+
+    assert purge(TestingSessionLocal, Settings(), pause=0)["deleted"] == {feed_id: 3}
+
+    # The feed still lists the purged items next to one new one
+    db = TestingSessionLocal()
+    assert store_entries(feed_id, feed_url, _document(range(6)), db) == 1
+    assert _urls(db) == {"post3", "post4", "post5"}
+    assert _count(db, "SELECT unread_count FROM feeds") == 3
+    db.close()
+
+    # Deleting the feed drops its tombstones, so re-adding it starts afresh
+    assert client.delete(f"/api/feeds/{feed_id}").status_code == 204
+    db = TestingSessionLocal()
+    assert _count(db, "SELECT count(*) FROM purged_urls") == 0
+    db.close()
+
+
+def test_old_tombstones_expire(setup_database):
+    db = TestingSessionLocal()
+    feed = _feed(db, "feed")
+    db.add_all([
+        PurgedUrl(url="https://e.com/gone", feed_id=feed.id, purged_at=OLD),
+        PurgedUrl(url="https://e.com/listed", feed_id=feed.id, purged_at=datetime.now()),
+    ])
+    db.commit()
+    db.close()
+
+    assert purge(TestingSessionLocal, Settings(retention_tombstone_days=0), pause=0)["expired"] == 0
+    report = purge(TestingSessionLocal, Settings(), batch_size=1, pause=0)
+
+    db = TestingSessionLocal()
+    assert report["expired"] == 1
+    assert db.scalars(text("SELECT url FROM purged_urls")).all() == ["https://e.com/listed"]
+    db.close()
+
+
+def test_feed_retention_overrides_via_api(client):
+    response = client.post("/api/feeds/", json={
+        "name": "Feed", "url": "https://feed.example.com/rss", "retention_keep": 50,
+    })
+    assert response.status_code == 201
+    feed = response.json()
+    assert (feed["retention_days"], feed["retention_keep"]) == (None, 50)
+
+    response = client.patch(f"/api/feeds/{feed['id']}", json={"retention_days": 0})
+    assert response.json()["retention_days"] == 0
+    assert client.patch(f"/api/feeds/{feed['id']}", json={"retention_days": -1}).status_code == 422
+
+
+def _seeded_engine(path, settings):
+    engine = create_db_engine(f"sqlite:///{path}", settings)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    feed = _feed(db, "big")
+    for i in range(200):
+        db.add(Article(feed_id=feed.id, title=str(i), url=f"https://e.com/{i}", sort_key=OLD,
+                       fetched_at=OLD, is_read=True, content_text=f"{i} " + "filler text " * 400))
+    db.commit()
+    db.close()
+    return engine, factory
+
+
+def _pages(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA page_count").scalar()
+
+
+def test_purge_returns_space_with_incremental_vacuum(tmp_path):
+    engine, factory = _seeded_engine(tmp_path / "incremental.db", Settings())
+    before = _pages(engine)
+
+    report = purge(factory, Settings(retention_days=1), pause=0)
+
+    assert sum(report["deleted"].values()) == 200
+    assert report["freed"] > 0
+    assert _pages(engine) < before // 2  # the bodies were most of the file
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA freelist_count").scalar() == 0
+    engine.dispose()
+
+
+def test_full_vacuum_converts_older_files(tmp_path):
+    path = tmp_path / "legacy.db"
+    engine, factory = _seeded_engine(path, Settings(sqlite_auto_vacuum="NONE"))
+    assert purge(factory, Settings(retention_days=1), pause=0)["freed"] is None
+    engine.dispose()
+
+    # Connections now ask for incremental mode; VACUUM applies it
+    engine = create_db_engine(f"sqlite:///{path}", Settings())
+    factory = sessionmaker(bind=engine)
+    full_vacuum(factory)
+    assert incremental_vacuum(factory, pause=0) == 0
+    engine.dispose()
@@ -1,42 +1,170 @@
 """Tests for background scheduler logic."""
 
+import asyncio
+import threading
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import event
 from src.models.feed import Feed
-from src.utils.scheduler import _is_feed_due
+from src.utils import scheduler
+from src.utils.scheduler import _claim_due_feeds, _next_due_at, _seconds_until, MAX_SLEEP
+from tests.conftest import TestingSessionLocal, test_engine
 
 
-def _make_feed(last_fetched=None, fetch_interval=900):
-    feed = Feed(name="Test", url="https://example.com/feed.xml")
-    feed.fetch_interval = fetch_interval
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _make_feed(db, last_fetched=None, fetch_interval=900, is_active=True, url=None):
+    feed = Feed(
+        name="Test",
+        url=url or f"https://example.com/feed{db.query(Feed).count()}.xml",
+        fetch_interval=fetch_interval,
+        is_active=is_active,
+    )
     feed.last_fetched = last_fetched
+    if last_fetched is not None:
+        feed.next_fetch_at = last_fetched + timedelta(seconds=fetch_interval)
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
     return feed
 
 
-def test_is_feed_due_never_fetched():
-    feed = _make_feed(last_fetched=None)
-    assert _is_feed_due(feed) is True
+def _claimed_ids(db, now=None):
+    return [target.id for target in _claim_due_feeds(db, now or _now())]
+
+
+def test_claim_never_fetched_feed(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db, last_fetched=None)
+    assert _claimed_ids(db) == [feed.id]
+    db.close()
 
 
-def test_is_feed_due_recently_fetched():
-    feed = _make_feed(last_fetched=datetime.now(timezone.utc), fetch_interval=900)
-    assert _is_feed_due(feed) is False
+def test_claim_skips_recently_fetched_feed(setup_database):
+    db = TestingSessionLocal()
+    _make_feed(db, last_fetched=_now(), fetch_interval=900)
+    assert _claimed_ids(db) == []
+    db.close()
 
 
-def test_is_feed_due_overdue():
-    overdue = datetime.now(timezone.utc) - timedelta(seconds=1800)
-    feed = _make_feed(last_fetched=overdue, fetch_interval=900)
-    assert _is_feed_due(feed) is True
+def test_claim_overdue_feed(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db, last_fetched=_now() - timedelta(seconds=1800), fetch_interval=900)
+    assert _claimed_ids(db) == [feed.id]
+    db.close()
 
 
-def test_is_feed_due_exactly_at_interval():
+def test_claim_exactly_at_interval(setup_database):
     # At exactly fetch_interval seconds ago, it's due
-    due = datetime.now(timezone.utc) - timedelta(seconds=900)
-    feed = _make_feed(last_fetched=due, fetch_interval=900)
-    assert _is_feed_due(feed) is True
+    db = TestingSessionLocal()
+    now = _now()
+    feed = _make_feed(db, last_fetched=now - timedelta(seconds=900), fetch_interval=900)
+    assert _claimed_ids(db, now) == [feed.id]
+    db.close()
+
+
+def test_claim_skips_inactive_feed(setup_database):
+    db = TestingSessionLocal()
+    _make_feed(db, last_fetched=None, is_active=False)
+    assert _claimed_ids(db) == []
+    db.close()
+
+
+def test_claim_leases_feed_until_next_interval(setup_database):
+    db = TestingSessionLocal()
+    feed = _make_feed(db, last_fetched=None, fetch_interval=600)
+    now = _now()
+
+    assert _claimed_ids(db, now) == [feed.id]
+    # A failed fetch never reschedules, so the lease alone must keep it idle
+    assert _claimed_ids(db, now + timedelta(seconds=599)) == []
+    db.refresh(feed)
+    assert feed.next_fetch_at == now + timedelta(seconds=600)
+    db.close()
+
+
+def test_claim_uses_due_index(setup_database):
+    db = TestingSessionLocal()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM feeds" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(test_engine, "before_cursor_execute", record)
+    try:
+        _claim_due_feeds(db, _now())
+    finally:
+        event.remove(test_engine, "before_cursor_execute", record)
+
+    statement, parameters = statements[0]
+    plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    assert "ix_feeds_due" in " ".join(row[-1] for row in plan)
+    db.close()
+
+
+def test_next_due_at_and_sleep_delay(setup_database):
+    db = TestingSessionLocal()
+    now = _now()
+    assert _next_due_at(db) is None
+    assert _seconds_until(None, now) == MAX_SLEEP
+
+    _make_feed(db, last_fetched=now - timedelta(seconds=500), fetch_interval=900)
+    _make_feed(db, last_fetched=now, fetch_interval=900)
+    _make_feed(db, last_fetched=now - timedelta(seconds=890), fetch_interval=900, is_active=False)
+
+    due_at = _next_due_at(db)
+    assert due_at == now + timedelta(seconds=400)
+    assert _seconds_until(due_at, now) == 400
+    assert _seconds_until(now - timedelta(seconds=5), now) == 0
+    db.close()
+
+
+def test_run_scheduler_wakes_on_feed_change(setup_database):
+    """Test a sleeping scheduler fetches a new feed as soon as it is notified."""
+    engine = AsyncMock()
+    engine.fetch_all.return_value = {}
+    engine.close = lambda: None
+    claim_threads = set()
+
+    def claim(db, now):
+        claim_threads.add(threading.get_ident())
+        return _claim_due_feeds(db, now)
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run_scheduler())
+        await asyncio.sleep(0.05)
+        engine.fetch_all.assert_not_called()  # no feeds: idle until MAX_SLEEP
+
+        db = TestingSessionLocal()
+        feed = _make_feed(db, last_fetched=None)
+        db.close()
+        scheduler.notify_feeds_changed()
+
+        for _ in range(50):
+            if engine.fetch_all.called:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return feed.id
+
+    with patch.object(scheduler, "SessionLocal", TestingSessionLocal), \
+            patch.object(scheduler, "_build_engine", return_value=engine), \
+            patch.object(scheduler, "_claim_due_feeds", claim):
+        feed_id = asyncio.run(scenario())
+
+    (targets,), _ = engine.fetch_all.call_args
+    assert [t.id for t in targets] == [feed_id]
+    assert scheduler._loop is None
+    # The claim's write ran in worker threads, never on the event loop's
+    assert claim_threads and threading.get_ident() not in claim_threads
 
 
-def test_is_feed_due_naive_datetime():
-    # DB may return naive datetime — should still work
-    naive = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1800)
-    feed = _make_feed(last_fetched=naive, fetch_interval=900)
-    assert _is_feed_due(feed) is True
+def test_notify_without_running_scheduler_is_noop():
+    scheduler.notify_feeds_changed()
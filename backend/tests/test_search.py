@@ -0,0 +1,131 @@
+"""Tests for full-text search."""
+
+import pytest
+from sqlalchemy import text
+from src.models.article import Article
+from src.models.feed import Feed
+from src.utils.search import build_match_query, rebuild_fts
+from tests.conftest import test_engine
+
+
+@pytest.fixture
+def corpus(db_session):
+    feed = Feed(name="Feed", url="https://feed.example.com/rss")
+    db_session.add(feed)
+    db_session.commit()
+    articles = [
+        Article(feed_id=feed.id, title="Sourdough starter basics", url="https://e.com/1",
+                author="Ada Baker", content_text="Feed your starter flour and water daily."),
+        Article(feed_id=feed.id, title="Weekly links", url="https://e.com/2",
+                author="Bob", content_text="A note on sourdough hydration and crumb."),
+        Article(feed_id=feed.id, title="Rust ownership", url="https://e.com/3",
+                author="Carol", content_text="Borrowing rules explained."),
+    ]
+    db_session.add_all(articles)
+    db_session.commit()
+    return articles
+
+
+def _ids(response):
+    return [hit["id"] for hit in response.json()]
+
+
+def test_search_ranks_title_matches_first(client, corpus):
+    response = client.get("/api/articles/search?q=sourdough")
+    assert response.status_code == 200
+    assert _ids(response) == [corpus[0].id, corpus[1].id]
+
+    hit = response.json()[1]
+    assert "<mark>sourdough</mark>" in hit["snippet"].lower()
+    assert hit["title"] == "Weekly links"
+    assert "content" not in hit
+
+
+def test_search_matches_author_and_prefix(client, corpus):
+    assert _ids(client.get("/api/articles/search?q=ada")) == [corpus[0].id]
+    assert _ids(client.get("/api/articles/search?q=borrow")) == [corpus[2].id]
+
+
+def test_search_requires_all_words(client, corpus):
+    assert _ids(client.get("/api/articles/search?q=sourdough crumb")) == [corpus[1].id]
+
+
+def test_search_indexes_highlights(client, corpus):
+    assert _ids(client.get("/api/articles/search?q=memorable")) == []
+
+    response = client.post(f"/api/articles/{corpus[2].id}/highlights",
+                           json={"text": "a memorable passage"})
+    highlight_id = response.json()["id"]
+    assert _ids(client.get("/api/articles/search?q=memorable")) == [corpus[2].id]
+
+    client.delete(f"/api/articles/highlights/{highlight_id}")
+    assert _ids(client.get("/api/articles/search?q=memorable")) == []
+
+
+def test_search_tracks_updates_and_deletes(client, db_session, corpus):
+    corpus[2].content_text = "Lifetimes and sourdough metaphors."
+    db_session.commit()
+    assert corpus[2].id in _ids(client.get("/api/articles/search?q=lifetimes"))
+
+    db_session.delete(corpus[0])
+    db_session.commit()
+    assert set(_ids(client.get("/api/articles/search?q=sourdough"))) == {corpus[1].id, corpus[2].id}
+
+
+def test_index_is_external_content_and_stays_consistent(client, db_session, corpus):
+    corpus[1].title = "Weekly crumbs"
+    corpus[1].content_text = "Proofing times."
+    db_session.commit()
+    highlight_id = client.post(f"/api/articles/{corpus[1].id}/highlights",
+                               json={"text": "an open crumb"}).json()["id"]
+    client.post(f"/api/articles/{corpus[1].id}/highlights", json={"text": "long proof"})
+    client.delete(f"/api/articles/highlights/{highlight_id}")
+    db_session.delete(corpus[0])
+    db_session.commit()
+
+    assert _ids(client.get("/api/articles/search?q=crumbs proofing")) == [corpus[1].id]
+    assert _ids(client.get("/api/articles/search?q=open")) == []
+    with test_engine.begin() as conn:
+        # The text lives only in the source tables; the index matches them
+        assert conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'articles_fts_content'"
+        )).scalar() == 0
+        conn.execute(text(
+            "INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)"
+        ))
+
+
+def test_search_pagination(client, corpus):
+    first = client.get("/api/articles/search?q=sourdough&limit=1")
+    assert len(first.json()) == 1
+    assert first.headers["x-next-offset"] == "1"
+
+    second = client.get("/api/articles/search?q=sourdough&limit=1&offset=1")
+    assert _ids(second) == [corpus[1].id]
+    assert "x-next-offset" not in second.headers
+
+
+def test_search_treats_operators_as_text(client, corpus):
+    response = client.get('/api/articles/search?q=sourdough" OR (NEAR')
+    assert response.status_code == 200
+    assert response.json() == []
+    assert client.get("/api/articles/search?q=%21%21").json() == []
+
+
+def test_search_requires_query(client):
+    assert client.get("/api/articles/search").status_code == 422
+
+
+def test_build_match_query_quotes_words():
+    assert build_match_query('foo "bar" -baz') == '"foo" "bar" "baz"*'
+    assert build_match_query("  ") == ""
+
+
+def test_rebuild_fts_repopulates_index(client, corpus):
+    with test_engine.begin() as conn:
+        conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('delete-all')"))
+    assert _ids(client.get("/api/articles/search?q=rust")) == []
+
+    with test_engine.begin() as conn:
+        assert rebuild_fts(conn) == 3
+    assert _ids(client.get("/api/articles/search?q=rust")) == [corpus[2].id]
@@ -0,0 +1,67 @@
+"""Tests for HTML-to-text helpers."""
+
+from src.utils.text import (
+    CHUNK_SIZE, ExtractedText, extract_text, extract_text_stream, html_to_text, make_excerpt,
+)
+
+
+def test_html_to_text_strips_tags_and_collapses_whitespace():
+    html = "<p>Hello   <b>world</b></p>\n<p>Second&nbsp;para &amp; more</p>"
+    assert html_to_text(html) == "Hello world Second para & more"
+
+
+def test_html_to_text_skips_script_and_style():
+    html = "<style>p { color: red; }</style><p>Visible</p><script>alert(1)</script>"
+    assert html_to_text(html) == "Visible"
+
+
+def test_html_to_text_empty():
+    assert html_to_text(None) == ""
+    assert html_to_text("") == ""
+
+
+def test_make_excerpt_short_text_unchanged():
+    assert make_excerpt("<p>Short body.</p>") == "Short body."
+
+
+def test_make_excerpt_truncates_on_word_boundary():
+    html = "<p>" + "word " * 100 + "</p>"
+    excerpt = make_excerpt(html, length=23)
+    assert excerpt == "word word word word…"
+
+
+def test_make_excerpt_none_for_empty_content():
+    assert make_excerpt(None) is None
+    assert make_excerpt("<img src='x.png'>") is None
+
+
+def test_extract_text_counts_words():
+    result = extract_text("<h1>Big news</h1><p>Three more words</p>")
+    assert result == ExtractedText("Big news Three more words", 5, "Big news Three more words")
+
+
+def test_extract_text_separates_blocks_but_not_inline_tags():
+    assert html_to_text("<li>one</li><li>two</li>") == "one two"
+    assert html_to_text("in<b>line</b><br>next") == "inline next"
+    assert extract_text("in<b>line</b>").word_count == 1
+
+
+def test_extract_text_caps_stored_text_but_counts_all_words():
+    html = "<p>" + "word " * 1000 + "</p>"
+    result = extract_text(html, max_chars=50)
+    assert len(result.text) <= 50
+    assert result.text.startswith("word word")
+    assert result.word_count == 1000
+
+
+def test_extract_text_stream_handles_chunk_boundaries():
+    chunks = ["<p>Hel", "lo <e", "m>wor", "ld</em>!</p><scr", "ipt>x()</script>"]
+    assert extract_text_stream(chunks) == extract_text("".join(chunks))
+    assert extract_text_stream(chunks).text == "Hello world!"
+
+
+def test_extract_text_large_body_is_chunked():
+    html = "<p>" + "lorem ipsum " * (CHUNK_SIZE // 4) + "</p>"
+    result = extract_text(html)
+    assert result.word_count == CHUNK_SIZE // 2
+    assert result.text == " ".join(["lorem ipsum"] * (CHUNK_SIZE // 4))
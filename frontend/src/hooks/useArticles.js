@@ -8,6 +8,7 @@ export function useArticles(filters = {}) {
   if (filters.is_saved !== undefined) queryParams.append('is_saved', filters.is_saved);
   if (filters.is_archived !== undefined) queryParams.append('is_archived', filters.is_archived);
   if (filters.sort) queryParams.append('sort', filters.sort);
+  queryParams.append('view', 'summary');
 
   return useQuery({
     queryKey: ['articles', filters],
@@ -41,3 +42,17 @@ export function useUpdateArticle() {
     },
   });
 }
+
+export function useBulkUpdateArticles() {
+  const queryClient = useQueryClient();
+  return useMutation({
+    // Pass either { ids, changes } or { filter, changes }
+    mutationFn: async (payload) => {
+      const { data } = await apiClient.patch('/api/articles/bulk', payload);
+      return data;
+    },
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['articles'] });
+    },
+  });
+}